@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     # API Configuration
     gemini_api_key: str = Field(..., alias="GEMINI_API_KEY")
     gemini_model: str = Field(default="gemini-2.0-flash-exp", alias="GEMINI_MODEL")
+    # Alternative endpoint, e.g. https://localhost:9443 for benchmarks.fake_live_server
+    gemini_base_url: str = Field(default="", alias="GEMINI_BASE_URL")
+    gemini_ca_file: str = Field(default="", alias="GEMINI_CA_FILE")
 
     # Server Configuration
     host: str = Field(default="0.0.0.0", alias="HOST")
@@ -29,6 +32,86 @@ class Settings(BaseSettings):
     audio_sample_rate: int = Field(default=16000, alias="AUDIO_SAMPLE_RATE")
     audio_chunk_size: int = Field(default=512, alias="AUDIO_CHUNK_SIZE")
 
+    # Upstream audio coalescing: merge AUDIO_COALESCE_FRAMES frames of
+    # AUDIO_CHUNK_SIZE samples into one message, holding audio at most MAX_HOLD_MS
+    audio_coalesce_enabled: bool = Field(default=False, alias="AUDIO_COALESCE_ENABLED")
+    audio_coalesce_frames: int = Field(default=8, alias="AUDIO_COALESCE_FRAMES")
+    audio_coalesce_max_hold_ms: float = Field(
+        default=300.0, alias="AUDIO_COALESCE_MAX_HOLD_MS"
+    )
+
+    # Per-session history of received audio (0 = none); each session reserves
+    # AUDIO_HISTORY_SECONDS * AUDIO_SAMPLE_RATE * 2 bytes for it
+    audio_history_seconds: float = Field(default=0.0, alias="AUDIO_HISTORY_SECONDS")
+
+    # Audio received before activity_start that the server forwards right after
+    # it (0 = clients send their own pre-speech audio). While set, audio outside
+    # an activity is kept in the history instead of being forwarded
+    pre_speech_lookback_ms: float = Field(default=0.0, alias="PRE_SPEECH_LOOKBACK_MS")
+
+    # Speculative client activities: activity_start and the audio after it are
+    # held until this much audio arrives, and dropped on activity_cancel (0 = off)
+    speculative_hold_ms: float = Field(default=0.0, alias="SPECULATIVE_HOLD_MS")
+
+    # int16 RMS level below which a frame counts as silence
+    silence_rms_threshold: float = Field(default=300.0, alias="SILENCE_RMS_THRESHOLD")
+
+    # Server-side VAD for clients that stream raw PCM without activity signals
+    server_vad_enabled: bool = Field(default=False, alias="SERVER_VAD_ENABLED")
+    vad_backend: str = Field(default="energy", alias="VAD_BACKEND")
+    vad_silero_model_path: str = Field(
+        default="models/silero_vad.onnx", alias="VAD_SILERO_MODEL_PATH"
+    )
+    vad_energy_threshold: float = Field(default=500.0, alias="VAD_ENERGY_THRESHOLD")
+    vad_max_zero_crossing_rate: float = Field(
+        default=0.35, alias="VAD_MAX_ZERO_CROSSING_RATE"
+    )
+    vad_positive_threshold: float = Field(default=0.5, alias="VAD_POSITIVE_THRESHOLD")
+    vad_negative_threshold: float = Field(default=0.35, alias="VAD_NEGATIVE_THRESHOLD")
+    vad_min_speech_ms: float = Field(default=200.0, alias="VAD_MIN_SPEECH_MS")
+    vad_redemption_ms: float = Field(default=600.0, alias="VAD_REDEMPTION_MS")
+    # Score frames from many sessions together (0 = per-session scoring)
+    vad_batch_window_ms: float = Field(default=0.0, alias="VAD_BATCH_WINDOW_MS")
+
+    # Uplink silence suppression inside a turn (uses SILENCE_RMS_THRESHOLD)
+    silence_suppression_enabled: bool = Field(
+        default=False, alias="SILENCE_SUPPRESSION_ENABLED"
+    )
+    silence_suppression_mode: str = Field(
+        default="drop", alias="SILENCE_SUPPRESSION_MODE"
+    )
+    silence_hangover_ms: float = Field(default=300.0, alias="SILENCE_HANGOVER_MS")
+    silence_marker_ms: float = Field(default=20.0, alias="SILENCE_MARKER_MS")
+
+    # Bounded uplink queue between browser and Gemini
+    uplink_queue_size: int = Field(default=200, alias="UPLINK_QUEUE_SIZE")
+    uplink_overflow_policy: str = Field(default="block", alias="UPLINK_OVERFLOW_POLICY")
+
+    # Outbound queue towards the browser (slow-consumer handling)
+    downlink_queue_size: int = Field(default=500, alias="DOWNLINK_QUEUE_SIZE")
+    downlink_slow_depth: int = Field(default=100, alias="DOWNLINK_SLOW_DEPTH")
+    downlink_slow_send_ms: float = Field(default=250.0, alias="DOWNLINK_SLOW_SEND_MS")
+    downlink_merge_transcriptions: bool = Field(
+        default=True, alias="DOWNLINK_MERGE_TRANSCRIPTIONS"
+    )
+    downlink_drop_audio_on_interrupt: bool = Field(
+        default=True, alias="DOWNLINK_DROP_AUDIO_ON_INTERRUPT"
+    )
+
+    # Browser reattach: a call outlives a dropped browser socket for this long
+    # (0 = off) and keeps its last REATTACH_REPLAY_BYTES of downlink to resend
+    reattach_grace_seconds: float = Field(default=0.0, alias="REATTACH_GRACE_SECONDS")
+    reattach_replay_bytes: int = Field(default=262144, alias="REATTACH_REPLAY_BYTES")
+
+    # Metrics: directory shared by uvicorn workers so /metrics covers all of them
+    metrics_multiproc_dir: str = Field(default="", alias="METRICS_MULTIPROC_DIR")
+    metrics_snapshot_interval_seconds: float = Field(
+        default=1.0, alias="METRICS_SNAPSHOT_INTERVAL_SECONDS"
+    )
+    event_loop_lag_interval_seconds: float = Field(
+        default=0.5, alias="EVENT_LOOP_LAG_INTERVAL_SECONDS"
+    )
+
     # Logging Configuration
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
 
@@ -36,6 +119,71 @@ class Settings(BaseSettings):
     # This is ~5 seconds of audio at 16kHz (16000 Hz * 2 bytes * 5s = 160000 bytes)
     flush_interval_bytes: int = Field(default=160000, alias="FLUSH_INTERVAL_BYTES")
 
+    # Server-side periodic flush (replaces the browser's performPeriodicFlush)
+    server_flush_enabled: bool = Field(default=False, alias="SERVER_FLUSH_ENABLED")
+    flush_interval_seconds: float = Field(default=15.0, alias="FLUSH_INTERVAL_SECONDS")
+    flush_search_window_ms: float = Field(
+        default=1000.0, alias="FLUSH_SEARCH_WINDOW_MS"
+    )
+
+    # Live session lifetime budget (the server closes sessions after ~10 minutes)
+    session_max_age_seconds: float = Field(
+        default=540.0, alias="SESSION_MAX_AGE_SECONDS"
+    )
+    # Move long calls to a successor session at a turn boundary, prepared on
+    # goAway or ROLLOVER_LEAD_SECONDS before SESSION_MAX_AGE_SECONDS
+    session_rollover_enabled: bool = Field(
+        default=False, alias="SESSION_ROLLOVER_ENABLED"
+    )
+    rollover_lead_seconds: float = Field(default=30.0, alias="ROLLOVER_LEAD_SECONDS")
+    # Transcript turns that warm a successor opened without a resumption handle
+    rollover_context_turns: int = Field(default=20, alias="ROLLOVER_CONTEXT_TURNS")
+    # Resume the Live session after an upstream failure, keeping the browser
+    # call open; the last RESUMPTION_REPLAY_MS of uplink audio is sent again
+    session_resumption_enabled: bool = Field(
+        default=False, alias="SESSION_RESUMPTION_ENABLED"
+    )
+    resumption_replay_ms: float = Field(default=300.0, alias="RESUMPTION_REPLAY_MS")
+    resumption_max_attempts: int = Field(default=3, alias="RESUMPTION_MAX_ATTEMPTS")
+    # Close the Live session of a call idle for HIBERNATE_IDLE_SECONDS (0 = off),
+    # reopening it with its resumption handle or transcript on the next
+    # activity_start or text; a browser speech hint can start reopening earlier
+    hibernate_idle_seconds: float = Field(default=0.0, alias="HIBERNATE_IDLE_SECONDS")
+    hibernate_speculative_wake: bool = Field(
+        default=True, alias="HIBERNATE_SPECULATIVE_WAKE"
+    )
+    # Connect to the Live API on a call's first turn, text or speech hint
+    # instead of at accept; input arriving meanwhile waits in the uplink queue
+    lazy_connect_enabled: bool = Field(default=False, alias="LAZY_CONNECT_ENABLED")
+    lazy_connect_attempts: int = Field(default=3, alias="LAZY_CONNECT_ATTEMPTS")
+
+    # Longest wait for the upstream close handshake when a call ends
+    disconnect_timeout_seconds: float = Field(
+        default=5.0, alias="DISCONNECT_TIMEOUT_SECONDS"
+    )
+
+    # Opt-in capture of every session for replay (benchmarks.session_replay)
+    session_recording_enabled: bool = Field(
+        default=False, alias="SESSION_RECORDING_ENABLED"
+    )
+    session_recording_dir: str = Field(
+        default="recordings", alias="SESSION_RECORDING_DIR"
+    )
+    session_recording_buffer_bytes: int = Field(
+        default=65536, alias="SESSION_RECORDING_BUFFER_BYTES"
+    )
+
+    # Pre-warmed Live session pool (per model/voice/language bucket)
+    session_pool_enabled: bool = Field(default=False, alias="SESSION_POOL_ENABLED")
+    session_pool_min_size: int = Field(default=2, alias="SESSION_POOL_MIN_SIZE")
+    session_pool_max_size: int = Field(default=8, alias="SESSION_POOL_MAX_SIZE")
+    session_pool_max_idle_seconds: float = Field(
+        default=120.0, alias="SESSION_POOL_MAX_IDLE_SECONDS"
+    )
+    session_pool_refill_interval_seconds: float = Field(
+        default=5.0, alias="SESSION_POOL_REFILL_INTERVAL_SECONDS"
+    )
+
     @field_validator("gemini_api_key")
     @classmethod
     def validate_api_key(cls, v: str) -> str:
@@ -54,6 +202,36 @@ class Settings(BaseSettings):
             raise ValueError(f"LOG_LEVEL must be one of {valid_levels}")
         return v
 
+    @field_validator("uplink_overflow_policy")
+    @classmethod
+    def validate_uplink_overflow_policy(cls, v: str) -> str:
+        """Ensure the uplink overflow policy is known"""
+        valid_policies = ["block", "drop_oldest", "drop_silence"]
+        v = v.lower()
+        if v not in valid_policies:
+            raise ValueError(f"UPLINK_OVERFLOW_POLICY must be one of {valid_policies}")
+        return v
+
+    @field_validator("vad_backend")
+    @classmethod
+    def validate_vad_backend(cls, v: str) -> str:
+        """Ensure the VAD backend is known"""
+        valid_backends = ["energy", "silero"]
+        v = v.lower()
+        if v not in valid_backends:
+            raise ValueError(f"VAD_BACKEND must be one of {valid_backends}")
+        return v
+
+    @field_validator("silence_suppression_mode")
+    @classmethod
+    def validate_silence_suppression_mode(cls, v: str) -> str:
+        """Ensure the silence suppression mode is known"""
+        valid_modes = ["drop", "marker"]
+        v = v.lower()
+        if v not in valid_modes:
+            raise ValueError(f"SILENCE_SUPPRESSION_MODE must be one of {valid_modes}")
+        return v
+
     @field_validator("port")
     @classmethod
     def validate_port(cls, v: int) -> int:
@@ -5,16 +5,263 @@ WebSocket router for handling browser audio connections
 import asyncio
 import json
 import logging
+import time
+from collections.abc import Coroutine, Sequence
+from functools import partial
 from typing import Any
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from app.config import settings
+from app.services.call_bridge import (
+    BrowserReplacedError,
+    CallBridge,
+    bridge_totals,
+    call_bridges,
+)
+from app.services.downlink_queue import DownlinkClosedError, DownlinkQueue
 from app.services.gemini_live import GeminiLiveService
+from app.services.metrics import ACTIVE_SESSIONS, AUDIO_OUT_BYTES, AUDIO_OUT_FRAMES
+from app.services.uplink_queue import UplinkClosedError, UplinkQueue
 
 router: APIRouter = APIRouter()
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+# Close codes of a browser hanging up on purpose; anything else may reconnect
+CLEAN_CLOSE_CODES = frozenset({1000, 1001})
+
+
+class _CallEnded(Exception):
+    """Raised in the bridge task group once one of its tasks has finished"""
+
+
+class _BrowserDropped(Exception):
+    """Raised when a reattachable call's browser socket goes away unexpectedly"""
+
+
+async def run_until_first_done(
+    *coroutines: Coroutine[Any, Any, None],
+    background: Sequence[Coroutine[Any, Any, None]] = (),
+) -> None:
+    """
+    Runs the coroutines in a task group until any one of them finishes
+
+    The rest, including the `background` coroutines (whose own completion
+    ends nothing), are then cancelled and awaited, so no task outlives the
+    call. If any task fails, the first error is re-raised as is.
+    """
+
+    finished = asyncio.Event()
+
+    async def run(coroutine: Coroutine[Any, Any, None]) -> None:
+        await coroutine
+        finished.set()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for coroutine in coroutines:
+                group.create_task(run(coroutine))
+            for coroutine in background:
+                group.create_task(coroutine)
+            # Raised here rather than in the finished task: a task failing
+            # while the group exits leaves the caller with a stale cancel
+            # request on Python 3.11, which cancel scopes above trip over
+            await finished.wait()
+            raise _CallEnded()
+    except BaseExceptionGroup as errors:
+        failures = [e for e in errors.exceptions if not isinstance(e, _CallEnded)]
+        if failures:
+            raise failures[0] from None
+
+
+async def receive_from_browser(
+    websocket: WebSocket,
+    uplink: UplinkQueue,
+    downlink: DownlinkQueue,
+    reattachable: bool = False,
+) -> None:
+    """Receives audio and control messages from the browser and queues them for Gemini"""
+    # Chunk counter for throttled logging
+    chunk_count: int = 0
+    dropped = False
+
+    try:
+        while True:
+            # Receive data from browser (can be JSON text or bytes)
+            data: dict[str, Any] = await websocket.receive()
+            if data.get("type") == "websocket.disconnect":
+                raise WebSocketDisconnect(data.get("code", 1000))
+
+            # If it's text (control message)
+            if data.get("text") is not None:
+                message: dict[str, Any] = json.loads(data["text"])
+
+                if message.get("type") == "text":
+                    # Send text message to Gemini
+                    await uplink.put_control("text", message.get("content", ""))
+
+                elif message.get("type") == "ping":
+                    # Respond to ping to keep connection alive
+                    await downlink.put_json({"type": "pong"})
+
+                elif message.get("type") == "activity_start":
+                    # Manual VAD: speech start
+                    await uplink.put_control("activity_start")
+                    logger.info("VAD: activity_start received")
+
+                elif message.get("type") == "activity_end":
+                    # Manual VAD: speech end
+                    await uplink.put_control("activity_end")
+                    logger.info("VAD: activity_end received")
+
+                elif message.get("type") == "activity_cancel":
+                    # Manual VAD: the speech start was a false positive
+                    await uplink.put_control("activity_cancel")
+                    logger.info("VAD: activity_cancel received")
+
+                elif message.get("type") == "speech_probable":
+                    # Manual VAD: speech is likely to start (wakes hibernated calls)
+                    await uplink.put_control("speech_probable")
+
+            # If it's bytes (audio)
+            elif data.get("bytes") is not None:
+                audio_data: bytes = data["bytes"]
+                # Send audio to Gemini (log every 50 chunks to avoid saturation)
+                chunk_count += 1
+                if chunk_count % 50 == 0:
+                    logger.debug(
+                        f"Sending audio chunk #{chunk_count}, size: {len(audio_data)} bytes"
+                    )
+                await uplink.put_audio(audio_data)
+
+    except WebSocketDisconnect as e:
+        if reattachable and e.code not in CLEAN_CLOSE_CODES:
+            dropped = True
+            # Speech cut off mid-turn will not be finished by this browser
+            await uplink.put_control("activity_cancel")
+            raise _BrowserDropped() from None
+        logger.info("Client disconnected")
+    except Exception as e:
+        logger.error(f"Error receiving from browser: {e}")
+        raise
+    finally:
+        if not dropped:
+            await uplink.close()
+
+
+async def forward_to_gemini(service: GeminiLiveService, uplink: UplinkQueue) -> None:
+    """Forwards queued browser input to Gemini in order"""
+    try:
+        while True:
+            item = await uplink.get()
+            if item.kind == "audio":
+                await service.send_audio(item.payload)
+            elif item.kind == "text":
+                await service.send_text(item.payload)
+            elif item.kind == "activity_start":
+                await service.send_activity_start()
+            elif item.kind == "activity_end":
+                await service.send_activity_end()
+            elif item.kind == "activity_cancel":
+                await service.send_activity_cancel()
+            elif item.kind == "speech_probable":
+                service.expect_speech()
+            uplink.record_sent(item)
+    except UplinkClosedError:
+        logger.debug(f"Uplink drained: {uplink.stats()}")
+    except Exception as e:
+        logger.error(f"Error forwarding to Gemini: {e}")
+        raise
+
+
+async def send_to_browser(service: GeminiLiveService, downlink: DownlinkQueue) -> None:
+    """Receives responses from Gemini and queues them for the browser"""
+    try:
+        async for event in service.receive_responses():
+            # Send model state (thinking, speaking, listening)
+            if event.model_state is not None:
+                await downlink.put_json(
+                    {"type": "model_state", "state": event.model_state}
+                )
+
+            # Send input transcription (what the user says)
+            if event.input_transcription is not None:
+                await downlink.put_json(
+                    {"type": "input_transcription", "text": event.input_transcription}
+                )
+
+            # Send output transcription (what Gemini says)
+            if event.output_transcription is not None:
+                await downlink.put_json(
+                    {
+                        "type": "output_transcription",
+                        "text": event.output_transcription,
+                    }
+                )
+
+            # Send response audio
+            if event.audio is not None:
+                await downlink.put_audio(event.audio)
+
+            # Notify turn complete
+            if event.turn_complete:
+                await downlink.put_json({"type": "turn_complete"})
+
+            # Notify interruption
+            if event.interrupted:
+                await downlink.put_json({"type": "interrupted"})
+
+    except Exception as e:
+        logger.error(f"Error sending to browser: {e}")
+        raise
+    finally:
+        downlink.close()
+
+
+async def write_to_browser(
+    websocket: WebSocket, downlink: DownlinkQueue, reattachable: bool = False
+) -> None:
+    """Writes queued messages to the browser"""
+    try:
+        while True:
+            item = await downlink.get()
+            start = time.perf_counter()
+            try:
+                await _write(websocket, item.message)
+            except BaseException as e:
+                if reattachable:
+                    downlink.requeue(item)  # For the browser that reattaches
+                    if isinstance(e, Exception):
+                        raise _BrowserDropped() from None
+                raise
+            downlink.record_sent(item, time.perf_counter() - start)
+    except DownlinkClosedError:
+        logger.debug(f"Downlink drained: {downlink.stats()}")
+    except _BrowserDropped:
+        raise
+    except Exception as e:
+        logger.error(f"Error writing to browser: {e}")
+        raise
+
+
+async def _write(websocket: WebSocket, message: dict[str, Any] | bytes) -> None:
+    if isinstance(message, bytes):
+        await websocket.send_bytes(message)
+        AUDIO_OUT_BYTES.inc(len(message))
+        AUDIO_OUT_FRAMES.inc()
+    else:
+        await websocket.send_json(message)
+
+
+async def _send_error(websocket: WebSocket, error: Exception) -> None:
+    try:
+        await websocket.send_json({"type": "error", "message": str(error)})
+    except Exception:
+        # WebSocket may already be closed, safe to ignore
+        logger.debug("Could not send error message, WebSocket likely closed")
+
+
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
     """
@@ -25,124 +272,174 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     await websocket.accept()
     logger.info("WebSocket client connected")
 
+    reattachable = settings.reattach_grace_seconds > 0
+    if reattachable:
+        # A reconnecting browser presents the token of the call it left
+        bridge = call_bridges.claim(websocket.query_params.get("session"))
+        if bridge is not None:
+            await serve_browser(websocket, bridge, last_seq=_last_seq(websocket))
+            return
+
     # Create Gemini service instance
     gemini_service = GeminiLiveService()
+    ACTIVE_SESSIONS.inc()
+    bridge = None
 
     try:
-        # Connect to Gemini Live API
-        await gemini_service.connect()
-        await websocket.send_json(
-            {"type": "status", "message": "Connected to Gemini Live API"}
-        )
-
-        # Chunk counter using closure variable (better than function attribute mutation)
-        chunk_count: int = 0
+        if settings.lazy_connect_enabled:
+            # Connected by the first turn; earlier input waits in the uplink
+            gemini_service.defer_connect()
+        else:
+            # Connect to Gemini Live API
+            await gemini_service.connect()
 
-        # Task to receive audio from browser and send to Gemini
-        async def receive_from_browser() -> None:
-            nonlocal chunk_count
+        # Bounded queue so a slow upstream never stalls reads from the browser
+        uplink = UplinkQueue(
+            maxsize=settings.uplink_queue_size,
+            policy=settings.uplink_overflow_policy,
+            silence_rms_threshold=settings.silence_rms_threshold,
+        )
 
-            try:
-                while True:
-                    # Receive data from browser (can be JSON text or bytes)
-                    data: dict[str, Any] = await websocket.receive()
-
-                    # If it's text (control message)
-                    if "text" in data:
-                        message: dict[str, Any] = json.loads(data["text"])
-
-                        if message.get("type") == "text":
-                            # Send text message to Gemini
-                            await gemini_service.send_text(message.get("content", ""))
-
-                        elif message.get("type") == "ping":
-                            # Respond to ping to keep connection alive
-                            await websocket.send_json({"type": "pong"})
-
-                        elif message.get("type") == "activity_start":
-                            # Manual VAD: speech start
-                            await gemini_service.send_activity_start()
-                            logger.info("VAD: activity_start received")
-
-                        elif message.get("type") == "activity_end":
-                            # Manual VAD: speech end
-                            await gemini_service.send_activity_end()
-                            logger.info("VAD: activity_end received")
-
-                    # If it's bytes (audio)
-                    elif "bytes" in data:
-                        audio_data: bytes = data["bytes"]
-                        # Send audio to Gemini (log every 50 chunks to avoid saturation)
-                        chunk_count += 1
-                        if chunk_count % 50 == 0:
-                            logger.debug(
-                                f"Sending audio chunk #{chunk_count}, size: {len(audio_data)} bytes"
-                            )
-                        await gemini_service.send_audio(audio_data)
-
-            except WebSocketDisconnect:
-                logger.info("Client disconnected")
-            except Exception as e:
-                logger.error(f"Error receiving from browser: {e}")
-                raise
+        # Outbound queue so a slow browser never stalls the Gemini reader
+        downlink = DownlinkQueue(
+            maxsize=settings.downlink_queue_size,
+            slow_depth=settings.downlink_slow_depth,
+            slow_send_ms=settings.downlink_slow_send_ms,
+            merge_transcriptions=settings.downlink_merge_transcriptions,
+            drop_audio_on_interrupt=settings.downlink_drop_audio_on_interrupt,
+            replay_bytes=settings.reattach_replay_bytes if reattachable else 0,
+        )
 
-        # Task to receive responses from Gemini and send to browser
-        async def send_to_browser() -> None:
-            try:
-                async for response in gemini_service.receive_responses():
-                    # Send model state (thinking, speaking, listening)
-                    if "model_state" in response:
-                        await websocket.send_json(
-                            {"type": "model_state", "state": response["model_state"]}
-                        )
-
-                    # Send input transcription (what the user says)
-                    if "input_transcription" in response:
-                        await websocket.send_json(
-                            {
-                                "type": "input_transcription",
-                                "text": response["input_transcription"],
-                            }
-                        )
-
-                    # Send output transcription (what Gemini says)
-                    if "output_transcription" in response:
-                        await websocket.send_json(
-                            {
-                                "type": "output_transcription",
-                                "text": response["output_transcription"],
-                            }
-                        )
-
-                    # Send response audio
-                    if "audio" in response:
-                        await websocket.send_bytes(response["audio"])
-
-                    # Notify turn complete
-                    if response.get("turn_complete"):
-                        await websocket.send_json({"type": "turn_complete"})
-
-                    # Notify interruption
-                    if response.get("interrupted"):
-                        await websocket.send_json({"type": "interrupted"})
-
-            except Exception as e:
-                logger.error(f"Error sending to browser: {e}")
-                raise
+        status = {
+            "type": "status",
+            "message": "Ready, connecting to Gemini Live API on the first turn"
+            if settings.lazy_connect_enabled
+            else "Connected to Gemini Live API",
+            # Clients stream continuously and skip their own pre-speech buffer
+            "lookback_ms": settings.pre_speech_lookback_ms,
+            # Clients send speech_probable hints that start waking idle calls
+            "speech_hints": _wants_speech_hints(),
+        }
+        if reattachable:
+            bridge = call_bridges.open(
+                gemini_service, uplink, downlink, settings.reattach_grace_seconds
+            )
+            # Reconnect with ?session=<token>&last_seq=<messages received>
+            status.update(session=bridge.token, resumed=False, seq=0)
+        await websocket.send_json(status)
 
-        # Execute both tasks in parallel
-        await asyncio.gather(receive_from_browser(), send_to_browser())
+        if bridge is not None:
+            # The upstream side outlives this socket; the bridge ends the call
+            bridge.start(
+                partial(forward_to_gemini, gemini_service, uplink),
+                partial(send_to_browser, gemini_service, downlink),
+            )
+        else:
+            # Either side finishing ends the call and cancels the rest,
+            # releasing the upstream session right away: the browser going
+            # away, or the upstream closing (once what it sent has been
+            # written to the browser)
+            await run_until_first_done(
+                receive_from_browser(websocket, uplink, downlink),
+                write_to_browser(websocket, downlink),
+                background=[
+                    forward_to_gemini(gemini_service, uplink),
+                    send_to_browser(gemini_service, downlink),
+                ],
+            )
 
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
     except Exception as e:
         logger.error(f"Error in WebSocket: {e}")
-        try:
-            await websocket.send_json({"type": "error", "message": str(e)})
-        except Exception:
-            # WebSocket may already be closed, safe to ignore
-            logger.debug("Could not send error message, WebSocket likely closed")
+        await _send_error(websocket, e)
+    finally:
+        if bridge is None or bridge.upstream is None:
+            # Clean up resources
+            if bridge is not None:
+                call_bridges.remove(bridge)
+            ACTIVE_SESSIONS.dec()
+            await gemini_service.disconnect()
+            logger.info("Resources released")
+
+    if bridge is not None and bridge.upstream is not None:
+        await serve_browser(websocket, bridge)
+
+
+def _wants_speech_hints() -> bool:
+    return settings.lazy_connect_enabled or (
+        settings.hibernate_idle_seconds > 0 and settings.hibernate_speculative_wake
+    )
+
+
+def _last_seq(websocket: WebSocket) -> int:
+    try:
+        return int(websocket.query_params.get("last_seq") or 0)
+    except ValueError:
+        return 0
+
+
+async def _resend_missed(
+    websocket: WebSocket, bridge: CallBridge, last_seq: int
+) -> None:
+    """Tells a reattached browser where it is and resends what it missed"""
+    replay, missed = bridge.downlink.replay(last_seq)
+    bridge_totals.replayed_messages += len(replay)
+    bridge_totals.missed_messages += missed
+    logger.info(
+        f"Browser reattached: resending {len(replay)} messages"
+        + (f", {missed} no longer kept" if missed else "")
+    )
+    try:
+        await websocket.send_json(
+            {
+                "type": "status",
+                "message": "Reattached to Gemini Live API",
+                "lookback_ms": settings.pre_speech_lookback_ms,
+                "speech_hints": _wants_speech_hints(),
+                "session": bridge.token,
+                "resumed": True,
+                # Sequence number of the message before the first one resent
+                "seq": replay[0].seq - 1 if replay else bridge.downlink.sent,
+            }
+        )
+        for item in replay:
+            await _write(websocket, item.message)
+    except Exception:
+        raise _BrowserDropped() from None
+
+
+async def serve_browser(
+    websocket: WebSocket, bridge: CallBridge, last_seq: int | None = None
+) -> None:
+    """
+    Runs one browser connection of a reattachable call
+
+    The call ends when the browser hangs up, the upstream finishes or
+    fails, or an error occurs; an unexpected drop only detaches it.
+
+    Args:
+        last_seq: For a reattaching browser, the last downlink message it got
+    """
+    connection = await bridge.attach()
+    try:
+        if last_seq is not None:
+            await _resend_missed(websocket, bridge, last_seq)
+        await run_until_first_done(
+            receive_from_browser(
+                websocket, bridge.uplink, bridge.downlink, reattachable=True
+            ),
+            write_to_browser(websocket, bridge.downlink, reattachable=True),
+            background=[bridge.watch(connection)],
+        )
+    except _BrowserDropped:
+        bridge.detach(connection)
+    except BrowserReplacedError:
+        pass  # The call continues on the newer connection
+    except Exception as e:
+        logger.error(f"Error in WebSocket: {e}")
+        await _send_error(websocket, e)
     finally:
-        # Clean up resources
-        await gemini_service.disconnect()
-        logger.info("Resources released")
+        bridge.release()
+        if not connection.is_set() and not bridge.detached:
+            await bridge.close()
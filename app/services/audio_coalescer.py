@@ -0,0 +1,132 @@
+"""
+Upstream audio coalescer
+Merges small PCM frames into larger chunks before they are sent to Gemini
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.services.audio_utils import SAMPLE_WIDTH_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+class AudioCoalescer:
+    """
+    Accumulates PCM frames until a target size or a maximum hold time is reached
+
+    Chunks handed to `send` always hold whole int16 samples; a trailing odd byte
+    (misaligned frame) is carried over to the next chunk. Frames are copied
+    into one preallocated buffer and `send` receives a memoryview of it, valid
+    until it returns.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[memoryview], Awaitable[None]],
+        target_bytes: int,
+        max_hold_ms: float,
+    ) -> None:
+        self._send = send
+        self.target_bytes = max(
+            SAMPLE_WIDTH_BYTES, target_bytes - target_bytes % SAMPLE_WIDTH_BYTES
+        )
+        self.max_hold_seconds = max_hold_ms / 1000
+        self._buffer = bytearray(2 * self.target_bytes)
+        self._length: int = 0  # Bytes of self._buffer in use
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_task: asyncio.Task[None] | None = None
+
+        # Statistics
+        self.frames_in: int = 0
+        self.bytes_in: int = 0
+        self.chunks_out: int = 0
+        self.bytes_out: int = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._length
+
+    async def add(self, data: bytes | memoryview) -> None:
+        """Adds a frame, sending a chunk once the target size is reached"""
+        self.frames_in += 1
+        self.bytes_in += len(data)
+        end = self._length + len(data)
+        if end > len(self._buffer):
+            # Replace rather than resize: a flush may still be sending a view
+            buffer = bytearray(max(end, 2 * len(self._buffer)))
+            buffer[: self._length] = memoryview(self._buffer)[: self._length]
+            self._buffer = buffer
+        self._buffer[self._length : end] = data
+        self._length = end
+
+        if self._length >= self.target_bytes:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_hold_seconds, self._on_deadline
+            )
+
+    async def flush(self) -> None:
+        """Sends every whole sample currently buffered"""
+        self._cancel_timer()
+        async with self._lock:
+            aligned = self._length - self._length % SAMPLE_WIDTH_BYTES
+            if aligned == 0:
+                return
+            self.chunks_out += 1
+            self.bytes_out += aligned
+            with memoryview(self._buffer) as view:
+                try:
+                    await self._send(view[:aligned])
+                finally:
+                    # Move what arrived past the chunk (a carried byte, or
+                    # frames added while sending) to the start of the buffer
+                    remaining = self._length - aligned
+                    if remaining:
+                        self._buffer[:remaining] = self._buffer[aligned : self._length]
+                    self._length = remaining
+
+    def close(self) -> None:
+        """
+        Drops buffered audio and cancels the pending deadline
+
+        Called whenever the session the audio was meant for goes away; frames
+        added afterwards start a new chunk.
+        """
+        self._cancel_timer()
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            self._timer_task = None
+        self._length = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Returns frame/chunk counters and the achieved reduction ratio"""
+        return {
+            "frames_in": self.frames_in,
+            "chunks_out": self.chunks_out,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "pending_bytes": self.pending_bytes,
+            "reduction_ratio": (
+                self.frames_in / self.chunks_out if self.chunks_out else 0.0
+            ),
+        }
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_deadline(self) -> None:
+        self._timer = None
+        self._timer_task = asyncio.create_task(self._flush_on_deadline())
+
+    async def _flush_on_deadline(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing coalesced audio: {e}")
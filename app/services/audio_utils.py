@@ -0,0 +1,24 @@
+"""
+Helpers for raw PCM audio buffers
+Vectorized measurements over int16 mono audio using NumPy
+"""
+
+import numpy as np
+
+# int16 PCM: one sample is two bytes
+SAMPLE_WIDTH_BYTES = 2
+
+
+def pcm16_samples(data: bytes | bytearray | memoryview) -> np.ndarray:
+    """Views a PCM buffer as int16 samples (a trailing odd byte is ignored)"""
+    usable = len(data) - len(data) % SAMPLE_WIDTH_BYTES
+    return np.frombuffer(data, dtype=np.int16, count=usable // SAMPLE_WIDTH_BYTES)
+
+
+def pcm16_rms(data: bytes | bytearray | memoryview) -> float:
+    """Root-mean-square level of an int16 PCM buffer (0 for empty input)"""
+    samples = pcm16_samples(data)
+    if samples.size == 0:
+        return 0.0
+    as_float = samples.astype(np.float32)
+    return float(np.sqrt(np.dot(as_float, as_float) / samples.size))
@@ -0,0 +1,235 @@
+"""
+Reattachable calls for browsers that reconnect
+Keeps a call's Gemini session and queues alive for a grace period after its browser socket drops
+"""
+
+import asyncio
+import logging
+import secrets
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+from app.services.downlink_queue import DownlinkQueue
+from app.services.metrics import ACTIVE_SESSIONS, registry
+from app.services.uplink_queue import UplinkQueue
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserReplacedError(Exception):
+    """Raised in a browser connection once another one has attached to its call"""
+
+
+@dataclass
+class BridgeTotals:
+    """Process-wide counters of detached, reattached and expired calls"""
+
+    detached: int = 0
+    reattached: int = 0
+    expired: int = 0
+    replayed_messages: int = 0
+    missed_messages: int = 0  # Evicted from the replay buffer before reattach
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "detached": self.detached,
+            "reattached": self.reattached,
+            "expired": self.expired,
+            "replayed_messages": self.replayed_messages,
+            "missed_messages": self.missed_messages,
+        }
+
+
+bridge_totals = BridgeTotals()
+
+registry.counter(
+    "gemini_live_browser_reattaches_total",
+    "Browser reconnects that reattached to a live call",
+    function=lambda: bridge_totals.reattached,
+)
+registry.counter(
+    "gemini_live_detached_calls_expired_total",
+    "Calls ended because their browser did not come back in time",
+    function=lambda: bridge_totals.expired,
+)
+
+
+class CallBridge:
+    """
+    The browser-independent half of one /ws call
+
+    Owns the Gemini service, both queues and the upstream task that moves
+    messages between them and Gemini. Browser connections attach to it one
+    at a time; when one drops, the bridge waits `grace_seconds` for the
+    next before ending the call.
+    """
+
+    def __init__(
+        self,
+        registry: "CallBridgeRegistry",
+        service: Any,
+        uplink: UplinkQueue,
+        downlink: DownlinkQueue,
+        grace_seconds: float,
+    ) -> None:
+        self.token = secrets.token_urlsafe(16)
+        self.service = service
+        self.uplink = uplink
+        self.downlink = downlink
+        self.grace_seconds = grace_seconds
+        self.upstream: asyncio.Task[None] | None = None
+        self.closed: bool = False
+        self._registry = registry
+        self._connection: asyncio.Event | None = None  # Set to replace it
+        self._idle = asyncio.Event()  # No connection is reading or writing
+        self._idle.set()
+        self._expiry: asyncio.Task[None] | None = None
+
+    @property
+    def detached(self) -> bool:
+        return self._connection is None
+
+    def start(self, *sides: Callable[[], Coroutine[Any, Any, None]]) -> None:
+        """
+        Runs the upstream side; one failing cancels the others
+
+        Takes coroutine functions rather than coroutines: a call closed before
+        the task first runs then leaves no coroutine that was never awaited.
+        """
+
+        async def run() -> None:
+            async with asyncio.TaskGroup() as group:
+                for side in sides:
+                    group.create_task(side())
+
+        self.upstream = asyncio.create_task(run())
+
+    async def attach(self) -> asyncio.Event:
+        """
+        Makes a new browser connection the call's only one
+
+        A connection still attached (the server may not have noticed its
+        socket is dead yet) is replaced, and waited for so that it no
+        longer takes messages off the downlink.
+
+        Returns:
+            The connection's handle: set when a later connection replaces it
+        """
+        if self._expiry:
+            self._expiry.cancel()
+            self._expiry = None
+        if self._connection:
+            self._connection.set()
+        await self._idle.wait()
+        self._idle.clear()
+        self._connection = asyncio.Event()
+        return self._connection
+
+    def release(self) -> None:
+        """Called once a browser connection has stopped"""
+        self._idle.set()
+
+    def detach(self, connection: asyncio.Event) -> None:
+        """Starts the grace period after the browser went away"""
+        if connection is not self._connection or self.closed:
+            return  # Already replaced by a reconnect
+        self._connection = None
+        bridge_totals.detached += 1
+        self._expiry = asyncio.create_task(self._expire())
+        logger.info(
+            f"Browser dropped, keeping the call for {self.grace_seconds:g}s "
+            f"(session {self.token[:6]}...)"
+        )
+
+    async def watch(self, connection: asyncio.Event) -> None:
+        """
+        Waits on the upstream for one browser connection
+
+        Returns when the upstream finishes, re-raising its error if it
+        failed, and raises BrowserReplacedError when another connection
+        attaches.
+        """
+        assert self.upstream is not None
+        replaced = asyncio.ensure_future(connection.wait())
+        try:
+            await asyncio.wait(
+                (replaced, self.upstream), return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            replaced.cancel()
+        if connection.is_set():
+            raise BrowserReplacedError()
+        self.upstream.result()
+
+    async def _expire(self) -> None:
+        await asyncio.sleep(self.grace_seconds)
+        self._expiry = None  # Nothing left to cancel: close() runs in this task
+        bridge_totals.expired += 1
+        logger.info(f"Browser did not reattach within {self.grace_seconds:g}s")
+        await self.close()
+
+    async def close(self) -> None:
+        """Ends the call: stops the upstream and releases the Gemini session"""
+        if self.closed:
+            return
+        self.closed = True
+        self._registry.remove(self)
+        if self._expiry:
+            self._expiry.cancel()
+        if self._connection:
+            self._connection.set()
+        self.downlink.close()
+        ACTIVE_SESSIONS.dec()
+        if self.upstream:
+            self.upstream.cancel()
+        # Before waiting on the upstream, so a cancelled caller still releases it
+        await self.service.disconnect()
+        logger.info("Resources released")
+        if self.upstream:
+            await asyncio.wait((self.upstream,))
+
+
+class CallBridgeRegistry:
+    """Reattachable calls of this process, by session token"""
+
+    def __init__(self) -> None:
+        self._bridges: dict[str, CallBridge] = {}
+
+    def open(
+        self,
+        service: Any,
+        uplink: UplinkQueue,
+        downlink: DownlinkQueue,
+        grace_seconds: float,
+    ) -> CallBridge:
+        bridge = CallBridge(self, service, uplink, downlink, grace_seconds)
+        self._bridges[bridge.token] = bridge
+        return bridge
+
+    def claim(self, token: str | None) -> CallBridge | None:
+        """Returns the live call a reconnecting browser's token belongs to"""
+        bridge = self._bridges.get(token) if token else None
+        if bridge is None or bridge.closed:
+            return None
+        bridge_totals.reattached += 1
+        return bridge
+
+    def remove(self, bridge: CallBridge) -> None:
+        self._bridges.pop(bridge.token, None)
+
+    async def close_all(self) -> None:
+        """Ends every call, for shutdown"""
+        for bridge in list(self._bridges.values()):
+            await bridge.close()
+
+    def stats(self) -> dict[str, Any]:
+        bridges = list(self._bridges.values())
+        return {
+            "calls": len(bridges),
+            "detached_calls": sum(1 for bridge in bridges if bridge.detached),
+            **bridge_totals.stats(),
+        }
+
+
+call_bridges = CallBridgeRegistry()
@@ -0,0 +1,101 @@
+"""
+Process-wide registry of Google GenAI clients
+Shares one genai.Client per API key/model so WebSocket sessions reuse SDK state
+"""
+
+import logging
+import ssl
+import threading
+from typing import Any
+
+from google import genai
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+
+def _create_client(api_key: str, base_url: str, ca_file: str) -> genai.Client:
+    if not base_url:
+        return genai.Client(api_key=api_key)
+    # The SDK always upgrades Live connections to wss://, so a custom
+    # endpoint needs an SSL context that trusts its certificate
+    http_options = types.HttpOptions(
+        base_url=base_url,
+        async_client_args={"ssl": ssl.create_default_context(cafile=ca_file or None)},
+    )
+    logger.info(f"Using custom Gemini endpoint {base_url}")
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+
+class GenAIClientPool:
+    """Registry of genai.Client instances borrowed by every GeminiLiveService"""
+
+    def __init__(self) -> None:
+        self._clients: dict[tuple[str, str, str], genai.Client] = {}
+        self._lock = threading.Lock()
+
+        # Reuse statistics
+        self._created: int = 0
+        self._borrowed: int = 0
+
+    def get(
+        self, api_key: str, model: str, base_url: str = "", ca_file: str = ""
+    ) -> genai.Client:
+        """
+        Returns the shared client for an API key/model, creating it on first use
+
+        Args:
+            api_key: Gemini API key
+            model: Model name the client will be used with
+            base_url: Alternative API endpoint (e.g. the local fake Live server)
+            ca_file: CA bundle trusted for `base_url` (self-signed test servers)
+        """
+        key = (api_key, model, base_url)
+        with self._lock:
+            self._borrowed += 1
+            client = self._clients.get(key)
+            if client is None:
+                client = _create_client(api_key, base_url, ca_file)
+                self._clients[key] = client
+                self._created += 1
+                logger.info(f"Created shared GenAI client for model {model}")
+            return client
+
+    def stats(self) -> dict[str, Any]:
+        """Returns reuse statistics for the registry"""
+        with self._lock:
+            reused = self._borrowed - self._created
+            return {
+                "clients": len(self._clients),
+                "created": self._created,
+                "borrowed": self._borrowed,
+                "reused": reused,
+                "reuse_ratio": reused / self._borrowed if self._borrowed else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Forgets all clients and statistics without closing them"""
+        with self._lock:
+            self._clients.clear()
+            self._created = 0
+            self._borrowed = 0
+
+    async def aclose(self) -> None:
+        """Closes every shared client (called on application shutdown)"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+
+        for client in clients:
+            try:
+                await client.aio.aclose()
+                client.close()
+            except Exception as e:
+                logger.error(f"Error closing GenAI client: {e}")
+
+        if clients:
+            logger.info(f"Closed {len(clients)} shared GenAI client(s)")
+
+
+# Global registry instance
+client_pool = GenAIClientPool()
@@ -0,0 +1,300 @@
+"""
+Outbound queue between Gemini responses and the browser WebSocket
+Lets the upstream reader run at full speed while a writer task feeds the browser
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Message types whose consecutive deltas can be concatenated while queued
+MERGEABLE_TYPES = frozenset({"input_transcription", "output_transcription"})
+# Replay budget charged for a JSON message (audio is charged its size)
+JSON_REPLAY_BYTES = 64
+
+
+class DownlinkClosedError(Exception):
+    """Raised by get() once the queue is closed and drained"""
+
+
+@dataclass(slots=True, eq=False)
+class DownlinkItem:
+    """One message waiting to be written to the browser"""
+
+    message: dict[str, Any] | bytes
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    seq: int = 0  # Position among written messages, set once written
+
+    @property
+    def is_audio(self) -> bool:
+        return isinstance(self.message, bytes)
+
+
+@dataclass
+class DownlinkTotals:
+    """Process-wide counters across every downlink queue"""
+
+    sent: int = 0
+    merged: int = 0
+    dropped_audio: int = 0
+    slow_consumer_events: int = 0
+
+
+downlink_totals = DownlinkTotals()
+_active_queues: "weakref.WeakSet[DownlinkQueue]" = weakref.WeakSet()
+
+registry.gauge(
+    "gemini_live_downlink_queue_depth",
+    "Messages waiting to be written to browsers",
+    function=lambda: sum(queue.depth for queue in list(_active_queues)),
+)
+registry.gauge(
+    "gemini_live_downlink_lag_seconds",
+    "Age of the oldest message waiting for a browser",
+    function=lambda: max(
+        (queue.lag_seconds for queue in list(_active_queues)), default=0.0
+    ),
+    mode="max",
+)
+registry.counter(
+    "gemini_live_downlink_dropped_audio_total",
+    "Response audio chunks dropped before reaching the browser",
+    function=lambda: downlink_totals.dropped_audio,
+)
+registry.counter(
+    "gemini_live_downlink_slow_consumer_events_total",
+    "Times a browser was detected as a slow consumer",
+    function=lambda: downlink_totals.slow_consumer_events,
+)
+
+
+class DownlinkQueue:
+    """
+    Per-session outbound queue with slow-consumer handling
+
+    While messages wait, consecutive transcription deltas are merged and
+    queued audio is discarded when the model is interrupted. The queue never
+    holds more than `maxsize` messages: a put into a full queue drops the
+    oldest queued audio, and only waits for the writer when none is queued
+    (nothing but JSON), so the Gemini reader is held back only then.
+
+    With `replay_bytes`, written messages are numbered (`seq`, from 1) and
+    the most recent ones are kept so a reconnecting browser can be sent
+    what it missed.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        slow_depth: int,
+        slow_send_ms: float,
+        merge_transcriptions: bool = True,
+        drop_audio_on_interrupt: bool = True,
+        replay_bytes: int = 0,
+    ) -> None:
+        self.maxsize = max(1, maxsize)
+        self.slow_depth = slow_depth
+        self.slow_send_seconds = slow_send_ms / 1000
+        self.merge_transcriptions = merge_transcriptions
+        self.drop_audio_on_interrupt = drop_audio_on_interrupt
+        self._items: deque[DownlinkItem] = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()  # Set when the writer takes a message
+        self._closed = False
+        self.replay_bytes = replay_bytes
+        self._replay: deque[DownlinkItem] = deque()
+        self._replay_size: int = 0
+
+        # Per-session counters
+        self.slow: bool = False
+        self.slow_events: int = 0
+        self.sent: int = 0
+        self.merged: int = 0
+        self.dropped_audio: int = 0
+        self.max_depth: int = 0
+        self._send_total: float = 0.0
+        self._send_max: float = 0.0
+        self._lag_max: float = 0.0
+
+        _active_queues.add(self)
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    @property
+    def lag_seconds(self) -> float:
+        """Age of the oldest message still waiting for the browser"""
+        if not self._items:
+            return 0.0
+        return time.perf_counter() - self._items[0].enqueued_at
+
+    async def put_json(self, message: dict[str, Any]) -> None:
+        """Queues a JSON message, merging transcription deltas when possible"""
+        if self._closed:
+            return
+
+        message_type = message.get("type")
+        if self.merge_transcriptions and message_type in MERGEABLE_TYPES:
+            last = self._items[-1].message if self._items else None
+            if isinstance(last, dict) and last.get("type") == message_type:
+                last["text"] += message["text"]
+                self.merged += 1
+                downlink_totals.merged += 1
+                return
+
+        if message_type == "interrupted" and self.drop_audio_on_interrupt:
+            self._drop_queued_audio()
+
+        await self._make_room()
+        if not self._closed:
+            self._append(DownlinkItem(message))
+
+    async def put_audio(self, data: bytes) -> None:
+        """Queues response audio, dropping the oldest audio when full"""
+        if self._closed:
+            return
+        await self._make_room()
+        if not self._closed:
+            self._append(DownlinkItem(data))
+
+    async def get(self) -> DownlinkItem:
+        """
+        Waits for the next message
+
+        Raises:
+            DownlinkClosedError: When the queue was closed and is empty
+        """
+        while not self._items:
+            if self._closed:
+                raise DownlinkClosedError()
+            self._ready.clear()
+            await self._ready.wait()
+        self._space.set()
+        return self._items.popleft()
+
+    def record_sent(self, item: DownlinkItem, send_seconds: float) -> None:
+        """Records a completed browser write and updates slow-consumer state"""
+        self.sent += 1
+        downlink_totals.sent += 1
+        if self.replay_bytes:
+            self._keep_for_replay(item)
+        self._send_total += send_seconds
+        self._send_max = max(self._send_max, send_seconds)
+        self._lag_max = max(self._lag_max, time.perf_counter() - item.enqueued_at)
+
+        if send_seconds > self.slow_send_seconds:
+            self._mark_slow(f"browser write took {send_seconds * 1000:.0f}ms")
+        elif self.slow and len(self._items) <= self.slow_depth // 2:
+            self.slow = False
+            logger.info("Downlink consumer caught up")
+
+    def requeue(self, item: DownlinkItem) -> None:
+        """Puts back a message the browser went away before receiving"""
+        self._items.appendleft(item)
+        self._ready.set()
+
+    def replay(self, after: int) -> tuple[list[DownlinkItem], int]:
+        """
+        Written messages numbered after `after`, for a reconnecting browser
+
+        Returns:
+            The messages still kept, and how many newer ones were evicted
+        """
+        items = [item for item in self._replay if item.seq > after]
+        first = items[0].seq if items else self.sent + 1
+        return items, max(0, first - after - 1)
+
+    def close(self) -> None:
+        """Stops accepting messages; the writer drains what is left"""
+        self._closed = True
+        self._ready.set()
+        self._space.set()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns outbound depth, lag and send latency for this session"""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "lag_ms": self.lag_seconds * 1000,
+            "lag_ms_max": self._lag_max * 1000,
+            "sent": self.sent,
+            "merged": self.merged,
+            "dropped_audio": self.dropped_audio,
+            "slow": self.slow,
+            "slow_events": self.slow_events,
+            "send_latency_ms_avg": (
+                self._send_total / self.sent * 1000 if self.sent else 0.0
+            ),
+            "send_latency_ms_max": self._send_max * 1000,
+        }
+
+    def _append(self, item: DownlinkItem) -> None:
+        self._items.append(item)
+        self.max_depth = max(self.max_depth, len(self._items))
+        if len(self._items) > self.slow_depth:
+            self._mark_slow(f"{len(self._items)} messages queued")
+        self._ready.set()
+
+    async def _make_room(self) -> None:
+        """Returns once a message fits, dropping the oldest audio if any is queued"""
+        while len(self._items) >= self.maxsize and not self._closed:
+            for queued in self._items:
+                if queued.is_audio:
+                    self._items.remove(queued)
+                    self._count_audio_drops(1)
+                    return
+            self._space.clear()
+            await self._space.wait()
+
+    def _keep_for_replay(self, item: DownlinkItem) -> None:
+        item.seq = self.sent
+        self._replay.append(item)
+        self._replay_size += _replay_cost(item)
+        while self._replay_size > self.replay_bytes and len(self._replay) > 1:
+            self._replay_size -= _replay_cost(self._replay.popleft())
+
+    def _drop_queued_audio(self) -> None:
+        kept = deque(item for item in self._items if not item.is_audio)
+        dropped = len(self._items) - len(kept)
+        if dropped:
+            self._items = kept
+            self._count_audio_drops(dropped)
+
+    def _count_audio_drops(self, count: int) -> None:
+        self.dropped_audio += count
+        downlink_totals.dropped_audio += count
+
+    def _mark_slow(self, reason: str) -> None:
+        if not self.slow:
+            self.slow = True
+            self.slow_events += 1
+            downlink_totals.slow_consumer_events += 1
+            logger.warning(f"Slow browser consumer detected: {reason}")
+
+
+def _replay_cost(item: DownlinkItem) -> int:
+    return len(item.message) if isinstance(item.message, bytes) else JSON_REPLAY_BYTES
+
+
+def aggregate_stats() -> dict[str, Any]:
+    """Process-wide downlink statistics for /stats"""
+    queues = list(_active_queues)
+    return {
+        "active_queues": len(queues),
+        "depth": sum(queue.depth for queue in queues),
+        "lag_ms_max": max((queue.lag_seconds for queue in queues), default=0.0) * 1000,
+        "slow_sessions": sum(1 for queue in queues if queue.slow),
+        "sent": downlink_totals.sent,
+        "merged": downlink_totals.merged,
+        "dropped_audio": downlink_totals.dropped_audio,
+        "slow_consumer_events": downlink_totals.slow_consumer_events,
+    }
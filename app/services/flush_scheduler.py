@@ -0,0 +1,155 @@
+"""
+Server-side periodic flush scheduler
+Decides when a long speech turn should be split with activity_end/activity_start
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from app.services.audio_utils import pcm16_rms
+from app.services.metrics import registry
+
+
+@dataclass
+class FlushTotals:
+    """Process-wide flush counters and their effect on transcription latency"""
+
+    flushes: int = 0
+    flush_latency_count: int = 0
+    flush_latency_seconds_total: float = 0.0
+    activity_end_latency_count: int = 0
+    activity_end_latency_seconds_total: float = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "flushes": self.flushes,
+            "flush_to_transcription_ms_avg": _avg_ms(
+                self.flush_latency_seconds_total, self.flush_latency_count
+            ),
+            "activity_end_to_transcription_ms_avg": _avg_ms(
+                self.activity_end_latency_seconds_total,
+                self.activity_end_latency_count,
+            ),
+        }
+
+
+flush_totals = FlushTotals()
+
+registry.counter(
+    "gemini_live_server_flushes_total",
+    "Server-side activity_end/activity_start flushes",
+    function=lambda: flush_totals.flushes,
+)
+
+
+def _avg_ms(total_seconds: float, count: int) -> float:
+    return total_seconds / count * 1000 if count else 0.0
+
+
+class FlushScheduler:
+    """
+    Tracks audio within one activity and picks the moment to flush it
+
+    A flush becomes due once `interval_bytes` or `interval_seconds` of audio
+    accumulated since activity_start (or the previous flush). It is then
+    performed on the first frame quieter than `silence_rms_threshold`, or
+    unconditionally after `search_window_ms` without such a frame.
+    """
+
+    def __init__(
+        self,
+        interval_bytes: int,
+        interval_seconds: float,
+        search_window_ms: float,
+        silence_rms_threshold: float,
+    ) -> None:
+        self.interval_bytes = interval_bytes
+        self.interval_seconds = interval_seconds
+        self.search_window_seconds = search_window_ms / 1000
+        self.silence_rms_threshold = silence_rms_threshold
+
+        self._bytes: int = 0
+        self._started_at: float = time.monotonic()
+        self._due_since: float | None = None
+
+        # Latency from the last flush / activity_end to the next transcription
+        self._pending_since: float | None = None
+        self._pending_is_flush: bool = False
+
+        # Per-session counters
+        self.flushes: int = 0
+        self.forced_flushes: int = 0
+        self._flush_latency_total: float = 0.0
+        self._flush_latency_count: int = 0
+        self._end_latency_total: float = 0.0
+        self._end_latency_count: int = 0
+
+    def start(self) -> None:
+        """Restarts accumulation (activity_start or right after a flush)"""
+        self._bytes = 0
+        self._started_at = time.monotonic()
+        self._due_since = None
+
+    def should_flush(self, frame: bytes | memoryview) -> bool:
+        """Accounts for a frame and returns True when the flush should happen now"""
+        self._bytes += len(frame)
+        now = time.monotonic()
+
+        if self._due_since is None:
+            if (
+                self._bytes < self.interval_bytes
+                and now - self._started_at < self.interval_seconds
+            ):
+                return False
+            self._due_since = now
+
+        if pcm16_rms(frame) < self.silence_rms_threshold:
+            return True
+        if now - self._due_since >= self.search_window_seconds:
+            self.forced_flushes += 1
+            return True
+        return False
+
+    def record_flush(self) -> None:
+        """Notes a server-side flush and restarts accumulation"""
+        self.flushes += 1
+        flush_totals.flushes += 1
+        self._pending_since = time.monotonic()
+        self._pending_is_flush = True
+        self.start()
+
+    def record_activity_end(self) -> None:
+        """Notes a client-driven activity_end (baseline for comparison)"""
+        self._pending_since = time.monotonic()
+        self._pending_is_flush = False
+
+    def record_transcription(self) -> None:
+        """Notes an input transcription, closing any pending latency measurement"""
+        if self._pending_since is None:
+            return
+        latency = time.monotonic() - self._pending_since
+        self._pending_since = None
+        if self._pending_is_flush:
+            self._flush_latency_total += latency
+            self._flush_latency_count += 1
+            flush_totals.flush_latency_seconds_total += latency
+            flush_totals.flush_latency_count += 1
+        else:
+            self._end_latency_total += latency
+            self._end_latency_count += 1
+            flush_totals.activity_end_latency_seconds_total += latency
+            flush_totals.activity_end_latency_count += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Returns flush counts and transcription latency after flushes"""
+        return {
+            "flushes": self.flushes,
+            "forced_flushes": self.forced_flushes,
+            "flush_to_transcription_ms_avg": _avg_ms(
+                self._flush_latency_total, self._flush_latency_count
+            ),
+            "activity_end_to_transcription_ms_avg": _avg_ms(
+                self._end_latency_total, self._end_latency_count
+            ),
+        }
@@ -7,14 +7,45 @@ import asyncio
 import logging
 import time
 from collections.abc import AsyncGenerator
-from typing import Any
+from typing import Any, cast
 
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
+from websockets.exceptions import ConnectionClosed
 
 from app.config import settings
 from app.exceptions import AudioProcessingError, GeminiAPIError, SessionNotActiveError
+from app.services.audio_coalescer import AudioCoalescer
+from app.services.audio_utils import SAMPLE_WIDTH_BYTES
+from app.services.client_pool import client_pool
+from app.services.flush_scheduler import FlushScheduler
+from app.services.latency import TurnTimer
+from app.services.lazy_connect import LAZY_CONNECT_WAIT_SECONDS, lazy_connect_totals
+from app.services.live_events import LiveEvent, LiveMessageParser
+from app.services.metrics import (
+    AUDIO_IN_BYTES,
+    AUDIO_IN_FRAMES,
+    HIBERNATION_WAKE_SECONDS,
+    INTERRUPTIONS,
+    ROLLOVER_SWITCHOVER_SECONDS,
+    TURNS,
+    UPSTREAM_CONNECT_FAILURES,
+    UPSTREAM_CONNECT_SECONDS,
+    UPSTREAM_CONNECTS,
+    UPSTREAM_GAP_SECONDS,
+    UPSTREAM_RESUMPTIONS,
+    UPSTREAM_ROLLOVERS,
+)
+from app.services.pcm_ring_buffer import PcmRingBuffer
+from app.services.session_hibernation import Hibernation, hibernation_totals
+from app.services.session_pool import bucket_key, session_pool
+from app.services.session_recorder import RecordKind, SessionRecorder
+from app.services.session_rollover import ConversationTranscript, Successor
+from app.services.silence_suppressor import SilenceSuppressor
+from app.services.speculative_activity import SpeculativeActivity
+from app.services.uplink_encoder import AudioSender
+from app.services.vad import VoiceActivityDetector, create_detector, shared_batcher
 
 # Load environment variables
 load_dotenv()
@@ -23,16 +54,98 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Uplink audio kept beyond the resumption replay window, for what arrives
+# while the session is being resumed
+RESUMPTION_GAP_SECONDS = 5.0
+
+# How soon an idle call that could not hibernate (mid-turn, rolling over or
+# waiting for a handle covering its last turn) is checked again
+HIBERNATE_RECHECK_SECONDS = 1.0
+
+
+def live_client() -> genai.Client:
+    """The process-wide client for the configured API key, model and endpoint"""
+    return client_pool.get(
+        settings.gemini_api_key,
+        settings.gemini_model,
+        base_url=settings.gemini_base_url,
+        ca_file=settings.gemini_ca_file,
+    )
+
+
+def live_connect_config() -> dict[str, Any]:
+    """Session configuration every call connects with"""
+    config: dict[str, Any] = {
+        "response_modalities": ["AUDIO"],
+        "speech_config": {
+            "voice_config": {"prebuilt_voice_config": {"voice_name": "Aoede"}},
+            "language_code": "es-US",
+        },
+        "input_audio_transcription": {},
+        "output_audio_transcription": {},
+        # Disable automatic VAD - we use client-side VAD
+        "realtime_input_config": {"automatic_activity_detection": {"disabled": True}},
+    }
+    if settings.session_resumption_enabled or settings.hibernate_idle_seconds > 0:
+        # Makes the server send resumption handles (also reopen hibernated calls)
+        config["session_resumption"] = {}
+    return config
+
+
+def _live_config(
+    config: dict[str, Any], handle: str | None = None
+) -> types.LiveConnectConfigDict:
+    """`config` as connect() takes it, resuming the session of `handle` if given"""
+    if handle is not None:
+        config = {**config, "session_resumption": {"handle": handle}}
+    return cast(types.LiveConnectConfigDict, config)  # Plain dicts, SDK-validated
+
 
 class GeminiLiveService:
     """Service for handling connections with Google GenAI Live API"""
 
     def __init__(self) -> None:
         self.api_key: str = settings.gemini_api_key
-        self.client: genai.Client = genai.Client(api_key=self.api_key)
         self.model: str = settings.gemini_model
+        # Borrow the process-wide client instead of building one per connection
+        self.client: genai.Client = live_client()
         self._context_manager: Any | None = None  # The context manager
         self.session: Any | None = None  # The actual session
+        self._session_opened_at: float | None = None  # time.monotonic() at open
+        self._audio_sender: AudioSender | None = None  # Bound to self.session
+
+        # Session resumption after upstream failures
+        self._resumption_handle: str | None = None  # Latest resumable handle
+        # Uplink since the handle: history offset it arrived at, whether an
+        # activity was open then, and (offset, opened) of each signal sent since
+        self._handle_offset: int = 0
+        self._handle_in_activity: bool = False
+        self._activity_marks: list[tuple[int, bool]] = []
+        self._resuming: bool = False
+        self._resumed = asyncio.Event()  # Set whenever no resumption is running
+        self._resumed.set()
+        self._turns_since_handle: int = 0  # Turns started after the latest handle
+
+        # Rollover to a successor session before the lifetime limit
+        self._rollover: asyncio.Task[None] | None = None  # Timer, then opening
+        self._rollover_trigger: str | None = None  # Set while rolling over
+        self._successor: Successor | None = None  # Open, waiting for a boundary
+        self._retiring: set[asyncio.Task[None]] = set()  # Replaced sessions closing
+        self._turn_open: bool = False  # From a user turn until turn_complete
+        self._transcript: ConversationTranscript | None = None
+        if settings.session_rollover_enabled or settings.hibernate_idle_seconds > 0:
+            self._transcript = ConversationTranscript(settings.rollover_context_turns)
+
+        # Hibernation: an idle call's session is closed until the caller speaks
+        self._hibernation: Hibernation | None = None
+        self._idle_watch: asyncio.Task[None] | None = None
+        self._waking: asyncio.Task[None] | None = None  # Opening the session
+        # Lazy connect: no session until the first turn needs one
+        self._deferred: bool = False
+        self._connect_needed: bool = False
+        self._connected = asyncio.Event()  # Set once a deferred connect succeeds
+        if settings.hibernate_idle_seconds > 0:
+            self._hibernation = Hibernation(settings.hibernate_idle_seconds)
 
         # Diagnostics for detecting degradation
         self._bytes_since_last_activity_end: int = 0
@@ -40,59 +153,246 @@ class GeminiLiveService:
         self._total_audio_bytes: int = 0
         self._activity_cycles: int = 0  # Start/end cycle counter
 
+        # Optional upstream coalescing of small browser frames
+        self._coalescer: AudioCoalescer | None = None
+        if settings.audio_coalesce_enabled:
+            self._coalescer = AudioCoalescer(
+                send=self._send_coalesced_chunk,
+                target_bytes=settings.audio_chunk_size
+                * SAMPLE_WIDTH_BYTES
+                * settings.audio_coalesce_frames,
+                max_hold_ms=settings.audio_coalesce_max_hold_ms,
+            )
+
+        # Optional history of the caller's most recent audio, also the source
+        # of the pre-speech lookback forwarded after activity_start and of the
+        # audio held while a speculative activity_start is unconfirmed
+        self._history: PcmRingBuffer | None = None
+        self._lookback_seconds: float = settings.pre_speech_lookback_ms / 1000
+        self._lookback_from: int = 0  # History offset where the next lookback may start
+        self._speculation: SpeculativeActivity | None = None
+        if settings.speculative_hold_ms > 0:
+            self._speculation = SpeculativeActivity(
+                settings.speculative_hold_ms, settings.audio_sample_rate
+            )
+        history_seconds = max(
+            settings.audio_history_seconds,
+            self._lookback_seconds + settings.speculative_hold_ms / 1000,
+            self._lookback_seconds
+            + (settings.vad_min_speech_ms + settings.vad_redemption_ms) / 1000
+            if settings.server_vad_enabled
+            else 0.0,
+            settings.resumption_replay_ms / 1000 + RESUMPTION_GAP_SECONDS
+            if settings.session_resumption_enabled
+            else 0.0,
+        )
+        if history_seconds > 0:
+            self._history = PcmRingBuffer(history_seconds, settings.audio_sample_rate)
+
+        # Optional server-side periodic flush during long activities
+        self._in_activity: bool = False
+        self._flush_scheduler: FlushScheduler | None = None
+        if settings.server_flush_enabled:
+            self._flush_scheduler = FlushScheduler(
+                interval_bytes=settings.flush_interval_bytes,
+                interval_seconds=settings.flush_interval_seconds,
+                search_window_ms=settings.flush_search_window_ms,
+                silence_rms_threshold=settings.silence_rms_threshold,
+            )
+
+        # Optional server-side VAD for clients that send no activity signals
+        self._vad: VoiceActivityDetector | None = None
+        self._vad_activity: bool = False  # Current activity was opened by the VAD
+        self._vad_held_from: int | None = None  # History offset of an unconfirmed start
+        if settings.server_vad_enabled:
+            self._vad = create_detector()
+
+        # Optional suppression of sustained silence inside a turn
+        self._silence: SilenceSuppressor | None = None
+        if settings.silence_suppression_enabled:
+            self._silence = SilenceSuppressor(
+                rms_threshold=settings.silence_rms_threshold,
+                hangover_ms=settings.silence_hangover_ms,
+                mode=settings.silence_suppression_mode,
+                marker_ms=settings.silence_marker_ms,
+                sample_rate=settings.audio_sample_rate,
+            )
+
         # Session configuration
-        self.config: dict[str, Any] = {
-            "response_modalities": ["AUDIO"],
-            "speech_config": {
-                "voice_config": {"prebuilt_voice_config": {"voice_name": "Aoede"}},
-                "language_code": "es-US",
-            },
-            "input_audio_transcription": {},
-            "output_audio_transcription": {},
-            # Disable automatic VAD - we use client-side VAD
-            "realtime_input_config": {
-                "automatic_activity_detection": {"disabled": True}
-            },
-        }
+        self.config: dict[str, Any] = live_connect_config()
+        # Resumption handles (see receive_responses) also reopen hibernated calls
+        self._tracks_handles: bool = "session_resumption" in self.config
+
+        # Per-turn latency histograms, labelled by model/voice/language
+        self._turn_timer = TurnTimer("/".join(bucket_key(self.model, self.config)))
+
+        # Optional capture of the session for offline replay
+        self._recorder: SessionRecorder | None = None
+        if settings.session_recording_enabled:
+            self._recorder = SessionRecorder.in_directory(
+                settings.session_recording_dir,
+                buffer_bytes=settings.session_recording_buffer_bytes,
+            )
 
     async def connect(self) -> bool:
         """Establishes connection with Google GenAI Live API"""
+        started = time.perf_counter()
         try:
+            if settings.session_pool_enabled:
+                pooled = await session_pool.checkout(
+                    self.client, self.model, self.config
+                )
+                if pooled is not None:
+                    self._context_manager = pooled.context_manager
+                    self.session = pooled.session
+                    self._session_opened_at = pooled.opened_at
+                    self._start_recording()
+                    self._schedule_rollover()
+                    self._start_idle_watch()
+                    UPSTREAM_CONNECTS.labels("pool").inc()
+                    UPSTREAM_CONNECT_SECONDS.observe(time.perf_counter() - started)
+                    logger.info("Connected to Gemini Live API using a warm session")
+                    return True
+
             logger.info(f"Connecting to Gemini Live API with model {self.model}")
             # Create the context manager
             self._context_manager = self.client.aio.live.connect(
-                model=self.model, config=self.config
+                model=self.model, config=_live_config(self.config)
             )
             # Enter the context manager and get the actual session
             self.session = await self._context_manager.__aenter__()
+            self._session_opened_at = time.monotonic()
+            self._start_recording()
+            self._schedule_rollover()
+            self._start_idle_watch()
+            UPSTREAM_CONNECTS.labels("direct").inc()
+            UPSTREAM_CONNECT_SECONDS.observe(time.perf_counter() - started)
             logger.info("Connection established with Gemini Live API")
             return True
         except Exception as e:
+            UPSTREAM_CONNECT_FAILURES.inc()
             logger.error(f"Error connecting to Gemini Live API: {e}")
             raise GeminiAPIError(f"Failed to connect to Gemini API: {e}") from e
 
+    def defer_connect(self) -> None:
+        """
+        Leaves connecting to the call's first turn, text or speech hint
+
+        Used instead of connect() with LAZY_CONNECT_ENABLED. The reader waits
+        for the session; calls that end before needing it never open one.
+        """
+        self._deferred = True
+        lazy_connect_totals.deferred += 1
+
+    async def _connect_deferred(self) -> None:
+        """Opens a deferred call's session, retrying before giving up"""
+        started = time.perf_counter()
+        try:
+            for attempt in range(1, settings.lazy_connect_attempts + 1):
+                try:
+                    await self.connect()
+                    break
+                except GeminiAPIError:
+                    if attempt == settings.lazy_connect_attempts:
+                        lazy_connect_totals.failed += 1
+                        return
+                    await asyncio.sleep(0.2 * 2 ** (attempt - 1))
+        finally:
+            self._waking = None
+        self._deferred = False
+        self._connected.set()
+        lazy_connect_totals.connected += 1
+        LAZY_CONNECT_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+    def _start_recording(self) -> None:
+        if self._recorder:
+            self._recorder.open({"model": self.model, "config": self.config})
+
     async def disconnect(self) -> None:
         """Closes the connection with Google GenAI Live API"""
-        if self._context_manager:
-            try:
-                await self._context_manager.__aexit__(None, None, None)
-                self.session = None
-                self._context_manager = None
-                logger.info("Connection closed with Gemini Live API")
-            except Exception as e:
-                logger.error(f"Error closing connection: {e}")
+        if self._coalescer:
+            self._coalescer.close()
+        if self._silence and self._silence.bytes_saved:
+            stats = self._silence.stats()
+            logger.info(
+                f"🔇 Silence suppression saved {stats['bytes_saved'] / 1024:.1f}KB "
+                f"({stats['saved_ratio']:.0%} of uplink audio)"
+            )
+        for task in (self._idle_watch, self._waking, self._rollover):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        if self._hibernation:
+            self._hibernation.close()
+        if self._deferred and not self._connect_needed:
+            lazy_connect_totals.avoided += 1
+        self._deferred = False
+        if self._successor:
+            self._retire(self._successor.context_manager)
+            self._successor = None
+        await self._close_upstream()
+        if self._retiring:
+            await asyncio.gather(*self._retiring, return_exceptions=True)
+        if self._recorder:
+            await self._recorder.close()  # After the upstream: cannot leak it
 
-    async def send_audio(self, audio_data: bytes) -> None:
+    async def _close_upstream(self) -> None:
+        """Closes the Live session, bounded so a dead upstream cannot stall"""
+        if not self._context_manager:
+            return
+        context_manager, self._context_manager = self._context_manager, None
+        self.session = None
+        if self._coalescer:
+            self._coalescer.close()  # Its audio and deadline were for this session
+        await self._close_context(context_manager)
+
+    async def _close_context(self, context_manager: Any) -> None:
+        try:
+            await asyncio.wait_for(
+                context_manager.__aexit__(None, None, None),
+                settings.disconnect_timeout_seconds,
+            )
+            logger.info("Connection closed with Gemini Live API")
+        except TimeoutError:
+            logger.warning(
+                "Gemini Live API did not close within "
+                f"{settings.disconnect_timeout_seconds}s, connection dropped"
+            )
+        except Exception as e:
+            logger.error(f"Error closing connection: {e}")
+
+    async def send_audio(self, audio_data: bytes | memoryview) -> None:
         """
         Sends audio data to Gemini Live API using realtime input
 
         Args:
             audio_data: Audio bytes in PCM 16kHz mono format
         """
-        if not self.session:
+        if not self.session and not self._resuming and not self._opens_on_demand:
             raise SessionNotActiveError("No active session. Call connect() first")
 
+        AUDIO_IN_BYTES.inc(len(audio_data))
+        AUDIO_IN_FRAMES.inc()
+        if self._recorder:
+            self._recorder.record(RecordKind.AUDIO_IN, audio_data)
         try:
+            if self._resuming:
+                return  # Kept in the history and replayed once resumed
+            if (
+                self._speculation
+                and self._history
+                and self._speculation.ready(self._history.end + len(audio_data))
+            ):
+                await self._start_activity(held_from=self._speculation.confirm())
+            if self._vad:
+                await self._detect_activity(audio_data)
+            if not self._in_activity and self._holds_idle_audio:
+                return  # Audio outside an activity is not forwarded
+            if self._opens_on_demand:
+                return  # Nothing to forward to until the next turn opens it
+            if self._hibernation:
+                self._hibernation.touch()
+
             # Diagnostics: tracking bytes sent
             self._bytes_since_last_activity_end += len(audio_data)
             self._total_audio_bytes += len(audio_data)
@@ -112,113 +412,240 @@ class GeminiLiveService:
                     f"{duration_since_start}, total session: {self._total_audio_bytes / 1024:.1f}KB"
                 )
 
-            # Use send_realtime_input for continuous audio streaming
-            # IMPORTANT: Specify rate in mime_type for better processing
-            await self.session.send_realtime_input(
-                audio={"data": audio_data, "mime_type": "audio/pcm;rate=16000"}
+            chunks = (
+                self._silence.process(audio_data) if self._silence else [audio_data]
             )
+            for chunk in chunks:
+                if self._coalescer:
+                    await self._coalescer.add(chunk)
+                else:
+                    await self._send_audio_chunk(chunk)
+
+            if (
+                self._flush_scheduler
+                and self._in_activity
+                and self._flush_scheduler.should_flush(audio_data)
+            ):
+                await self._server_flush()
+
+            # Speech ended (or misfired): close the activity the VAD opened
+            if self._vad and self._vad_activity and not self._vad.speaking:
+                self._vad_activity = False
+                await self.send_activity_end(source="vad")
         except Exception as e:
+            if isinstance(e, ConnectionClosed) and self._can_resume():
+                return  # The reader resumes the session and replays this audio
             logger.error(f"Error sending audio: {e}")
             raise AudioProcessingError(f"Failed to send audio: {e}") from e
+        finally:
+            # Added last so a lookback sent while handling it ends before it
+            if self._history:
+                self._history.append(audio_data)
 
-    async def receive_responses(self) -> AsyncGenerator[dict[str, Any], None]:
-        """
-        Async generator that receives responses from Gemini Live API
+    async def _detect_activity(self, audio_data: bytes | memoryview) -> None:
+        """Runs the server-side VAD and opens an activity when speech starts"""
+        assert self._vad is not None
+        batcher = shared_batcher()
+        if batcher:
+            events = await batcher.process(self._vad, audio_data)
+        else:
+            events = await self._vad.process(audio_data)
+        if events:
+            logger.debug(f"Server VAD events: {[str(event) for event in events]}")
 
-        Yields:
-            dict: Responses with audio and/or transcriptions and states
-        """
+        if self._in_activity:
+            return
+        assert self._history is not None  # Sized for the VAD's hold
+        if self._vad.speaking and self._vad_held_from is None:
+            # Held like a speculative start: a cough must not cost a turn
+            self._vad_held_from = self._history.end
+            self._begin_wake()
+        if self._vad_held_from is None:
+            return
+        if self._vad.confirmed:
+            # The held speech, then this frame, are forwarded after activity_start
+            held_from, self._vad_held_from = self._vad_held_from, None
+            await self.send_activity_start(source="vad", held_from=held_from)
+            self._vad_activity = True
+        elif not self._vad.speaking:
+            end = self._history.end + len(audio_data)
+            discarded = end - self._lookback_start(self._vad_held_from)
+            self._vad_held_from = None
+            self._lookback_from = end  # Not lookback for the next activity either
+            logger.info(f"🚫 Server VAD misfire: {discarded / 1024:.1f}KB never sent")
+
+    async def _send_audio_chunk(self, audio_data: bytes | memoryview) -> None:
+        """Sends one PCM chunk upstream as a realtime input message"""
         if not self.session:
             raise SessionNotActiveError("No active session. Call connect() first")
 
-        try:
-            is_speaking = False
-            turn_count = 0
+        # The sender (and its message buffer and mime type, which must carry
+        # the rate) is built once per session rather than per frame
+        sender = self._audio_sender
+        if sender is None or sender.session is not self.session:
+            sender = AudioSender(self.session, settings.audio_sample_rate)
+            self._audio_sender = sender
+        await sender.send(audio_data)
 
-            # Infinite loop - each iteration is a conversation turn
-            while True:
-                # Get new iterator for each turn
-                turn = self.session.receive()
+    async def _send_coalesced_chunk(self, audio_data: memoryview) -> None:
+        """Sends a coalesced chunk; dropped if the session went away meanwhile"""
+        if not self.session:
+            # A deadline flush racing hibernation or a session swap: the
+            # history still has the audio for a resumption replay
+            logger.debug(f"Dropped {len(audio_data)} coalesced bytes: no session")
+            return
+        await self._send_audio_chunk(audio_data)
 
-                async for response in turn:
-                    response_data = {}
+    def _lookback_start(self, since: int) -> int:
+        """History offset of the lookback preceding offset `since`"""
+        assert self._history is not None
+        lookback_bytes = (
+            int(self._lookback_seconds * self._history.sample_rate) * SAMPLE_WIDTH_BYTES
+        )
+        # Audio of the previous activity was forwarded with it
+        return max(self._lookback_from, since - lookback_bytes)
+
+    async def _send_lookback(self, held_from: int | None = None) -> None:
+        """
+        Forwards the audio received just before activity_start
 
-                    # Detailed log for debug
-                    logger.info(f"Response received: {type(response).__name__}")
+        Args:
+            held_from: History offset of a speculative activity_start; the
+                audio held since then is forwarded after the lookback
+        """
+        if not self._history or (held_from is None and not self._lookback_seconds):
+            return
+        history = self._history
+        since = history.end if held_from is None else held_from
+        sent = 0
+        for view in history.read(self._lookback_start(since)):
+            if self._coalescer:
+                await self._coalescer.add(view)
+            else:
+                await self._send_audio_chunk(view)
+            sent += len(view)
+        self._lookback_from = history.end
+        self._bytes_since_last_activity_end += sent
+        self._total_audio_bytes += sent
+        if sent:
+            logger.debug(f"Sent {sent / 1024:.1f}KB of pre-speech and held audio")
 
-                    # Process server content
-                    if hasattr(response, "server_content") and response.server_content:
-                        server_content = response.server_content
+    async def _server_flush(self) -> None:
+        """Splits the current activity so Gemini processes what it has so far"""
+        if not self.session or not self._flush_scheduler:
+            return
 
-                        # Input transcription (what the user said)
-                        if (
-                            hasattr(server_content, "input_transcription")
-                            and server_content.input_transcription
-                            and hasattr(server_content.input_transcription, "text")
-                        ):
-                            response_data["input_transcription"] = (
-                                server_content.input_transcription.text
-                            )
+        accumulated = self._bytes_since_last_activity_end
+        await self._flush_coalesced_audio()
+        await self.session.send_realtime_input(activity_end=types.ActivityEnd())
+        self._mark_activity(opened=False)
+        await self.session.send_realtime_input(activity_start=types.ActivityStart())
+        self._mark_activity(opened=True)
 
-                        # Output transcription (what the model says)
-                        if (
-                            hasattr(server_content, "output_transcription")
-                            and server_content.output_transcription
-                            and hasattr(server_content.output_transcription, "text")
-                        ):
-                            response_data["output_transcription"] = (
-                                server_content.output_transcription.text
-                            )
+        self._activity_cycles += 1
+        self._bytes_since_last_activity_end = 0
+        self._last_activity_start_time = time.time()
+        self._flush_scheduler.record_flush()
+        logger.info(
+            f"🔄 Server flush #{self._flush_scheduler.flushes}: "
+            f"{accumulated / 1024:.1f}KB processed, activity restarted"
+        )
 
-                        # Model turn - contains audio and/or text
-                        if (
-                            hasattr(server_content, "model_turn")
-                            and server_content.model_turn
-                        ):
-                            # Indicate that the model is speaking
-                            if not is_speaking:
-                                is_speaking = True
-                                response_data["model_state"] = "speaking"
+    async def _flush_coalesced_audio(self) -> None:
+        """Sends any coalesced audio before a control signal"""
+        if self._coalescer:
+            await self._coalescer.flush()
 
-                            parts = getattr(server_content.model_turn, "parts", None)
-                            for part in parts or []:
-                                if hasattr(part, "text") and part.text:
-                                    response_data["output_transcription"] = part.text
+    async def receive_responses(self) -> AsyncGenerator[LiveEvent, None]:
+        """
+        Async generator that receives responses from Gemini Live API
 
-                                # Response audio
-                                if hasattr(part, "inline_data") and part.inline_data:
-                                    response_data["audio"] = part.inline_data.data
+        Yields:
+            LiveEvent: Audio, transcriptions and model state of one server message
+        """
+        if self._deferred:
+            await self._connected.wait()  # Opened by the first turn
+        if not self.session:
+            raise SessionNotActiveError("No active session. Call connect() first")
 
-                        # Turn complete
+        parser = LiveMessageParser()
+        try:
+            # Infinite loop - each iteration is a conversation turn
+            while True:
+                if self._hibernation:
+                    await self._hibernation.awake.wait()  # Reopened by the next turn
+                session = self.session
+                try:
+                    # Get new iterator for each turn
+                    async for response in session.receive():
+                        if self._recorder:
+                            self._recorder.record(RecordKind.SERVER_MESSAGE, response)
                         if (
-                            hasattr(server_content, "turn_complete")
-                            and server_content.turn_complete
+                            self._tracks_handles
+                            and self._track_resumption(response)
+                            and self._successor
+                            and self._at_turn_boundary()
                         ):
-                            turn_count += 1
-                            logger.info(f"=== TURN {turn_count} COMPLETED ===")
-                            response_data["turn_complete"] = True
-                            is_speaking = False
-                            response_data["model_state"] = "listening"
-
-                        # Interruption state
-                        if (
-                            hasattr(server_content, "interrupted")
-                            and server_content.interrupted
+                            await self._switch_over()  # Reopens with the new handle
+                        if settings.session_rollover_enabled and getattr(
+                            response, "go_away", None
                         ):
-                            response_data["interrupted"] = True
-                            is_speaking = False
-                            response_data["model_state"] = "listening"
+                            self._begin_rollover("go_away")
+                        event = parser.parse(response)
+                        if event is None:
+                            continue
+                        if self._hibernation:
+                            self._hibernation.touch()
+
+                        if event.input_transcription is not None:
+                            self._turn_timer.input_transcription()
+                            if self._flush_scheduler:
+                                self._flush_scheduler.record_transcription()
+                        if event.audio is not None:
+                            self._turn_timer.audio()
+                        if event.interrupted:
+                            INTERRUPTIONS.inc()
+                            self._turn_timer.interrupted()
+                        if event.turn_complete:
+                            TURNS.inc()
+                            self._turn_timer.turn_complete()
+                            self._turn_open = False
+                        if event.speech_started and self._silence:
+                            self._silence.record_first_response()
+                        if self._transcript:
+                            self._transcript.add(event)
+                        yield event
 
-                        # Grounding metadata (the model is processing)
                         if (
-                            hasattr(server_content, "grounding_metadata")
-                            and server_content.grounding_metadata
+                            event.turn_complete
+                            and self._successor
+                            and self._at_turn_boundary()
                         ):
-                            response_data["model_state"] = "thinking"
-
-                    # Emit response if there's data
-                    if response_data:
-                        yield response_data
+                            await self._switch_over()
+                        if session is not self.session:
+                            break  # Rolled over: read the successor
+                except Exception as e:
+                    if session is not self.session:
+                        continue  # Retired by a rollover while being read
+                    successor = self._successor
+                    if successor and (
+                        successor.handle == self._resumption_handle
+                        or not self._can_resume()
+                    ):
+                        logger.warning(f"Live session lost ({e}), rolling over now")
+                        await self._switch_over(forced=True)
+                        if parser.is_speaking:
+                            parser.is_speaking = False
+                            yield LiveEvent(interrupted=True, model_state="listening")
+                        continue
+                    if not self._can_resume():
+                        raise
+                    logger.warning(f"Live session lost ({e}), resuming it")
+                    await self._resume()
+                    if parser.is_speaking:
+                        # The rest of the model turn died with the old session
+                        parser.is_speaking = False
+                        yield LiveEvent(interrupted=True, model_state="listening")
 
         except asyncio.CancelledError:
             logger.info("Response reception cancelled")
@@ -227,6 +654,392 @@ class GeminiLiveService:
             logger.error(f"Error receiving responses: {e}")
             raise
 
+    def _track_resumption(self, response: Any) -> bool:
+        """Keeps the latest resumption handle; returns whether it changed"""
+        update = getattr(response, "session_resumption_update", None)
+        if not (update and update.resumable and update.new_handle):
+            return False
+        self._resumption_handle = update.new_handle
+        # The server state behind the handle covers the uplink so far
+        self._handle_offset = self._history.end if self._history else 0
+        self._handle_in_activity = self._in_activity
+        self._activity_marks.clear()
+        self._turns_since_handle = 0
+        return True
+
+    def _mark_activity(self, opened: bool) -> None:
+        """Notes an activity signal sent upstream, for replay after resumption"""
+        if settings.session_resumption_enabled and self._history:
+            self._activity_marks.append((self._history.end, opened))
+
+    def _can_resume(self) -> bool:
+        return (
+            settings.session_resumption_enabled
+            and self._resumption_handle is not None
+            and self._context_manager is not None  # Not disconnected on purpose
+        )
+
+    @property
+    def _holds_idle_audio(self) -> bool:
+        """Whether audio outside an activity stays in the history only"""
+        return bool(self._vad or self._lookback_seconds or self._speculation)
+
+    async def _resume(self) -> None:
+        """
+        Replaces a failed Live session using the latest resumption handle
+
+        Audio received since shortly before the failure (the last
+        RESUMPTION_REPLAY_MS, but nothing the handle already covers) and
+        during the reconnect is sent again on the new session, with the
+        activity signals sent in that window. Control messages wait until
+        this is done.
+        """
+        failed_at = time.monotonic()
+        self._resuming = True
+        self._resumed.clear()
+        replayed = 0
+        try:
+            await self._close_upstream()
+            config = _live_config(self.config, self._resumption_handle)
+            for attempt in range(1, settings.resumption_max_attempts + 1):
+                try:
+                    context_manager = self.client.aio.live.connect(
+                        model=self.model, config=config
+                    )
+                    self.session = await context_manager.__aenter__()
+                    self._context_manager = context_manager
+                    break
+                except Exception as e:
+                    logger.warning(f"Resumption attempt {attempt} failed: {e}")
+                    if attempt == settings.resumption_max_attempts:
+                        UPSTREAM_RESUMPTIONS.labels("failed").inc()
+                        raise GeminiAPIError(
+                            f"Failed to resume Gemini session: {e}"
+                        ) from e
+                    await asyncio.sleep(0.2 * 2 ** (attempt - 1))
+            self._session_opened_at = time.monotonic()
+
+            replayed = await self._replay_uplink()
+        finally:
+            self._resuming = False
+            self._resumed.set()
+
+        gap = time.monotonic() - failed_at
+        UPSTREAM_RESUMPTIONS.labels("resumed").inc()
+        UPSTREAM_GAP_SECONDS.observe(gap)
+        logger.info(
+            f"🔁 Live session resumed after a {gap * 1000:.0f}ms upstream gap, "
+            f"{replayed / 1024:.1f}KB of audio replayed"
+        )
+
+    async def _replay_uplink(self) -> int:
+        """Sends the uplink to replay on a resumed session; returns audio bytes"""
+        history = self._history
+        if not history or not self.session:
+            return 0
+        replay_samples = int(settings.resumption_replay_ms * history.sample_rate / 1000)
+        position = max(
+            self._handle_offset, history.end - replay_samples * SAMPLE_WIDTH_BYTES
+        )
+        in_activity = self._handle_in_activity
+        marks = []
+        for offset, opened in self._activity_marks:
+            if offset < position:
+                in_activity = opened  # Before the window: only its state matters
+            else:
+                marks.append((offset, opened))
+        if in_activity:
+            await self.session.send_realtime_input(activity_start=types.ActivityStart())
+
+        replayed = 0
+        # Frames keep arriving (into the history) while this sends
+        while marks or position < history.end:
+            end = marks[0][0] if marks else history.end
+            if in_activity or not self._holds_idle_audio:
+                for view in history.read(position, end):
+                    await self._send_audio_chunk(view)
+                    replayed += len(view)
+            position = end
+            while marks and marks[0][0] <= position:
+                _, in_activity = marks.pop(0)
+                if in_activity:
+                    await self.session.send_realtime_input(
+                        activity_start=types.ActivityStart()
+                    )
+                else:
+                    await self.session.send_realtime_input(
+                        activity_end=types.ActivityEnd()
+                    )
+        return replayed
+
+    def _schedule_rollover(self) -> None:
+        """Prepares a successor ROLLOVER_LEAD_SECONDS before the session's max age"""
+        if not settings.session_rollover_enabled or self._session_opened_at is None:
+            return
+        age = time.monotonic() - self._session_opened_at
+        delay = settings.session_max_age_seconds - settings.rollover_lead_seconds - age
+        self._rollover = asyncio.create_task(
+            self._roll_over(max(0.0, delay), "max_age")
+        )
+
+    def _begin_rollover(self, trigger: str) -> None:
+        """Prepares a successor now, unless one is already being prepared"""
+        if self._rollover_trigger is not None or self._context_manager is None:
+            return
+        if self._rollover:
+            self._rollover.cancel()  # Only the max-age timer can be pending here
+        self._rollover = asyncio.create_task(self._roll_over(0.0, trigger))
+
+    async def _roll_over(self, delay: float, trigger: str) -> None:
+        """Opens the successor session, switching at once if the call is idle"""
+        if delay:
+            await asyncio.sleep(delay)
+        self._rollover_trigger = trigger
+        logger.info(f"⏭️ Opening a successor Live session ({trigger})")
+        while True:
+            try:
+                successor = await self._open_successor()
+            except Exception as e:
+                logger.error(f"Could not open a successor Live session: {e}")
+                self._rollover_trigger = None
+                return
+            if successor.handle == self._resumption_handle:
+                break
+            self._retire(successor.context_manager)  # A newer handle arrived
+        self._successor = successor
+        if self._at_turn_boundary():
+            await self._switch_over()
+
+    async def _open_successor(self) -> Successor:
+        """
+        Opens the session that takes over the call
+
+        With a resumption handle the server restores the conversation itself;
+        otherwise a fresh (or pooled) session is warmed with the transcript.
+        """
+        handle = self._resumption_handle
+        if handle is None and settings.session_pool_enabled:
+            pooled = await session_pool.checkout(self.client, self.model, self.config)
+            if pooled is not None:
+                successor = Successor(
+                    pooled.context_manager, pooled.session, pooled.opened_at, None, 0
+                )
+                await self._warm(successor)
+                return successor
+
+        context_manager = self.client.aio.live.connect(
+            model=self.model, config=_live_config(self.config, handle)
+        )
+        session = await context_manager.__aenter__()
+        successor = Successor(context_manager, session, time.monotonic(), handle, 0)
+        if handle is None:
+            try:
+                await self._warm(successor)
+            except BaseException:
+                self._retire(context_manager)
+                raise
+        return successor
+
+    async def _warm(self, successor: Successor) -> None:
+        """Sends the successor the transcript turns it has not seen"""
+        if not self._transcript:
+            return
+        closed = self._transcript.closed
+        turns = self._transcript.since(successor.context_turns)
+        if turns:
+            # No turn_complete: context only, the model does not answer it
+            await successor.session.send_client_content(
+                turns=turns, turn_complete=False
+            )
+        successor.context_turns = closed
+
+    def _at_turn_boundary(self) -> bool:
+        """Whether neither the caller nor the model is in a turn"""
+        return not (
+            self._turn_open or self._in_activity or self._resuming or not self.session
+        )
+
+    async def _switch_over(self, forced: bool = False) -> None:
+        """
+        Moves the call to the successor session
+
+        Args:
+            forced: The current session already failed; switch even mid-turn
+                and replay the uplink the successor's handle does not cover
+        """
+        successor = self._successor
+        if successor is None:
+            return
+        if not forced and successor.handle is not None:
+            if successor.handle != self._resumption_handle:
+                # The conversation moved on since it was opened: open a new one
+                self._successor = None
+                self._retire(successor.context_manager)
+                self._rollover = asyncio.create_task(
+                    self._roll_over(0.0, self._rollover_trigger or "go_away")
+                )
+                return
+            if self._turns_since_handle:
+                return  # Wait for the handle that covers the latest turn
+
+        started = time.perf_counter()
+        self._successor = None
+        if not forced:
+            await self._flush_coalesced_audio()  # Belongs to the old session
+        elif self._coalescer:
+            self._coalescer.close()  # Meant for the session that failed
+        retired = self._context_manager
+        self._context_manager, self.session = (
+            successor.context_manager,
+            successor.session,
+        )
+        self._session_opened_at = successor.opened_at
+        if retired is not None:
+            self._retire(retired)
+        if successor.handle is None:
+            await self._warm(successor)  # Turns completed since it was opened
+        elif forced:
+            await self._replay_uplink()
+        switchover = time.perf_counter() - started
+
+        trigger, self._rollover_trigger = self._rollover_trigger or "forced", None
+        ROLLOVER_SWITCHOVER_SECONDS.observe(switchover)
+        UPSTREAM_ROLLOVERS.labels(trigger).inc()
+        logger.info(
+            f"⏭️ Call moved to the successor Live session ({trigger}) "
+            f"in {switchover * 1000:.1f}ms"
+        )
+        self._schedule_rollover()
+
+    def _retire(self, context_manager: Any) -> None:
+        """Closes a replaced Live session in the background"""
+        task = asyncio.create_task(self._close_context(context_manager))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    @property
+    def _hibernated(self) -> bool:
+        return self._hibernation is not None and self._hibernation.hibernated
+
+    @property
+    def _opens_on_demand(self) -> bool:
+        """No session now, but the next turn opens one (deferred or hibernated)"""
+        return self._deferred or self._hibernated
+
+    def _start_idle_watch(self) -> None:
+        if self._hibernation:
+            self._idle_watch = asyncio.create_task(self._watch_idle())
+
+    async def _watch_idle(self) -> None:
+        """Hibernates the call once it has been idle for HIBERNATE_IDLE_SECONDS"""
+        assert self._hibernation is not None
+        deadline = self._hibernation.deadline
+        while True:
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+            deadline = self._hibernation.deadline
+            if deadline > time.monotonic():
+                continue  # Active since
+            if self._can_hibernate():
+                await self._hibernate()
+                return
+            deadline = time.monotonic() + HIBERNATE_RECHECK_SECONDS
+
+    def _can_hibernate(self) -> bool:
+        """Whether the session can close now and reopen where the call left off"""
+        return (
+            self._at_turn_boundary()
+            and self._successor is None
+            and self._rollover_trigger is None
+            and not (self._speculation and self._speculation.pending)
+            # A handle that misses the latest turn would lose it on reopen
+            and not (self._resumption_handle and self._turns_since_handle)
+        )
+
+    async def _hibernate(self) -> None:
+        """
+        Closes the idle call's Live session until the caller speaks again
+
+        The resumption handle (or, without one, the transcript) is kept to
+        reopen it. The response reader waits meanwhile.
+        """
+        assert self._hibernation is not None
+        idle = time.monotonic() - self._hibernation.last_active
+        if self._rollover:
+            self._rollover.cancel()  # The reopened session gets its own timer
+            self._rollover = None
+        self._hibernation.hibernate()
+        await self._close_upstream()
+        logger.info(f"💤 Live session closed after {idle:.0f}s idle (hibernated)")
+
+    def expect_speech(self) -> None:
+        """
+        Starts reopening a hibernated session on a browser speech hint
+
+        The browser VAD sends the hint as its speech probability rises, ahead
+        of activity_start, so the reconnect overlaps the start of the speech.
+        """
+        if self._deferred:
+            self._begin_wake()  # The call's first sign of use
+        elif settings.hibernate_speculative_wake and self._begin_wake():
+            hibernation_totals.speculative_wakes += 1
+
+    def _begin_wake(self) -> bool:
+        """
+        Starts opening the session of a deferred or hibernated call
+
+        Returns:
+            Whether this call started it (False if open or already opening)
+        """
+        if not self._opens_on_demand or self._waking is not None:
+            return False
+        if self._deferred:
+            self._connect_needed = True
+            self._waking = asyncio.create_task(self._connect_deferred())
+        else:
+            self._waking = asyncio.create_task(self._reopen())
+        return True
+
+    async def _wake(self) -> None:
+        """Waits for a deferred or hibernated session to open before sending on it"""
+        if not self._opens_on_demand:
+            return
+        self._begin_wake()
+        assert self._waking is not None
+        await self._waking
+        if self._deferred:
+            raise GeminiAPIError("Failed to connect to Gemini API")
+        if self._hibernated:
+            raise GeminiAPIError("Failed to reopen the hibernated Gemini session")
+
+    async def _reopen(self) -> None:
+        """Opens the Live session that ends a hibernation"""
+        assert self._hibernation is not None
+        started = time.perf_counter()
+        try:
+            # With the handle the server restores the conversation, otherwise
+            # the new session is warmed with the transcript
+            successor = await self._open_successor()
+        except Exception as e:
+            UPSTREAM_CONNECT_FAILURES.inc()
+            logger.error(f"Could not reopen the hibernated Live session: {e}")
+            return
+        finally:
+            self._waking = None
+        self._context_manager, self.session = (
+            successor.context_manager,
+            successor.session,
+        )
+        self._session_opened_at = successor.opened_at
+        hibernated_for = self._hibernation.wake()
+        wake = time.perf_counter() - started
+        HIBERNATION_WAKE_SECONDS.observe(wake)
+        logger.info(
+            f"☀️ Live session reopened in {wake * 1000:.0f}ms "
+            f"after {hibernated_for:.0f}s of hibernation"
+        )
+        self._schedule_rollover()
+        self._start_idle_watch()
+
     async def send_text(self, text: str) -> None:
         """
         Sends a text message to Gemini
@@ -234,32 +1047,105 @@ class GeminiLiveService:
         Args:
             text: Text message
         """
+        await self._resumed.wait()  # Controls go to the resumed session
+        await self._wake()
         if not self.session:
             raise SessionNotActiveError("No active session. Call connect() first")
 
+        if self._recorder:
+            self._recorder.record(RecordKind.CONTROL, {"type": "text", "content": text})
+        if self._hibernation:
+            self._hibernation.touch()
+        if self._successor and self._at_turn_boundary():
+            await self._switch_over()
+        self._turn_open = True
+        self._turns_since_handle += 1
         try:
             await self.session.send(input=text, end_of_turn=True)
         except Exception as e:
             logger.error(f"Error sending text: {e}")
             raise
 
-    async def send_activity_start(self) -> None:
-        """Sends voice activity start signal (manual VAD)"""
+    async def send_activity_start(
+        self, source: str = "client", held_from: int | None = None
+    ) -> None:
+        """
+        Sends voice activity start signal (manual VAD)
+
+        Args:
+            source: "client" for browser signals, "vad" for the server-side VAD
+            held_from: History offset of audio the server VAD held until
+                speech was confirmed; forwarded after activity_start
+        """
+        await self._resumed.wait()
+        if not self.session and not self._opens_on_demand:
+            raise SessionNotActiveError("No active session. Call connect() first")
+        if self._recorder:
+            self._recorder.record(
+                RecordKind.CONTROL, {"type": "activity_start", "source": source}
+            )
+
+        if self._speculation and self._history and source == "client":
+            # Held until enough audio confirms it (see send_audio)
+            if not self._speculation.pending and not self._in_activity:
+                self._speculation.start(self._history.end)
+                self._begin_wake()  # Reopens during the hold
+                logger.info("⏸️ Holding activity_start until speech is confirmed")
+            return
+        await self._start_activity(held_from)
+
+    async def _start_activity(self, held_from: int | None = None) -> None:
+        """Sends activity_start, then the lookback and any held audio"""
+        await self._wake()
         if not self.session:
             raise SessionNotActiveError("No active session. Call connect() first")
 
+        if self._successor and self._at_turn_boundary():
+            await self._switch_over()  # The caller starts the next turn on it
+        self._turn_open = True
+        self._turns_since_handle += 1
+        if self._hibernation:
+            self._hibernation.touch()
         try:
+            await self._flush_coalesced_audio()
             self._last_activity_start_time = time.time()
             await self.session.send_realtime_input(activity_start=types.ActivityStart())
+            self._mark_activity(opened=True)
+            self._in_activity = True
+            self._turn_timer.activity_start()
+            if self._silence:
+                self._silence.reset()
+            if self._flush_scheduler:
+                self._flush_scheduler.start()
             logger.info(f"▶️ Sent: activity_start (cycle #{self._activity_cycles + 1})")
+            await self._send_lookback(held_from)
         except Exception as e:
             logger.error(f"Error sending activity_start: {e}")
             raise
 
-    async def send_activity_end(self) -> None:
-        """Sends voice activity end signal (manual VAD)"""
+    async def send_activity_end(self, source: str = "client") -> None:
+        """
+        Sends voice activity end signal (manual VAD)
+
+        Args:
+            source: "client" for browser signals, "vad" for the server-side VAD
+        """
+        await self._resumed.wait()
+        if not self.session and not self._opens_on_demand:
+            raise SessionNotActiveError("No active session. Call connect() first")
+        if self._recorder:
+            self._recorder.record(
+                RecordKind.CONTROL, {"type": "activity_end", "source": source}
+            )
+        if self._speculation and self._speculation.pending:
+            # Speech shorter than the hold: it was real, send all of it
+            await self._start_activity(held_from=self._speculation.confirm())
+        if self._opens_on_demand:
+            return  # No activity open upstream to end
         if not self.session:
             raise SessionNotActiveError("No active session. Call connect() first")
+        if self._hibernation:
+            self._hibernation.touch()
 
         try:
             duration = ""
@@ -277,8 +1163,47 @@ class GeminiLiveService:
             # Reset counter for next cycle
             self._bytes_since_last_activity_end = 0
             self._last_activity_start_time = None
+            self._in_activity = False
+            if self._history:
+                self._lookback_from = self._history.end  # Already forwarded
 
+            # Audio held by the coalescer must reach Gemini before activity_end
+            await self._flush_coalesced_audio()
             await self.session.send_realtime_input(activity_end=types.ActivityEnd())
+            self._mark_activity(opened=False)
+            self._turn_timer.activity_end()
+            if self._flush_scheduler:
+                self._flush_scheduler.record_activity_end()
+            if self._silence:
+                self._silence.record_activity_end()
         except Exception as e:
             logger.error(f"Error sending activity_end: {e}")
             raise
+
+    async def send_activity_cancel(self) -> None:
+        """
+        Withdraws a client activity_start (false-positive speech)
+
+        A speculative activity still on hold is dropped with its audio and
+        nothing reaches Gemini. An activity already forwarded is closed with
+        activity_end, since its audio cannot be taken back.
+        """
+        await self._resumed.wait()
+        if not self.session and not self._opens_on_demand:
+            raise SessionNotActiveError("No active session. Call connect() first")
+        if self._recorder:
+            self._recorder.record(
+                RecordKind.CONTROL, {"type": "activity_cancel", "source": "client"}
+            )
+
+        if self._speculation and self._speculation.pending and self._history:
+            assert self._speculation.pending_from is not None
+            end = self._history.end
+            discarded = end - self._lookback_start(self._speculation.pending_from)
+            self._speculation.cancel(discarded)
+            self._lookback_from = end  # Not lookback for the next activity either
+            logger.info(f"🚫 activity_cancel: {discarded / 1024:.1f}KB never sent")
+        elif self._in_activity:
+            if self._speculation:
+                self._speculation.cancel_late()
+            await self.send_activity_end(source="cancel")
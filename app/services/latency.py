@@ -0,0 +1,208 @@
+"""
+Per-turn latency histograms
+Records conversation turn timings per process and per model/voice/language configuration
+"""
+
+import time
+from bisect import bisect_left
+from enum import StrEnum
+from typing import Any
+
+from app.services.metrics import Family
+from app.services.metrics import registry as metrics_registry
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    10, 25, 50, 75, 100, 150, 200, 300, 400, 500, 750,
+    1000, 1500, 2000, 3000, 5000, 7500, 10000, 20000, 30000, 60000,
+)  # fmt: skip
+
+QUANTILES: tuple[float, ...] = (0.5, 0.9, 0.99)
+
+
+class TurnMetric(StrEnum):
+    """Latencies measured for every conversation turn"""
+
+    END_TO_TRANSCRIPTION = "activity_end_to_first_transcription"
+    END_TO_AUDIO = "activity_end_to_first_audio"
+    AUDIO_TO_TURN_COMPLETE = "first_audio_to_turn_complete"
+    INTERRUPTION_TO_SILENCE = "interruption_to_silence"
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram with interpolated quantiles (like histogram_quantile)"""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self.counts: list[int] = [0] * (len(buckets_ms) + 1)
+        self.count: int = 0
+        self.sum_ms: float = 0.0
+        self.max_ms: float = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect_left(self.buckets_ms, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def quantile(self, q: float) -> float:
+        """Estimates the q-quantile in ms (0 when empty)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if index == len(self.buckets_ms):
+                    return self.max_ms  # Overflow bucket has no upper bound
+                lower = self.buckets_ms[index - 1] if index else 0.0
+                upper = min(self.buckets_ms[index], self.max_ms)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max_ms
+
+    def summary(self) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "count": self.count,
+            "avg_ms": self.sum_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+        }
+        for q in QUANTILES:
+            result[f"p{round(q * 100)}_ms"] = self.quantile(q)
+        return result
+
+
+class LatencyRegistry:
+    """Histograms per metric, for the whole process and per session configuration"""
+
+    def __init__(self) -> None:
+        self.process: dict[str, LatencyHistogram] = {}
+        self.by_config: dict[str, dict[str, LatencyHistogram]] = {}
+
+    def observe(self, metric: TurnMetric, config_key: str, seconds: float) -> None:
+        value_ms = seconds * 1000
+        self._histogram(self.process, metric).observe(value_ms)
+        self._histogram(self.by_config.setdefault(config_key, {}), metric).observe(
+            value_ms
+        )
+
+    def snapshot(
+        self, metric: str | None = None, config_key: str | None = None
+    ) -> dict[str, Any]:
+        """Returns quantile summaries, optionally filtered by metric and config"""
+
+        def summarize(histograms: dict[str, LatencyHistogram]) -> dict[str, Any]:
+            return {
+                name: histogram.summary()
+                for name, histogram in histograms.items()
+                if metric is None or name == metric
+            }
+
+        return {
+            "process": summarize(self.process),
+            "by_config": {
+                key: summarize(histograms)
+                for key, histograms in self.by_config.items()
+                if config_key is None or key == config_key
+            },
+        }
+
+    def clear(self) -> None:
+        self.process.clear()
+        self.by_config.clear()
+
+    @staticmethod
+    def _histogram(
+        histograms: dict[str, LatencyHistogram], metric: TurnMetric
+    ) -> LatencyHistogram:
+        histogram = histograms.get(metric)
+        if histogram is None:
+            histogram = histograms[metric] = LatencyHistogram()
+        return histogram
+
+
+latency_metrics = LatencyRegistry()
+
+
+def _collect_turn_latency() -> dict[str, Family]:
+    """Exports the per-config histograms as one Prometheus histogram family"""
+    samples = [
+        [
+            {"metric": str(metric), "config": config_key},
+            {
+                "counts": list(histogram.counts),
+                "sum": histogram.sum_ms / 1000,
+            },
+        ]
+        for config_key, histograms in latency_metrics.by_config.items()
+        for metric, histogram in histograms.items()
+    ]
+    return {
+        "gemini_live_turn_latency_seconds": {
+            "type": "histogram",
+            "help": "Per-turn latencies by metric and model/voice/language",
+            "mode": "sum",
+            "buckets": [bound / 1000 for bound in LATENCY_BUCKETS_MS],
+            "samples": samples,
+        }
+    }
+
+
+metrics_registry.register_collector(_collect_turn_latency)
+
+
+class TurnTimer:
+    """
+    Follows one session's turns and feeds the latency registry
+
+    The service reports client activity signals and the response events it
+    parses; each latency is recorded once per turn, on its first occurrence.
+    """
+
+    def __init__(
+        self, config_key: str, registry: LatencyRegistry = latency_metrics
+    ) -> None:
+        self.config_key = config_key
+        self.registry = registry
+        self._activity_end_at: float | None = None
+        self._awaiting_transcription: bool = False
+        self._awaiting_audio: bool = False
+        self._first_audio_at: float | None = None
+        self._barge_in_at: float | None = None
+
+    def activity_start(self) -> None:
+        # Speech while the model is still talking is a barge-in
+        if self._first_audio_at is not None:
+            self._barge_in_at = time.monotonic()
+
+    def activity_end(self) -> None:
+        self._activity_end_at = time.monotonic()
+        self._awaiting_transcription = True
+        self._awaiting_audio = True
+
+    def input_transcription(self) -> None:
+        if self._awaiting_transcription and self._activity_end_at is not None:
+            self._awaiting_transcription = False
+            self._record(TurnMetric.END_TO_TRANSCRIPTION, self._activity_end_at)
+
+    def audio(self) -> None:
+        if self._first_audio_at is None:
+            self._first_audio_at = time.monotonic()
+        if self._awaiting_audio and self._activity_end_at is not None:
+            self._awaiting_audio = False
+            self._record(TurnMetric.END_TO_AUDIO, self._activity_end_at)
+
+    def turn_complete(self) -> None:
+        if self._first_audio_at is not None:
+            self._record(TurnMetric.AUDIO_TO_TURN_COMPLETE, self._first_audio_at)
+        self._first_audio_at = None
+        self._barge_in_at = None
+
+    def interrupted(self) -> None:
+        if self._barge_in_at is not None:
+            self._record(TurnMetric.INTERRUPTION_TO_SILENCE, self._barge_in_at)
+        self._first_audio_at = None
+        self._barge_in_at = None
+
+    def _record(self, metric: TurnMetric, since: float) -> None:
+        self.registry.observe(metric, self.config_key, time.monotonic() - since)
@@ -0,0 +1,46 @@
+"""
+Deferred upstream connects
+Counts calls that opened their Live session only once a turn needed it, and those that never needed one
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from app.services.metrics import registry
+
+
+@dataclass
+class LazyConnectTotals:
+    """Process-wide counters of calls that deferred their upstream connect"""
+
+    deferred: int = 0
+    connected: int = 0
+    failed: int = 0  # Gave up after LAZY_CONNECT_ATTEMPTS, ending the call
+    avoided: int = 0  # Ended before anything needed the upstream
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "deferred": self.deferred,
+            "connected": self.connected,
+            "failed": self.failed,
+            "avoided": self.avoided,
+            "avoided_ratio": self.avoided / self.deferred if self.deferred else 0.0,
+        }
+
+
+lazy_connect_totals = LazyConnectTotals()
+
+registry.counter(
+    "gemini_live_upstream_connects_avoided_total",
+    "Calls that ended without ever needing a Live session",
+    function=lambda: lazy_connect_totals.avoided,
+)
+registry.counter(
+    "gemini_live_upstream_connects_deferred_total",
+    "Calls that deferred their Live session until the first turn",
+    function=lambda: lazy_connect_totals.deferred,
+)
+LAZY_CONNECT_WAIT_SECONDS = registry.histogram(
+    "gemini_live_lazy_connect_seconds",
+    "Time from a call's first turn, text or speech hint until its Live session is open",
+)
@@ -0,0 +1,151 @@
+"""
+Typed events extracted from Live API server messages
+Table-driven parser that turns each LiveServerMessage into at most one slotted LiveEvent
+"""
+
+import logging
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class LiveEvent:
+    """Everything the browser needs from one server message"""
+
+    __slots__ = (
+        "input_transcription",
+        "output_transcription",
+        "audio",
+        "model_state",
+        "turn_complete",
+        "interrupted",
+        "speech_started",
+    )
+
+    def __init__(
+        self,
+        input_transcription: str | None = None,
+        output_transcription: str | None = None,
+        audio: bytes | None = None,
+        model_state: str | None = None,
+        turn_complete: bool = False,
+        interrupted: bool = False,
+        speech_started: bool = False,
+    ) -> None:
+        self.input_transcription = input_transcription
+        self.output_transcription = output_transcription
+        self.audio = audio  # All inline_data parts of the message, in order
+        self.model_state = model_state  # "speaking", "listening" or "thinking"
+        self.turn_complete = turn_complete
+        self.interrupted = interrupted
+        self.speech_started = speech_started  # First model output of a turn
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.__slots__
+            if getattr(self, name) not in (None, False)
+        )
+        return f"LiveEvent({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LiveEvent):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return (
+            self.input_transcription is None
+            and self.output_transcription is None
+            and self.audio is None
+            and self.model_state is None
+            and not self.turn_complete
+            and not self.interrupted
+        )
+
+
+class LiveMessageParser:
+    """
+    Per-session parser keeping the model speaking state across messages
+
+    Each `server_content` field is looked up once and dispatched through
+    `_HANDLERS`, in the order the browser expects them to be applied.
+    """
+
+    def __init__(self) -> None:
+        self.is_speaking: bool = False
+        self.turn_count: int = 0
+
+    def parse(self, message: Any) -> LiveEvent | None:
+        """Returns the event for a server message, or None when it carries nothing"""
+        server_content = getattr(message, "server_content", None)
+        if not server_content:
+            return None
+
+        event = LiveEvent()
+        for name, handler in _HANDLERS:
+            value = getattr(server_content, name, None)
+            if value:
+                handler(self, event, value)
+        return None if event.is_empty else event
+
+    def _on_input_transcription(self, event: LiveEvent, value: Any) -> None:
+        text = getattr(value, "text", None)
+        if text is not None:
+            event.input_transcription = text
+
+    def _on_output_transcription(self, event: LiveEvent, value: Any) -> None:
+        text = getattr(value, "text", None)
+        if text is not None:
+            event.output_transcription = text
+
+    def _on_model_turn(self, event: LiveEvent, value: Any) -> None:
+        if not self.is_speaking:
+            self.is_speaking = True
+            event.model_state = "speaking"
+            event.speech_started = True
+
+        chunks: list[bytes] = []
+        for part in getattr(value, "parts", None) or ():
+            text = getattr(part, "text", None)
+            if text:
+                event.output_transcription = text
+            inline_data = getattr(part, "inline_data", None)
+            if inline_data:
+                chunks.append(inline_data.data)
+
+        if len(chunks) == 1:
+            event.audio = chunks[0]  # Common case: hand the SDK's bytes through
+        elif chunks:
+            event.audio = b"".join(chunks)
+
+    def _on_turn_complete(self, event: LiveEvent, _value: Any) -> None:
+        self.turn_count += 1
+        logger.info(f"=== TURN {self.turn_count} COMPLETED ===")
+        event.turn_complete = True
+        self.is_speaking = False
+        event.model_state = "listening"
+
+    def _on_interrupted(self, event: LiveEvent, _value: Any) -> None:
+        event.interrupted = True
+        self.is_speaking = False
+        event.model_state = "listening"
+
+    def _on_grounding_metadata(self, event: LiveEvent, _value: Any) -> None:
+        event.model_state = "thinking"
+
+
+_HANDLERS: tuple[
+    tuple[str, Callable[[LiveMessageParser, LiveEvent, Any], None]], ...
+] = (
+    ("input_transcription", LiveMessageParser._on_input_transcription),
+    ("output_transcription", LiveMessageParser._on_output_transcription),
+    ("model_turn", LiveMessageParser._on_model_turn),
+    ("turn_complete", LiveMessageParser._on_turn_complete),
+    ("interrupted", LiveMessageParser._on_interrupted),
+    ("grounding_metadata", LiveMessageParser._on_grounding_metadata),
+)
@@ -0,0 +1,560 @@
+"""
+Prometheus-compatible metrics registry
+Counters, gauges and histograms in text exposition format, merged across worker processes
+"""
+
+import abc
+import asyncio
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Default histogram buckets (seconds) for network round trips
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+# A family is the serializable form of one metric, shared by every process:
+# {"type", "help", "mode", "buckets"?, "samples": [[labels, value], ...]}
+Family = dict[str, Any]
+LabelKey = tuple[str, ...]
+
+
+class CounterValue:
+    """One counter series; `inc` is a single attribute update"""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class GaugeValue:
+    """One gauge series"""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class HistogramValue:
+    """One histogram series with per-bucket (non-cumulative) counts"""
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class _Metric(abc.ABC):
+    """
+    Base for labelled metrics
+
+    Series are created once by `labels()` and should be kept by the caller,
+    so hot paths only touch the series object. Unlabelled metrics proxy to
+    their single series. A `function` makes the value computed at collection.
+    """
+
+    kind: str = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        function: Callable[[], float] | None = None,
+        mode: str = "sum",
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.function = function
+        self.mode = mode  # How gauges combine across processes: sum or max
+        self._series: dict[LabelKey, Any] = {}
+        if not labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values: str) -> Any:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        series = self._series.get(values)
+        if series is None:
+            series = self._series[values] = self._new_series()
+        return series
+
+    @abc.abstractmethod
+    def _new_series(self) -> Any: ...
+
+    def collect(self) -> Family:
+        family: Family = {
+            "type": self.kind,
+            "help": self.documentation,
+            "mode": self.mode,
+            "samples": [],
+        }
+        if self.function is not None:
+            family["samples"].append([{}, float(self.function())])
+            return family
+        for values, series in self._series.items():
+            labels = dict(zip(self.labelnames, values, strict=True))
+            family["samples"].append([labels, self._sample(series)])
+        return family
+
+    def _sample(self, series: Any) -> Any:
+        return series.value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_series(self) -> CounterValue:
+        return CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.value += amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_series(self) -> GaugeValue:
+        return GaugeValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.value -= amount
+
+    def set(self, value: float) -> None:
+        self._default.value = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = buckets
+        super().__init__(name, documentation, labelnames)
+
+    def _new_series(self) -> HistogramValue:
+        return HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def collect(self) -> Family:
+        family = super().collect()
+        family["buckets"] = list(self.buckets)
+        return family
+
+    def _sample(self, series: HistogramValue) -> dict[str, Any]:
+        return {"counts": list(series.counts), "sum": series.sum}
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class MetricsRegistry:
+    """Holds metrics and collectors and renders them for /metrics"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], dict[str, Family]]] = []
+
+    def register(self, metric: MetricT) -> MetricT:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, **kwargs: Any) -> Counter:
+        return self.register(Counter(name, documentation, **kwargs))
+
+    def gauge(self, name: str, documentation: str, **kwargs: Any) -> Gauge:
+        return self.register(Gauge(name, documentation, **kwargs))
+
+    def histogram(self, name: str, documentation: str, **kwargs: Any) -> Histogram:
+        return self.register(Histogram(name, documentation, **kwargs))
+
+    def register_collector(self, collector: Callable[[], dict[str, Family]]) -> None:
+        """Adds a callable returning extra families (dynamic label sets)"""
+        self._collectors.append(collector)
+
+    def collect(self) -> dict[str, Family]:
+        """Snapshot of this process's metrics in serializable form"""
+        families = {name: metric.collect() for name, metric in self._metrics.items()}
+        for collector in self._collectors:
+            try:
+                families.update(collector())
+            except Exception as e:
+                logger.error(f"Metrics collector failed: {e}")
+        return families
+
+
+def merge(snapshots: Iterable[dict[str, Family]]) -> dict[str, Family]:
+    """Combines per-process snapshots (counters and histograms add up)"""
+    merged: dict[str, Family] = {}
+    series: dict[str, dict[tuple[tuple[str, str], ...], list[Any]]] = {}
+
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            if name not in merged:
+                merged[name] = {**family, "samples": []}
+                series[name] = {}
+            by_labels = series[name]
+            for labels, value in family["samples"]:
+                key = tuple(sorted(labels.items()))
+                existing = by_labels.get(key)
+                if existing is None:
+                    by_labels[key] = [labels, _copy(value)]
+                else:
+                    existing[1] = _combine(family, existing[1], value)
+
+    for name, family in merged.items():
+        family["samples"] = list(series[name].values())
+    return merged
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {"counts": list(value["counts"]), "sum": value["sum"]}
+    return value
+
+
+def _combine(family: Family, current: Any, value: Any) -> Any:
+    if family["type"] == "histogram":
+        current["counts"] = [
+            a + b for a, b in zip(current["counts"], value["counts"], strict=True)
+        ]
+        current["sum"] += value["sum"]
+        return current
+    if family["type"] == "gauge" and family.get("mode") == "max":
+        return max(current, value)
+    return current + value
+
+
+def render(families: dict[str, Family]) -> str:
+    """Formats families in the Prometheus text exposition format"""
+    lines: list[str] = []
+    for name, family in sorted(families.items()):
+        lines.append(f"# HELP {name} {_escape_help(family['help'])}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for labels, value in family["samples"]:
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            bounds = [*family["buckets"], float("inf")]
+            for bound, count in zip(bounds, value["counts"], strict=True):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(
+                    f"{name}_bucket{_labels({**labels, 'le': le})} {cumulative}"
+                )
+            lines.append(f"{name}_sum{_labels(labels)} {_number(value['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape_label(str(v))}"' for key, v in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MultiProcessStore:
+    """
+    Snapshot files shared by the uvicorn workers of one deployment
+
+    Every process writes `metrics-<pid>.json` atomically; a scrape served by
+    any worker merges the files of all live workers. As in prometheus_client's
+    multiprocess mode, the counters and histograms of a worker that stopped or
+    died are folded into `metrics-retired.json` so totals never go backwards;
+    its gauges are dropped.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+
+    @property
+    def path(self) -> Path:
+        # Resolved on use: workers may be forked after this object is created
+        return self.directory / f"metrics-{os.getpid()}.json"
+
+    def write(self, snapshot: dict[str, Family]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(snapshot), encoding="utf-8")
+        os.replace(temporary, self.path)
+
+    @property
+    def retired_path(self) -> Path:
+        return self.directory / "metrics-retired.json"
+
+    def read_all(self) -> list[dict[str, Family]]:
+        snapshots = []
+        for path in self.directory.glob("metrics-*.json"):
+            if path == self.retired_path:
+                continue
+            pid = int(path.stem.removeprefix("metrics-"))
+            if pid != os.getpid() and not _pid_alive(pid):
+                self._retire(path)
+                continue
+            snapshot = self._read(path)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        retired = self._read(self.retired_path)
+        if retired is not None:
+            snapshots.append(retired)
+        return snapshots
+
+    def _read(self, path: Path) -> dict[str, Family] | None:
+        try:
+            snapshot: dict[str, Family] = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable metrics snapshot {path}: {e}")
+            return None
+        return snapshot
+
+    def _retire(self, path: Path) -> None:
+        """Folds a dead worker's counters and histograms into the retired totals"""
+        # Any worker may be scraping; the lock makes fold-and-unlink happen once
+        with open(self.directory / "metrics.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not path.exists():
+                return  # Folded by another worker
+            dead = self._read(path) or {}
+            cumulative = {
+                name: family
+                for name, family in dead.items()
+                if family["type"] != "gauge"
+            }
+            if cumulative:
+                retired = merge([self._read(self.retired_path) or {}, cumulative])
+                temporary = self.retired_path.with_suffix(".tmp")
+                temporary.write_text(json.dumps(retired), encoding="utf-8")
+                os.replace(temporary, self.retired_path)
+            path.unlink()
+
+    def retire(self, snapshot: dict[str, Family]) -> None:
+        """Publishes this process's final snapshot into the retired totals"""
+        self.write(snapshot)
+        self._retire(self.path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _resident_memory_bytes() -> float:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+registry = MetricsRegistry()
+
+# Sessions and upstream connections
+ACTIVE_SESSIONS = registry.gauge(
+    "gemini_live_websocket_sessions_active", "Browser WebSocket sessions open"
+)
+UPSTREAM_CONNECTS = registry.counter(
+    "gemini_live_upstream_connects_total",
+    "Live API sessions obtained, by source (direct or pool)",
+    labelnames=("source",),
+)
+UPSTREAM_CONNECT_FAILURES = registry.counter(
+    "gemini_live_upstream_connect_failures_total", "Failed Live API connects"
+)
+UPSTREAM_CONNECT_SECONDS = registry.histogram(
+    "gemini_live_upstream_connect_seconds", "Time to obtain a Live API session"
+)
+UPSTREAM_RESUMPTIONS = registry.counter(
+    "gemini_live_upstream_resumptions_total",
+    "Live sessions resumed after an upstream failure, by outcome",
+    labelnames=("outcome",),
+)
+UPSTREAM_GAP_SECONDS = registry.histogram(
+    "gemini_live_upstream_gap_seconds",
+    "Time from an upstream failure until the resumed session carries audio",
+)
+UPSTREAM_ROLLOVERS = registry.counter(
+    "gemini_live_upstream_rollovers_total",
+    "Calls moved to a successor Live session before the lifetime limit, by trigger",
+    labelnames=("trigger",),
+)
+ROLLOVER_SWITCHOVER_SECONDS = registry.histogram(
+    "gemini_live_rollover_switchover_seconds",
+    "Time from a turn boundary until uplink audio flows to the successor session",
+)
+HIBERNATION_WAKE_SECONDS = registry.histogram(
+    "gemini_live_hibernation_wake_seconds",
+    "Time to reopen the Live session of a hibernated call",
+)
+
+# Audio
+AUDIO_IN_BYTES = registry.counter(
+    "gemini_live_audio_in_bytes_total", "Microphone audio bytes received for Gemini"
+)
+AUDIO_IN_FRAMES = registry.counter(
+    "gemini_live_audio_in_frames_total", "Microphone audio frames (rate() = frames/s)"
+)
+AUDIO_OUT_BYTES = registry.counter(
+    "gemini_live_audio_out_bytes_total", "Response audio bytes written to browsers"
+)
+AUDIO_OUT_FRAMES = registry.counter(
+    "gemini_live_audio_out_frames_total", "Response audio messages written to browsers"
+)
+
+# Turns
+TURNS = registry.counter("gemini_live_turns_total", "Completed model turns")
+INTERRUPTIONS = registry.counter(
+    "gemini_live_interruptions_total", "Model turns interrupted by the user"
+)
+
+# Event loop and process
+EVENT_LOOP_LAG = registry.gauge(
+    "gemini_live_event_loop_lag_seconds",
+    "Worst recent event loop scheduling delay (max across workers)",
+    mode="max",
+)
+registry.counter(
+    "process_cpu_seconds_total", "CPU time of the workers", function=time.process_time
+)
+registry.gauge(
+    "process_resident_memory_bytes",
+    "Resident memory of the workers",
+    function=_resident_memory_bytes,
+)
+
+
+class MetricsReporter:
+    """
+    Background task measuring event-loop lag and publishing snapshots
+
+    Lag is how late a `lag_interval_seconds` sleep wakes up; the gauge holds
+    the worst value of the current `snapshot_interval_seconds` window. With a
+    multi-process directory configured the snapshot file is refreshed at the
+    end of every window so other workers can serve it.
+    """
+
+    def __init__(
+        self,
+        multiproc_dir: str,
+        lag_interval_seconds: float,
+        snapshot_interval_seconds: float,
+    ) -> None:
+        self.store = MultiProcessStore(multiproc_dir) if multiproc_dir else None
+        self.lag_interval_seconds = lag_interval_seconds
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self.store:
+            try:
+                self.store.retire(registry.collect())
+            except OSError as e:
+                logger.error(f"Error retiring metrics snapshot: {e}")
+
+    def render(self) -> str:
+        """Renders the exposition text for a scrape (all workers when configured)"""
+        snapshot = registry.collect()
+        if not self.store:
+            return render(merge([snapshot]))
+        self.store.write(snapshot)
+        return render(merge(self.store.read_all()))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        window_started = loop.time()
+        window_max = 0.0
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.lag_interval_seconds)
+            now = loop.time()
+            # Report the worst lag of the current window so spikes survive
+            # until the next snapshot instead of the next tick
+            lag = max(0.0, now - started - self.lag_interval_seconds)
+            window_max = max(window_max, lag)
+            EVENT_LOOP_LAG.set(window_max)
+
+            if now - window_started < self.snapshot_interval_seconds:
+                continue
+            if self.store:
+                try:
+                    self.store.write(registry.collect())
+                except OSError as e:
+                    logger.error(f"Error writing metrics snapshot: {e}")
+            window_started = now
+            window_max = 0.0
@@ -0,0 +1,129 @@
+"""
+Fixed-capacity ring buffer of int16 PCM
+Keeps the last few seconds of a session's audio in one preallocated bytearray
+"""
+
+import weakref
+from typing import Any
+
+from app.services.audio_utils import SAMPLE_WIDTH_BYTES
+from app.services.metrics import registry
+
+_active_buffers: "weakref.WeakSet[PcmRingBuffer]" = weakref.WeakSet()
+
+registry.gauge(
+    "gemini_live_audio_history_bytes",
+    "Memory reserved for per-session audio history",
+    function=lambda: sum(buffer.capacity for buffer in list(_active_buffers)),
+)
+
+
+class PcmRingBuffer:
+    """
+    The most recent `capacity_seconds` of a PCM stream
+
+    Positions are stream offsets: bytes appended since the buffer was created,
+    so a position keeps meaning the same audio while the ring wraps. Times are
+    stream seconds, the audio duration up to a position. Appends copy the
+    frame in place (no shifting) and reads return memoryviews of the ring:
+    one view, or two when the window wraps. Views stay valid until the next
+    append overwrites that audio.
+    """
+
+    def __init__(self, capacity_seconds: float, sample_rate: int = 16000) -> None:
+        self.sample_rate = sample_rate
+        self.bytes_per_second = sample_rate * SAMPLE_WIDTH_BYTES
+        samples = max(1, int(capacity_seconds * sample_rate))
+        self.capacity: int = samples * SAMPLE_WIDTH_BYTES
+        self._buffer = bytearray(self.capacity)
+        self.end: int = 0  # Stream offset after the newest byte
+        self._floor: int = 0  # Nothing before this offset is held (see clear)
+        _active_buffers.add(self)
+
+    @property
+    def start(self) -> int:
+        """Stream offset of the oldest byte still held"""
+        return max(self._floor, self.end - self.capacity)
+
+    @property
+    def buffered_bytes(self) -> int:
+        return self.end - self.start
+
+    @property
+    def duration_seconds(self) -> float:
+        """Stream time of the newest byte"""
+        return self.end / self.bytes_per_second
+
+    def append(self, pcm: bytes | bytearray | memoryview) -> None:
+        size = len(pcm)
+        if size >= self.capacity:
+            # Only the tail survives; lay it out so the ring stays in stream order
+            tail = memoryview(pcm)[size - self.capacity :]
+            self.end += size
+            split = self.end % self.capacity
+            self._buffer[split:] = tail[: self.capacity - split]
+            self._buffer[:split] = tail[self.capacity - split :]
+            return
+        position = self.end % self.capacity
+        first = self.capacity - position
+        if size <= first:
+            self._buffer[position : position + size] = pcm
+        else:
+            frame = memoryview(pcm)  # Split without copying the halves first
+            self._buffer[position:] = frame[:first]
+            self._buffer[: size - first] = frame[first:]
+        self.end += size
+
+    def offset_at(self, seconds: float) -> int:
+        """Stream offset of stream time `seconds`, clamped to the held audio"""
+        offset = int(seconds * self.sample_rate) * SAMPLE_WIDTH_BYTES
+        return min(max(offset, self.start), self.end)
+
+    def time_of(self, offset: int) -> float:
+        """Stream time of a stream offset"""
+        return offset / self.bytes_per_second
+
+    def read(self, start: int, end: int | None = None) -> list[memoryview]:
+        """Views of the audio between two stream offsets (clamped to what is held)"""
+        start = max(start, self.start)
+        end = self.end if end is None else min(end, self.end)
+        if end <= start:
+            return []
+        view = memoryview(self._buffer)
+        first, last = start % self.capacity, end % self.capacity or self.capacity
+        if first < last:
+            return [view[first:last]]
+        return [view[first:], view[:last]]
+
+    def window(
+        self, start_seconds: float, end_seconds: float | None = None
+    ) -> list[memoryview]:
+        """Views of the audio between two stream times"""
+        end = None if end_seconds is None else self.offset_at(end_seconds)
+        return self.read(self.offset_at(start_seconds), end)
+
+    def last(self, seconds: float) -> list[memoryview]:
+        """Views of the most recent `seconds` of audio"""
+        samples = int(seconds * self.sample_rate)
+        return self.read(self.end - samples * SAMPLE_WIDTH_BYTES)
+
+    def clear(self) -> None:
+        """Forgets the held audio; stream offsets keep counting"""
+        self._floor = self.end
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "capacity_bytes": self.capacity,
+            "buffered_bytes": self.buffered_bytes,
+            "buffered_seconds": self.buffered_bytes / self.bytes_per_second,
+        }
+
+
+def aggregate_stats() -> dict[str, Any]:
+    """Process-wide audio history memory for /stats"""
+    buffers = list(_active_buffers)
+    return {
+        "buffers": len(buffers),
+        "capacity_bytes": sum(buffer.capacity for buffer in buffers),
+        "buffered_bytes": sum(buffer.buffered_bytes for buffer in buffers),
+    }
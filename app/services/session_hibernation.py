@@ -0,0 +1,117 @@
+"""
+Hibernation of idle Live sessions
+Tracks how long a call has been idle and which calls closed their upstream session until the caller speaks again
+"""
+
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any
+
+from app.services.metrics import registry
+
+
+@dataclass
+class HibernationTotals:
+    """Process-wide counters of hibernated and reopened sessions"""
+
+    hibernations: int = 0
+    wakes: int = 0
+    speculative_wakes: int = 0  # Reopens started by a browser speech hint
+    hibernated_seconds: float = 0.0  # Upstream time saved by woken sessions
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hibernations": self.hibernations,
+            "wakes": self.wakes,
+            "speculative_wakes": self.speculative_wakes,
+            "hibernated_seconds": round(self.hibernated_seconds, 3),
+        }
+
+
+hibernation_totals = HibernationTotals()
+
+_active_states: "weakref.WeakSet[Hibernation]" = weakref.WeakSet()
+
+registry.gauge(
+    "gemini_live_sessions_hibernated",
+    "Calls whose idle Live session is closed until the caller speaks",
+    function=lambda: sum(1 for state in list(_active_states) if state.hibernated),
+)
+registry.gauge(
+    "gemini_live_sessions_live",
+    "Calls with hibernation enabled whose Live session is open",
+    function=lambda: sum(1 for state in list(_active_states) if not state.hibernated),
+)
+registry.counter(
+    "gemini_live_hibernations_total",
+    "Idle Live sessions closed to free upstream capacity",
+    function=lambda: hibernation_totals.hibernations,
+)
+registry.counter(
+    "gemini_live_hibernation_wakes_total",
+    "Hibernated calls that reopened a Live session",
+    function=lambda: hibernation_totals.wakes,
+)
+
+
+class Hibernation:
+    """
+    One call's idle clock and hibernated state
+
+    The service touches the clock whenever audio, text or a turn signal goes
+    upstream and whenever the model answers. `awake` is set while the call
+    has a Live session; the response reader waits on it while hibernated.
+    """
+
+    def __init__(self, idle_seconds: float) -> None:
+        self.idle_seconds = idle_seconds
+        self.last_active: float = time.monotonic()
+        self.awake = asyncio.Event()
+        self.awake.set()
+        self._hibernated_at: float | None = None
+        _active_states.add(self)
+
+    @property
+    def hibernated(self) -> bool:
+        return not self.awake.is_set()
+
+    @property
+    def deadline(self) -> float:
+        """time.monotonic() at which the call has been idle for idle_seconds"""
+        return self.last_active + self.idle_seconds
+
+    def touch(self) -> None:
+        self.last_active = time.monotonic()
+
+    def hibernate(self) -> None:
+        self._hibernated_at = time.monotonic()
+        self.awake.clear()
+        hibernation_totals.hibernations += 1
+
+    def wake(self) -> float:
+        """Marks the call live again; returns how long it was hibernated"""
+        now = time.monotonic()
+        hibernated_for = now - (self._hibernated_at or now)
+        self._hibernated_at = None
+        self.last_active = now
+        self.awake.set()
+        hibernation_totals.wakes += 1
+        hibernation_totals.hibernated_seconds += hibernated_for
+        return hibernated_for
+
+    def close(self) -> None:
+        """Stops counting the call, once it has ended"""
+        _active_states.discard(self)
+
+
+def aggregate_stats() -> dict[str, Any]:
+    """Process-wide hibernated and live session counts for /stats"""
+    states = list(_active_states)
+    hibernated = sum(1 for state in states if state.hibernated)
+    return {
+        "live": len(states) - hibernated,
+        "hibernated": hibernated,
+        **hibernation_totals.stats(),
+    }
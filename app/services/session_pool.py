@@ -0,0 +1,239 @@
+"""
+Pool of pre-warmed Google GenAI Live sessions
+Keeps already-open sessions per model/voice/language so calls start without a handshake
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+BucketKey = tuple[str, str, str]
+
+
+@dataclass
+class PooledSession:
+    """An open Live session waiting to be checked out"""
+
+    context_manager: Any
+    session: Any
+    opened_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.opened_at
+
+
+@dataclass
+class _Bucket:
+    """Warm sessions sharing one model/voice/language configuration"""
+
+    client: Any
+    model: str
+    config: dict[str, Any]
+    idle: deque[PooledSession] = field(default_factory=deque)
+    opening: int = 0
+
+
+def bucket_key(model: str, config: dict[str, Any]) -> BucketKey:
+    """Builds the pool bucket key for a session configuration"""
+    speech_config = config.get("speech_config", {})
+    voice = (
+        speech_config.get("voice_config", {})
+        .get("prebuilt_voice_config", {})
+        .get("voice_name", "")
+    )
+    return (model, voice, speech_config.get("language_code", ""))
+
+
+class LiveSessionPool:
+    """Keeps Live sessions open ahead of time and refills them in the background"""
+
+    def __init__(
+        self,
+        min_size: int,
+        max_size: int,
+        max_idle_seconds: float,
+        max_age_seconds: float,
+        refill_interval_seconds: float,
+    ) -> None:
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.max_age_seconds = max_age_seconds
+        self.refill_interval_seconds = refill_interval_seconds
+
+        self._buckets: dict[BucketKey, _Bucket] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+        # Metrics
+        self._hits: int = 0
+        self._misses: int = 0
+        self._opened: int = 0
+        self._open_failures: int = 0
+        self._evicted: int = 0
+        self._checkout_seconds_total: float = 0.0
+        self._checkout_seconds_max: float = 0.0
+
+    @property
+    def idle_count(self) -> int:
+        return sum(len(bucket.idle) for bucket in self._buckets.values())
+
+    def register(self, client: Any, model: str, config: dict[str, Any]) -> BucketKey:
+        """Declares a configuration the pool should keep warm"""
+        key = bucket_key(model, config)
+        if key not in self._buckets:
+            self._buckets[key] = _Bucket(client=client, model=model, config=config)
+            logger.info(f"Session pool bucket registered: {key}")
+            self._wakeup.set()
+        return key
+
+    async def checkout(
+        self, client: Any, model: str, config: dict[str, Any]
+    ) -> PooledSession | None:
+        """
+        Takes a warm session for the given configuration
+
+        Returns:
+            PooledSession, or None when no warm session is available
+        """
+        start = time.perf_counter()
+        key = self.register(client, model, config)
+        bucket = self._buckets[key]
+
+        pooled = None
+        while bucket.idle:
+            candidate = bucket.idle.popleft()
+            if self._is_expired(candidate):
+                await self._close(candidate)
+                self._evicted += 1
+                continue
+            pooled = candidate
+            break
+
+        elapsed = time.perf_counter() - start
+        self._checkout_seconds_total += elapsed
+        self._checkout_seconds_max = max(self._checkout_seconds_max, elapsed)
+        if pooled is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+
+        # Replace what was taken (or warm up a bucket that just missed)
+        self._wakeup.set()
+        return pooled
+
+    def start(self) -> None:
+        """Starts the background refill/eviction task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("Session pool started")
+
+    async def stop(self) -> None:
+        """Stops background maintenance and closes every idle session"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        for bucket in self._buckets.values():
+            while bucket.idle:
+                await self._close(bucket.idle.popleft())
+        logger.info("Session pool stopped")
+
+    def stats(self) -> dict[str, Any]:
+        """Returns pool occupancy, hit rate and checkout latency"""
+        checkouts = self._hits + self._misses
+        return {
+            "buckets": len(self._buckets),
+            "idle": self.idle_count,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / checkouts if checkouts else 0.0,
+            "opened": self._opened,
+            "open_failures": self._open_failures,
+            "evicted": self._evicted,
+            "checkout_latency_ms_avg": (
+                self._checkout_seconds_total / checkouts * 1000 if checkouts else 0.0
+            ),
+            "checkout_latency_ms_max": self._checkout_seconds_max * 1000,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            await self.evict_expired()
+            await self.refill()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.refill_interval_seconds
+                )
+
+    async def evict_expired(self) -> None:
+        """Closes idle sessions that are too old to hand out"""
+        for bucket in self._buckets.values():
+            fresh = deque(s for s in bucket.idle if not self._is_expired(s))
+            expired = [s for s in bucket.idle if self._is_expired(s)]
+            bucket.idle = fresh
+            for pooled in expired:
+                await self._close(pooled)
+                self._evicted += 1
+            if expired:
+                logger.info(f"Session pool evicted {len(expired)} expired session(s)")
+
+    async def refill(self) -> None:
+        """Opens sessions until every bucket reaches min_size (bounded by max_size)"""
+        openings = []
+        total = self.idle_count + sum(b.opening for b in self._buckets.values())
+        for bucket in self._buckets.values():
+            missing = self.min_size - len(bucket.idle) - bucket.opening
+            while missing > 0 and total < self.max_size:
+                bucket.opening += 1
+                openings.append(self._open(bucket))
+                missing -= 1
+                total += 1
+        if openings:
+            await asyncio.gather(*openings)
+
+    async def _open(self, bucket: _Bucket) -> None:
+        try:
+            context_manager = bucket.client.aio.live.connect(
+                model=bucket.model, config=bucket.config
+            )
+            session = await context_manager.__aenter__()
+            bucket.idle.append(PooledSession(context_manager, session))
+            self._opened += 1
+        except Exception as e:
+            self._open_failures += 1
+            logger.error(f"Session pool failed to open a session: {e}")
+        finally:
+            bucket.opening -= 1
+
+    def _is_expired(self, pooled: PooledSession) -> bool:
+        age = pooled.age
+        return age >= self.max_idle_seconds or age >= self.max_age_seconds
+
+    async def _close(self, pooled: PooledSession) -> None:
+        try:
+            await pooled.context_manager.__aexit__(None, None, None)
+        except Exception as e:
+            logger.error(f"Error closing pooled session: {e}")
+
+
+# Global pool instance
+session_pool = LiveSessionPool(
+    min_size=settings.session_pool_min_size,
+    max_size=settings.session_pool_max_size,
+    max_idle_seconds=settings.session_pool_max_idle_seconds,
+    max_age_seconds=settings.session_max_age_seconds,
+    refill_interval_seconds=settings.session_pool_refill_interval_seconds,
+)
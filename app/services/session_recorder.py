@@ -0,0 +1,175 @@
+"""
+Session record-and-replay capture format
+Append-only binary log of one session's uplink audio, control signals and server messages
+
+File layout: MAGIC, then records of a fixed header followed by the payload.
+The header (RECORD_HEADER) is kind (uint8), seconds since the recording
+started (float64, monotonic clock) and payload length (uint32), little-endian.
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import time
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, BinaryIO, NamedTuple
+
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"GLREC\x01"
+RECORD_HEADER = struct.Struct("<BdI")
+FILE_SUFFIX = ".glrec"
+
+# One writer thread for every session: writes stay ordered and off the event loop
+_writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recorder")
+
+
+class RecordKind(IntEnum):
+    """What a record's payload holds"""
+
+    METADATA = 0  # JSON: model, config and wall-clock start of the session
+    AUDIO_IN = 1  # Raw PCM frame as received from the browser
+    CONTROL = 2  # JSON: {"type": "activity_start" | "activity_end" | "activity_cancel" | "text", ...}
+    SERVER_MESSAGE = 3  # LiveServerMessage JSON with API field names
+
+
+class Record(NamedTuple):
+    kind: RecordKind
+    timestamp: float  # Seconds since the recording started
+    payload: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.payload)
+
+    def server_message(self) -> types.LiveServerMessage:
+        return types.LiveServerMessage.model_validate_json(self.payload)
+
+
+def _encode(kind: RecordKind, timestamp: float, payload: Any) -> bytes:
+    if isinstance(payload, types.LiveServerMessage):
+        payload = payload.model_dump_json(by_alias=True, exclude_none=True)
+    elif isinstance(payload, dict):
+        payload = json.dumps(payload, separators=(",", ":"))
+    data: bytes = payload.encode() if isinstance(payload, str) else payload
+    return RECORD_HEADER.pack(kind, timestamp, len(data)) + data
+
+
+def _write(file: BinaryIO, pending: list[tuple[RecordKind, float, Any]]) -> None:
+    file.write(b"".join(_encode(*record) for record in pending))
+
+
+class SessionRecorder:
+    """
+    Captures one session to `path`
+
+    `record` only appends to an in-memory batch; batches are encoded and
+    written by the shared writer thread once `buffer_bytes` of payload has
+    accumulated, and on `close`. Server messages are serialized there too.
+    A failed write is logged and stops the recording; it never fails the call.
+    """
+
+    def __init__(self, path: Path | str, buffer_bytes: int = 65536) -> None:
+        self.path = Path(path)
+        self.buffer_bytes = buffer_bytes
+        self._started = time.monotonic()
+        self._pending: list[tuple[RecordKind, float, Any]] = []
+        self._pending_bytes: int = 0
+        self._file: BinaryIO | None = None
+        self._last_write: asyncio.Future[None] | None = None
+        self._failed = False
+
+        self.records: int = 0
+
+    @classmethod
+    def in_directory(
+        cls, directory: Path | str, buffer_bytes: int = 65536
+    ) -> "SessionRecorder":
+        """Recorder writing to a new, uniquely named file in `directory`"""
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}{FILE_SUFFIX}"
+        return cls(Path(directory) / name, buffer_bytes)
+
+    def open(self, metadata: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")  # noqa: SIM115 - closed in close()
+        self._file.write(MAGIC)
+        self._started = time.monotonic()
+        self.record(
+            RecordKind.METADATA, {**metadata, "started_at": time.time(), "version": 1}
+        )
+        logger.info(f"⏺️ Recording session to {self.path}")
+
+    def record(self, kind: RecordKind, payload: Any) -> None:
+        """Appends a record; payload is bytes, text, a JSON dict or a server message"""
+        if self._file is None or self._failed:
+            return
+        if isinstance(payload, bytearray | memoryview):
+            payload = bytes(payload)  # The caller may reuse its buffer
+        self._pending.append((kind, time.monotonic() - self._started, payload))
+        self.records += 1
+        if isinstance(payload, bytes):
+            self._pending_bytes += len(payload)
+        else:
+            self._pending_bytes += 512  # Rough size of a serialized message
+        if self._pending_bytes >= self.buffer_bytes:
+            self._submit()
+
+    async def close(self) -> None:
+        """Writes what is left and closes the file; errors are logged, not raised"""
+        if self._file is None:
+            return
+        self._submit()
+        file, self._file = self._file, None
+        try:
+            if self._last_write is not None:
+                await asyncio.wait((self._last_write,))  # Failures already logged
+        finally:
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    _writer_executor, file.close
+                )
+            except OSError as e:
+                logger.error(f"Error closing recording {self.path}: {e}")
+        if not self._failed:
+            logger.info(f"⏹️ Recorded {self.records} records to {self.path}")
+
+    def _submit(self) -> None:
+        if not self._pending or self._file is None or self._failed:
+            return
+        pending, self._pending = self._pending, []
+        self._pending_bytes = 0
+        self._last_write = asyncio.get_running_loop().run_in_executor(
+            _writer_executor, _write, self._file, pending
+        )
+        self._last_write.add_done_callback(self._check_write)
+
+    def _check_write(self, write: "asyncio.Future[None]") -> None:
+        # Retrieves every write's error, so none is lost unobserved
+        if write.cancelled() or write.exception() is None or self._failed:
+            return
+        self._failed = True
+        self._pending.clear()
+        logger.error(
+            f"Recording to {self.path} failed, no longer recording: {write.exception()}"
+        )
+
+
+def read_records(path: Path | str) -> Iterator[Record]:
+    """Yields every record of a capture, stopping at a truncated tail"""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        while header := file.read(RECORD_HEADER.size):
+            if len(header) < RECORD_HEADER.size:
+                return  # Process died mid-write
+            kind, timestamp, length = RECORD_HEADER.unpack(header)
+            payload = file.read(length)
+            if len(payload) < length:
+                return
+            yield Record(RecordKind(kind), timestamp, payload)
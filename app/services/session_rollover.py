@@ -0,0 +1,59 @@
+"""
+Successor sessions for calls that outlive one Live session
+Keeps the conversation transcript that warms a successor and the state of the session waiting to take over
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from app.services.live_events import LiveEvent
+
+
+class ConversationTranscript:
+    """
+    The last `max_turns` turns of a call, as Live API `Content` dicts
+
+    Fed with the session's events: transcription fragments accumulate into
+    the current user and model turns, which are closed by turn_complete.
+    `sent` counts turns ever closed, so a successor can be sent only the
+    turns it has not seen yet.
+    """
+
+    def __init__(self, max_turns: int) -> None:
+        self._turns: deque[dict[str, Any]] = deque(maxlen=max(1, max_turns))
+        self._user: list[str] = []
+        self._model: list[str] = []
+        self.closed: int = 0  # Turns closed since the call started
+
+    def add(self, event: LiveEvent) -> None:
+        if event.input_transcription:
+            self._user.append(event.input_transcription)
+        if event.output_transcription:
+            self._model.append(event.output_transcription)
+        if event.turn_complete or event.interrupted:
+            self._close("user", self._user)
+            self._close("model", self._model)
+
+    def _close(self, role: str, fragments: list[str]) -> None:
+        text = "".join(fragments).strip()
+        fragments.clear()
+        if text:
+            self._turns.append({"role": role, "parts": [{"text": text}]})
+            self.closed += 1
+
+    def since(self, closed: int) -> list[dict[str, Any]]:
+        """Turns closed after the first `closed` ones that are still kept"""
+        new = min(self.closed - closed, len(self._turns))
+        return list(self._turns)[len(self._turns) - new :] if new > 0 else []
+
+
+@dataclass
+class Successor:
+    """A Live session opened to take over the call at the next turn boundary"""
+
+    context_manager: Any
+    session: Any
+    opened_at: float  # time.monotonic() at open
+    handle: str | None  # Resumption handle it was opened with, if any
+    context_turns: int  # Transcript turns already sent to it
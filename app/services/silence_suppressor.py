@@ -0,0 +1,181 @@
+"""
+Uplink silence suppression
+Drops (or shortens to a marker) sustained silence inside a turn before it is sent upstream
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from app.services.audio_utils import SAMPLE_WIDTH_BYTES, pcm16_rms
+from app.services.metrics import registry
+
+
+class SuppressionMode(StrEnum):
+    """What replaces a suppressed stretch of silence"""
+
+    DROP = "drop"  # Nothing is sent
+    MARKER = "marker"  # A short block of digital silence is sent once per stretch
+
+
+@dataclass
+class SilenceTotals:
+    """Process-wide suppression counters and time-to-first-response by turn kind"""
+
+    bytes_in: int = 0
+    bytes_saved: int = 0
+    markers: int = 0
+    suppressed_turn_count: int = 0
+    suppressed_turn_ttfr_seconds_total: float = 0.0
+    plain_turn_count: int = 0
+    plain_turn_ttfr_seconds_total: float = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "bytes_in": self.bytes_in,
+            "bytes_saved": self.bytes_saved,
+            "saved_ratio": self.bytes_saved / self.bytes_in if self.bytes_in else 0.0,
+            "markers": self.markers,
+            "ttfr_ms_avg_suppressed_turns": _avg_ms(
+                self.suppressed_turn_ttfr_seconds_total, self.suppressed_turn_count
+            ),
+            "ttfr_ms_avg_plain_turns": _avg_ms(
+                self.plain_turn_ttfr_seconds_total, self.plain_turn_count
+            ),
+        }
+
+
+silence_totals = SilenceTotals()
+
+registry.counter(
+    "gemini_live_silence_suppressed_bytes_total",
+    "Uplink audio bytes not sent thanks to silence suppression",
+    function=lambda: silence_totals.bytes_saved,
+)
+
+
+def _avg_ms(total_seconds: float, count: int) -> float:
+    return total_seconds / count * 1000 if count else 0.0
+
+
+class SilenceSuppressor:
+    """
+    Filters one session's uplink audio
+
+    Frames quieter than `rms_threshold` are still forwarded for the first
+    `hangover_ms` of a silent stretch (trailing word edges). Beyond that they
+    are suppressed, but the most recent `hangover_ms` of them are kept and
+    sent ahead of the next loud frame so word onsets are preserved too.
+    """
+
+    def __init__(
+        self,
+        rms_threshold: float,
+        hangover_ms: float,
+        mode: SuppressionMode | str = SuppressionMode.DROP,
+        marker_ms: float = 20.0,
+        sample_rate: int = 16000,
+    ) -> None:
+        bytes_per_ms = sample_rate * SAMPLE_WIDTH_BYTES / 1000
+        self.rms_threshold = rms_threshold
+        self.mode = SuppressionMode(mode)
+        self.hangover_bytes = int(hangover_ms * bytes_per_ms)
+        marker_samples = int(marker_ms * sample_rate / 1000)
+        self._marker = bytes(marker_samples * SAMPLE_WIDTH_BYTES)
+
+        self._silent_bytes: int = 0  # Length of the current silent stretch
+        self._suppressing: bool = False
+        self._lookback: deque[bytes | memoryview] = deque()
+        self._lookback_bytes: int = 0
+
+        # Time-to-first-response for the turn that just ended
+        self._turn_suppressed: bool = False
+        self._pending_since: float | None = None
+        self._pending_suppressed: bool = False
+
+        # Per-session counters
+        self.bytes_in: int = 0
+        self.bytes_saved: int = 0
+        self.markers: int = 0
+
+    def process(self, frame: bytes | memoryview) -> list[bytes | memoryview]:
+        """Returns the chunks to forward for `frame` (possibly none)"""
+        self.bytes_in += len(frame)
+        silence_totals.bytes_in += len(frame)
+
+        if pcm16_rms(frame) >= self.rms_threshold:
+            self._silent_bytes = 0
+            if not self._suppressing:
+                return [frame]
+            self._suppressing = False
+            chunks = [*self._lookback, frame]
+            self._save(-self._lookback_bytes)
+            self._clear_lookback()
+            return chunks
+
+        self._silent_bytes += len(frame)
+        if self._silent_bytes <= self.hangover_bytes:
+            return [frame]
+
+        # Sustained silence: keep only the tail as onset pre-roll
+        self._lookback.append(frame)
+        self._lookback_bytes += len(frame)
+        self._save(len(frame))
+        while self._lookback_bytes > self.hangover_bytes:
+            self._lookback_bytes -= len(self._lookback.popleft())
+
+        if self._suppressing:
+            return []
+        self._suppressing = True
+        self._turn_suppressed = True
+        if self.mode is SuppressionMode.MARKER and self._marker:
+            self.markers += 1
+            silence_totals.markers += 1
+            self._save(-len(self._marker))
+            return [self._marker]
+        return []
+
+    def reset(self) -> None:
+        """Forgets the current silent stretch (activity boundaries)"""
+        self._silent_bytes = 0
+        self._suppressing = False
+        self._clear_lookback()
+
+    def record_activity_end(self) -> None:
+        """Starts timing the response to the turn that just ended"""
+        self._pending_since = time.monotonic()
+        self._pending_suppressed = self._turn_suppressed
+        self._turn_suppressed = False
+        self.reset()
+
+    def record_first_response(self) -> None:
+        """Closes the pending time-to-first-response measurement, if any"""
+        if self._pending_since is None:
+            return
+        latency = time.monotonic() - self._pending_since
+        self._pending_since = None
+        if self._pending_suppressed:
+            silence_totals.suppressed_turn_count += 1
+            silence_totals.suppressed_turn_ttfr_seconds_total += latency
+        else:
+            silence_totals.plain_turn_count += 1
+            silence_totals.plain_turn_ttfr_seconds_total += latency
+
+    def stats(self) -> dict[str, Any]:
+        """Returns bytes seen and saved for this session"""
+        return {
+            "bytes_in": self.bytes_in,
+            "bytes_saved": self.bytes_saved,
+            "saved_ratio": self.bytes_saved / self.bytes_in if self.bytes_in else 0.0,
+            "markers": self.markers,
+        }
+
+    def _save(self, count: int) -> None:
+        self.bytes_saved += count
+        silence_totals.bytes_saved += count
+
+    def _clear_lookback(self) -> None:
+        self._lookback.clear()
+        self._lookback_bytes = 0
@@ -0,0 +1,107 @@
+"""
+Speculative activity start for client VAD signals
+Holds a client activity_start and its audio until enough speech confirms it, so false starts never reach Gemini
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from app.services.audio_utils import SAMPLE_WIDTH_BYTES
+from app.services.metrics import registry
+
+
+@dataclass
+class SpeculationTotals:
+    """Process-wide counters of held, confirmed and cancelled activities"""
+
+    activities: int = 0
+    confirmed: int = 0
+    cancelled: int = 0  # Discarded before anything reached Gemini
+    cancelled_late: int = 0  # Cancelled after confirmation: closed with activity_end
+    bytes_saved: int = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "activities": self.activities,
+            "confirmed": self.confirmed,
+            "cancelled": self.cancelled,
+            "cancelled_late": self.cancelled_late,
+            "turns_saved": self.cancelled,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+speculation_totals = SpeculationTotals()
+
+registry.counter(
+    "gemini_live_speculative_turns_saved_total",
+    "Client activities cancelled before reaching Gemini",
+    function=lambda: speculation_totals.cancelled,
+)
+registry.counter(
+    "gemini_live_speculative_bytes_saved_total",
+    "Uplink audio bytes discarded with cancelled activities",
+    function=lambda: speculation_totals.bytes_saved,
+)
+
+
+class SpeculativeActivity:
+    """
+    One session's pending activity_start
+
+    The audio itself stays in the session's PCM history; this tracks the
+    history offset where the pending activity began and decides when
+    `hold_ms` of audio has arrived since. The service then sends
+    activity_start followed by the held audio, or drops both on cancel.
+    """
+
+    def __init__(self, hold_ms: float, sample_rate: int = 16000) -> None:
+        self.hold_bytes = int(hold_ms * sample_rate / 1000) * SAMPLE_WIDTH_BYTES
+        self.pending_from: int | None = None  # History offset of activity_start
+
+        # Per-session counters
+        self.confirmed: int = 0
+        self.cancelled: int = 0
+        self.bytes_saved: int = 0
+
+    @property
+    def pending(self) -> bool:
+        return self.pending_from is not None
+
+    def start(self, offset: int) -> None:
+        self.pending_from = offset
+        speculation_totals.activities += 1
+
+    def ready(self, end: int) -> bool:
+        """Whether audio up to history offset `end` confirms the pending activity"""
+        return (
+            self.pending_from is not None and end - self.pending_from >= self.hold_bytes
+        )
+
+    def confirm(self) -> int:
+        """Ends the hold; returns the offset the held audio starts at"""
+        assert self.pending_from is not None
+        offset, self.pending_from = self.pending_from, None
+        self.confirmed += 1
+        speculation_totals.confirmed += 1
+        return offset
+
+    def cancel(self, discarded_bytes: int) -> None:
+        """Drops the pending activity and the audio it held"""
+        self.pending_from = None
+        self.cancelled += 1
+        self.bytes_saved += discarded_bytes
+        speculation_totals.cancelled += 1
+        speculation_totals.bytes_saved += discarded_bytes
+
+    def cancel_late(self) -> None:
+        """Counts a cancel that arrived after the activity was confirmed"""
+        speculation_totals.cancelled_late += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Returns confirmed and cancelled activities for this session"""
+        return {
+            "confirmed": self.confirmed,
+            "cancelled": self.cancelled,
+            "bytes_saved": self.bytes_saved,
+        }
@@ -0,0 +1,101 @@
+"""
+Preallocated serialization of uplink audio messages
+Writes realtime_input audio JSON straight from PCM buffers, bypassing per-frame SDK models
+"""
+
+import binascii
+import inspect
+from typing import Any
+
+from google.genai import live, version
+from websockets.asyncio.connection import Connection
+
+# Bytes-like payloads can only go out as text frames with websockets' `text=`
+TEXT_FRAMES_FROM_BYTES = "text" in inspect.signature(Connection.send).parameters
+
+# google-genai releases (major.minor) whose Gemini API realtime_input audio
+# message the encoder is checked against in tests; others go through the SDK.
+# Keep the release locked in uv.lock listed here.
+TESTED_SDK_VERSIONS = ("2.30",)
+SDK_VERSION_TESTED = ".".join(version.__version__.split(".")[:2]) in TESTED_SDK_VERSIONS
+
+
+def audio_mime_type(sample_rate: int) -> str:
+    return f"audio/pcm;rate={sample_rate}"
+
+
+class RealtimeAudioEncoder:
+    """
+    Serializes `{"realtime_input": {"audio": ...}}` messages into one buffer
+
+    The message is what `AsyncSession.send_realtime_input(audio=...)` sends,
+    except that the data uses the standard base64 alphabet, which the API
+    accepts as well. The prefix and the mime-type suffix are written once;
+    per frame only the base64 text is produced and copied in place. The
+    returned view is only valid until the next `encode` call.
+    """
+
+    PREFIX = b'{"realtime_input":{"audio":{"data":"'
+
+    def __init__(self, mime_type: str, initial_pcm_bytes: int = 4096) -> None:
+        self.mime_type = mime_type
+        self._suffix = f'","mime_type":"{mime_type}"}}}}}}'.encode()
+        self._buffer = bytearray()
+        self._reserve(initial_pcm_bytes)
+
+    def encode(self, pcm: bytes | bytearray | memoryview) -> memoryview:
+        encoded = binascii.b2a_base64(pcm, newline=False)
+        start = len(self.PREFIX)
+        end = start + len(encoded)
+        total = end + len(self._suffix)
+        if total > len(self._buffer):
+            self._reserve(len(pcm))
+        self._buffer[start:end] = encoded
+        self._buffer[end:total] = self._suffix
+        return memoryview(self._buffer)[:total]
+
+    def _reserve(self, pcm_bytes: int) -> None:
+        # A new buffer rather than a resize: views of the old one may be alive
+        size = len(self.PREFIX) + (pcm_bytes + 2) // 3 * 4 + len(self._suffix)
+        self._buffer = bytearray(max(size, 2 * len(self._buffer)))
+        self._buffer[: len(self.PREFIX)] = self.PREFIX
+
+
+class AudioSender:
+    """
+    Sends PCM chunks on a Live session, through the encoder when possible
+
+    Gemini API sessions of a tested SDK release get the preallocated encoder
+    and their (private) socket directly. Anything else goes through
+    `send_realtime_input` with a mime type built once: Vertex AI sessions,
+    whose messages the SDK converts differently, untested SDK releases,
+    pooled wrappers and test doubles.
+    """
+
+    def __init__(self, session: Any, sample_rate: int) -> None:
+        self.session = session
+        self.mime_type = audio_mime_type(sample_rate)
+        self._socket: Connection | None = None
+        self._encoder: RealtimeAudioEncoder | None = None
+        if (
+            TEXT_FRAMES_FROM_BYTES
+            and SDK_VERSION_TESTED
+            and isinstance(session, live.AsyncSession)
+            and not session._api_client.vertexai
+        ):
+            self._socket = session._ws
+            self._encoder = RealtimeAudioEncoder(self.mime_type)
+
+    async def send(self, pcm: bytes | bytearray | memoryview) -> None:
+        if self._encoder is not None and self._socket is not None:
+            message = self._encoder.encode(pcm)
+            try:
+                await self._socket.send(message, text=True)
+            finally:
+                message.release()
+            return
+        if not isinstance(pcm, bytes):
+            pcm = bytes(pcm)  # SDK models validate bytes only
+        await self.session.send_realtime_input(
+            audio={"data": pcm, "mime_type": self.mime_type}
+        )
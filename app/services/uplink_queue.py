@@ -0,0 +1,219 @@
+"""
+Bounded uplink queue between the browser WebSocket and Gemini
+Decouples browser reads from upstream writes with a configurable overflow policy
+"""
+
+import asyncio
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from app.services.audio_utils import pcm16_rms
+from app.services.metrics import registry
+
+
+class OverflowPolicy(StrEnum):
+    """What to do when a frame arrives and the queue is full"""
+
+    BLOCK = "block"  # Wait for the writer (backpressure on the browser socket)
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued audio frame
+    DROP_SILENCE = "drop_silence"  # Discard silent frames first, then the oldest
+
+
+class UplinkClosedError(Exception):
+    """Raised by get() once the queue is closed and drained"""
+
+
+@dataclass(slots=True, eq=False)
+class UplinkItem:
+    """One queued upstream operation"""
+
+    kind: str  # "audio", "text" or a control such as "activity_start"
+    payload: Any = None
+    silent: bool = False
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class UplinkTotals:
+    """Process-wide counters across every uplink queue"""
+
+    enqueued: int = 0
+    sent: int = 0
+    dropped: int = 0
+    dropped_silence: int = 0
+    send_latency_seconds_total: float = 0.0
+    send_latency_seconds_max: float = 0.0
+
+
+uplink_totals = UplinkTotals()
+_active_queues: "weakref.WeakSet[UplinkQueue]" = weakref.WeakSet()
+
+registry.gauge(
+    "gemini_live_uplink_queue_depth",
+    "Items waiting to be sent to Gemini",
+    function=lambda: sum(queue.depth for queue in list(_active_queues)),
+)
+registry.counter(
+    "gemini_live_uplink_dropped_total",
+    "Uplink items dropped by the overflow policy",
+    function=lambda: uplink_totals.dropped,
+)
+
+
+class UplinkQueue:
+    """Per-session FIFO of audio and control messages waiting to go upstream"""
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: OverflowPolicy | str = OverflowPolicy.BLOCK,
+        silence_rms_threshold: float = 0.0,
+    ) -> None:
+        self.maxsize = max(1, maxsize)
+        self.policy = OverflowPolicy(policy)
+        self.silence_rms_threshold = silence_rms_threshold
+        self._items: deque[UplinkItem] = deque()
+        self._changed = asyncio.Condition()
+        self._closed = False
+
+        # Per-session counters
+        self.enqueued: int = 0
+        self.sent: int = 0
+        self.dropped: int = 0
+        self.dropped_silence: int = 0
+        self.max_depth: int = 0
+        self._latency_total: float = 0.0
+        self._latency_max: float = 0.0
+
+        _active_queues.add(self)
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    async def put_audio(self, data: bytes) -> None:
+        """Queues an audio frame, applying the overflow policy when full"""
+        silent = (
+            self.policy is OverflowPolicy.DROP_SILENCE
+            and pcm16_rms(data) < self.silence_rms_threshold
+        )
+        await self._put(UplinkItem("audio", data, silent=silent))
+
+    async def put_control(self, kind: str, payload: Any = None) -> None:
+        """Queues a control message (never dropped, keeps ordering with audio)"""
+        await self._put(UplinkItem(kind, payload))
+
+    async def get(self) -> UplinkItem:
+        """
+        Waits for the next item
+
+        Raises:
+            UplinkClosedError: When the queue was closed and is empty
+        """
+        async with self._changed:
+            while not self._items:
+                if self._closed:
+                    raise UplinkClosedError()
+                await self._changed.wait()
+            item = self._items.popleft()
+            self._changed.notify_all()
+            return item
+
+    def record_sent(self, item: UplinkItem) -> None:
+        """Records enqueue-to-send latency once the writer forwarded an item"""
+        latency = time.perf_counter() - item.enqueued_at
+        self.sent += 1
+        self._latency_total += latency
+        self._latency_max = max(self._latency_max, latency)
+        uplink_totals.sent += 1
+        uplink_totals.send_latency_seconds_total += latency
+        uplink_totals.send_latency_seconds_max = max(
+            uplink_totals.send_latency_seconds_max, latency
+        )
+
+    async def close(self) -> None:
+        """Stops accepting items; the writer drains what is left"""
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns queue depth, drop and latency counters for this session"""
+        return {
+            "policy": self.policy.value,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "dropped_silence": self.dropped_silence,
+            "send_latency_ms_avg": (
+                self._latency_total / self.sent * 1000 if self.sent else 0.0
+            ),
+            "send_latency_ms_max": self._latency_max * 1000,
+        }
+
+    async def _put(self, item: UplinkItem) -> None:
+        async with self._changed:
+            while len(self._items) >= self.maxsize:
+                if self.policy is not OverflowPolicy.BLOCK:
+                    victim = self._pick_victim(item)
+                    if victim is item:
+                        self._count_drop(silent=item.silent)
+                        return
+                    if victim is not None:
+                        self._items.remove(victim)
+                        self._count_drop(silent=victim.silent)
+                        continue
+                await self._changed.wait()
+
+            self._items.append(item)
+            self.enqueued += 1
+            uplink_totals.enqueued += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._changed.notify_all()
+
+    def _pick_victim(self, incoming: UplinkItem) -> UplinkItem | None:
+        """Chooses the audio frame to drop (None if only control messages remain)"""
+        if self.policy is OverflowPolicy.DROP_SILENCE:
+            for queued in self._items:
+                if queued.kind == "audio" and queued.silent:
+                    return queued
+            if incoming.kind == "audio" and incoming.silent:
+                # Nothing silent is queued: discard the incoming silence instead
+                return incoming
+
+        for queued in self._items:
+            if queued.kind == "audio":
+                return queued
+        return None
+
+    def _count_drop(self, silent: bool) -> None:
+        self.dropped += 1
+        uplink_totals.dropped += 1
+        if silent:
+            self.dropped_silence += 1
+            uplink_totals.dropped_silence += 1
+
+
+def aggregate_stats() -> dict[str, Any]:
+    """Process-wide uplink statistics for /stats"""
+    queues = list(_active_queues)
+    sent = uplink_totals.sent
+    return {
+        "active_queues": len(queues),
+        "depth": sum(queue.depth for queue in queues),
+        "max_depth": max((queue.depth for queue in queues), default=0),
+        "enqueued": uplink_totals.enqueued,
+        "sent": sent,
+        "dropped": uplink_totals.dropped,
+        "dropped_silence": uplink_totals.dropped_silence,
+        "send_latency_ms_avg": (
+            uplink_totals.send_latency_seconds_total / sent * 1000 if sent else 0.0
+        ),
+        "send_latency_ms_max": uplink_totals.send_latency_seconds_max * 1000,
+    }
@@ -0,0 +1,429 @@
+"""
+Server-side voice activity detection
+Turns raw 16 kHz PCM into activity start/end events for clients without their own VAD
+"""
+
+import asyncio
+import logging
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from enum import StrEnum
+from typing import Any, Protocol
+
+import numpy as np
+
+from app.config import settings
+from app.exceptions import ConfigurationError
+from app.services.audio_utils import SAMPLE_WIDTH_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Silero v5 (and the browser VAD) evaluate 512-sample frames at 16 kHz
+VAD_FRAME_SAMPLES = 512
+VAD_FRAME_BYTES = VAD_FRAME_SAMPLES * SAMPLE_WIDTH_BYTES
+
+# Shared pool for blocking model inference (ONNX Silero), created on first use
+_inference_executor: ThreadPoolExecutor | None = None
+
+
+def inference_executor() -> ThreadPoolExecutor:
+    """Returns the inference thread pool, so importing the module starts no threads"""
+    global _inference_executor
+    if _inference_executor is None:
+        _inference_executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="vad"
+        )
+    return _inference_executor
+
+
+class VADEvent(StrEnum):
+    """Transitions emitted by VoiceActivityDetector"""
+
+    START = "start"  # First speech frame (mirrors onSpeechStart)
+    END = "end"  # Speech ended after at least min_speech_ms
+    MISFIRE = "misfire"  # Speech ended before min_speech_ms (mirrors onVADMisfire)
+
+
+class VADBackend(Protocol):
+    """Scores frames of VAD_FRAME_SAMPLES int16 samples with a speech probability"""
+
+    #: True when scoring blocks (runs in the inference thread pool)
+    blocking: bool
+
+    def probabilities(self, frames: np.ndarray, states: list[Any]) -> np.ndarray:
+        """
+        Scores a (n, VAD_FRAME_SAMPLES) int16 array, one row per frame
+
+        Args:
+            frames: Frames to score (rows may belong to different sessions)
+            states: Per-row backend state objects, updated in place
+        """
+        ...
+
+    def new_state(self) -> Any:
+        """Returns fresh per-session state"""
+        ...
+
+
+class EnergyVAD:
+    """Vectorized energy + zero-crossing-rate detector (no model required)"""
+
+    blocking = False
+
+    def __init__(self, energy_threshold: float, max_zero_crossing_rate: float) -> None:
+        self.energy_threshold = max(energy_threshold, 1.0)
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+
+    def new_state(self) -> None:
+        return None
+
+    def probabilities(
+        self,
+        frames: np.ndarray,
+        states: list[Any],  # noqa: ARG002 - stateless
+    ) -> np.ndarray:
+        samples = frames.astype(np.float32)
+        rms = np.sqrt(np.einsum("ij,ij->i", samples, samples) / samples.shape[1])
+        signs = np.signbit(samples)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (
+            samples.shape[1] - 1
+        )
+
+        # Logistic on the level relative to the threshold (in dB): 0.5 at threshold
+        level_db = 20 * np.log10(np.maximum(rms, 1e-3) / self.energy_threshold)
+        probability = 1 / (1 + np.exp(-level_db / 3))
+        # Hiss/fricative noise has a very high ZCR and little voiced energy
+        scores: np.ndarray = np.where(
+            zcr > self.max_zero_crossing_rate, probability * 0.5, probability
+        )
+        return scores
+
+
+class SileroVAD:
+    """Silero v5 ONNX model; inference runs in a thread pool"""
+
+    blocking = True
+
+    def __init__(self, model_path: str, session: Any | None = None) -> None:
+        if session is None:
+            try:
+                import onnxruntime  # type: ignore[import-not-found]
+            except ImportError as e:
+                raise ConfigurationError(
+                    "VAD_BACKEND=silero requires onnxruntime (pip install '.[vad]')"
+                ) from e
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = 1
+            session = onnxruntime.InferenceSession(
+                model_path, sess_options=options, providers=["CPUExecutionProvider"]
+            )
+        self._session = session
+        self._sample_rate = np.array(16000, dtype=np.int64)
+
+    def new_state(self) -> np.ndarray:
+        return np.zeros((2, 1, 128), dtype=np.float32)
+
+    def probabilities(self, frames: np.ndarray, states: list[Any]) -> np.ndarray:
+        batch = frames.astype(np.float32) / 32768.0
+        state = np.concatenate(states, axis=1)
+        output, new_state = self._session.run(
+            None, {"input": batch, "state": state, "sr": self._sample_rate}
+        )
+        for index in range(len(states)):
+            states[index][...] = new_state[:, index : index + 1, :]
+        return np.asarray(output, dtype=np.float32).reshape(-1)
+
+
+class VoiceActivityDetector:
+    """
+    Per-session speech state machine on top of a VADBackend
+
+    Uses the same hysteresis as the browser's MicVAD: speech starts above
+    `positive_threshold`, ends after `redemption_ms` below `negative_threshold`,
+    and speech shorter than `min_speech_ms` is reported as a misfire.
+    """
+
+    def __init__(
+        self,
+        backend: VADBackend,
+        positive_threshold: float = 0.5,
+        negative_threshold: float = 0.35,
+        min_speech_ms: float = 200.0,
+        redemption_ms: float = 600.0,
+        sample_rate: int = 16000,
+    ) -> None:
+        frame_ms = VAD_FRAME_SAMPLES / sample_rate * 1000
+        self.backend = backend
+        self.positive_threshold = positive_threshold
+        self.negative_threshold = negative_threshold
+        self.min_speech_frames = max(1, round(min_speech_ms / frame_ms))
+        self.redemption_frames = max(1, round(redemption_ms / frame_ms))
+
+        self.state = backend.new_state()
+        self._carry = bytearray()
+        self.speaking: bool = False
+        self._speech_frames: int = 0
+        self._silent_frames: int = 0
+
+        # Statistics
+        self.frames: int = 0
+        self.speech_segments: int = 0
+        self.misfires: int = 0
+
+    def take_frames(self, data: bytes | memoryview) -> np.ndarray:
+        """Splits input (any length) into whole VAD frames, keeping the remainder"""
+        self._carry += data
+        count = len(self._carry) // VAD_FRAME_BYTES
+        if count == 0:
+            return np.empty((0, VAD_FRAME_SAMPLES), dtype=np.int16)
+        usable = count * VAD_FRAME_BYTES
+        frames = np.frombuffer(bytes(self._carry[:usable]), dtype=np.int16)
+        del self._carry[:usable]
+        return frames.reshape(count, VAD_FRAME_SAMPLES)
+
+    async def process(self, data: bytes | memoryview) -> list[VADEvent]:
+        """Scores the complete frames in `data` and returns the resulting events"""
+        frames = self.take_frames(data)
+        if len(frames) == 0:
+            return []
+        states = [self.state] * len(frames)
+        if self.backend.blocking:
+            loop = asyncio.get_running_loop()
+            probabilities = await loop.run_in_executor(
+                inference_executor(), self._score_sequential, frames
+            )
+        else:
+            probabilities = self.backend.probabilities(frames, states)
+        return self.advance(probabilities)
+
+    def _score_sequential(self, frames: np.ndarray) -> np.ndarray:
+        # Stateful models must see one session's frames in order
+        return np.concatenate(
+            [
+                self.backend.probabilities(frames[index : index + 1], [self.state])
+                for index in range(len(frames))
+            ]
+        )
+
+    def advance(self, probabilities: Sequence[float] | np.ndarray) -> list[VADEvent]:
+        """Feeds frame probabilities through the hysteresis state machine"""
+        events: list[VADEvent] = []
+        for probability in probabilities:
+            self.frames += 1
+            if not self.speaking:
+                if probability >= self.positive_threshold:
+                    self.speaking = True
+                    self._speech_frames = 1
+                    self._silent_frames = 0
+                    events.append(VADEvent.START)
+                continue
+
+            self._speech_frames += 1
+            if probability >= self.negative_threshold:
+                self._silent_frames = 0
+                continue
+
+            self._silent_frames += 1
+            if self._silent_frames >= self.redemption_frames:
+                self.speaking = False
+                voiced = self._speech_frames - self._silent_frames
+                if voiced >= self.min_speech_frames:
+                    self.speech_segments += 1
+                    events.append(VADEvent.END)
+                else:
+                    self.misfires += 1
+                    events.append(VADEvent.MISFIRE)
+        return events
+
+    @property
+    def confirmed(self) -> bool:
+        """Whether the current speech has lasted min_speech_ms (cannot misfire)"""
+        return (
+            self.speaking
+            and self._speech_frames - self._silent_frames >= self.min_speech_frames
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "speaking": self.speaking,
+            "speech_segments": self.speech_segments,
+            "misfires": self.misfires,
+        }
+
+
+def detect_batch(
+    detectors: Sequence[VoiceActivityDetector], frames: np.ndarray
+) -> list[list[VADEvent]]:
+    """
+    Evaluates one frame per session in a single vectorized backend call
+
+    Args:
+        detectors: Detectors sharing the same backend, one per row of `frames`
+        frames: (len(detectors), VAD_FRAME_SAMPLES) int16 array
+    """
+    if not detectors:
+        return []
+    backend = detectors[0].backend
+    probabilities = backend.probabilities(
+        frames, [detector.state for detector in detectors]
+    )
+    return [
+        detector.advance(probabilities[index : index + 1])
+        for index, detector in enumerate(detectors)
+    ]
+
+
+_PendingFrame = tuple[
+    VoiceActivityDetector, np.ndarray, "asyncio.Future[list[VADEvent]]"
+]
+
+
+class VADBatcher:
+    """
+    Collects frames from many sessions and scores them together
+
+    Sessions await `process()`; pending frames are evaluated in one
+    `detect_batch` call once `max_batch` frames are waiting or `window_ms`
+    has elapsed since the first one.
+    """
+
+    def __init__(self, window_ms: float, max_batch: int = 256) -> None:
+        self.window_seconds = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: list[_PendingFrame] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+        # Statistics
+        self.batches: int = 0
+        self.frames: int = 0
+
+    async def process(
+        self, detector: VoiceActivityDetector, data: bytes | memoryview
+    ) -> list[VADEvent]:
+        """Queues a session's complete frames and waits for their events"""
+        frames = detector.take_frames(data)
+        events: list[VADEvent] = []
+        for frame in frames:
+            future: asyncio.Future[list[VADEvent]] = (
+                asyncio.get_running_loop().create_future()
+            )
+            self._pending.append((detector, frame, future))
+            if len(self._pending) >= self.max_batch:
+                self.flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    self.window_seconds, self.flush
+                )
+            events.extend(await future)
+        return events
+
+    def flush(self) -> None:
+        """Scores every pending frame now"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        # One vectorized call per backend (sessions normally share one)
+        groups: dict[int, list[_PendingFrame]] = {}
+        for entry in pending:
+            groups.setdefault(id(entry[0].backend), []).append(entry)
+        for group in groups.values():
+            self._score(group)
+
+        self.batches += 1
+        self.frames += len(pending)
+
+    def _score(self, group: list["_PendingFrame"]) -> None:
+        detectors = [detector for detector, _frame, _future in group]
+        frames = np.stack([frame for _detector, frame, _future in group])
+        states = [detector.state for detector in detectors]
+        backend = detectors[0].backend
+
+        if not backend.blocking:
+            try:
+                probabilities = backend.probabilities(frames, states)
+            except Exception as e:
+                _fail(group, e)
+                return
+            _resolve(group, probabilities)
+            return
+
+        # Each session waits for its frame before queuing the next one, so
+        # per-session model state is never used by two batches at once
+        future = asyncio.get_running_loop().run_in_executor(
+            inference_executor(), backend.probabilities, frames, states
+        )
+
+        def on_done(done: asyncio.Future[np.ndarray]) -> None:
+            if done.exception() is not None:
+                _fail(group, done.exception())  # type: ignore[arg-type]
+            else:
+                _resolve(group, done.result())
+
+        future.add_done_callback(on_done)
+
+
+def _resolve(group: list[_PendingFrame], probabilities: np.ndarray) -> None:
+    for index, (detector, _frame, future) in enumerate(group):
+        if not future.done():
+            future.set_result(detector.advance(probabilities[index : index + 1]))
+
+
+def _fail(group: list[_PendingFrame], error: BaseException) -> None:
+    for _detector, _frame, future in group:
+        if not future.done():
+            future.set_exception(error)
+
+
+def create_backend(
+    name: str,
+    energy_threshold: float,
+    max_zero_crossing_rate: float,
+    silero_model_path: str,
+) -> VADBackend:
+    """Builds the configured VAD backend"""
+    if name == "energy":
+        return EnergyVAD(energy_threshold, max_zero_crossing_rate)
+    if name == "silero":
+        return SileroVAD(silero_model_path)
+    raise ConfigurationError(f"Unknown VAD backend: {name}")
+
+
+# Process-wide backend and batcher, built on first use from settings
+_shared_backend: VADBackend | None = None
+_shared_batcher: VADBatcher | None = None
+
+
+def create_detector() -> VoiceActivityDetector:
+    """Builds a per-session detector on the shared configured backend"""
+    global _shared_backend
+    if _shared_backend is None:
+        _shared_backend = create_backend(
+            settings.vad_backend,
+            energy_threshold=settings.vad_energy_threshold,
+            max_zero_crossing_rate=settings.vad_max_zero_crossing_rate,
+            silero_model_path=settings.vad_silero_model_path,
+        )
+        logger.info(f"Server-side VAD backend: {settings.vad_backend}")
+    return VoiceActivityDetector(
+        _shared_backend,
+        positive_threshold=settings.vad_positive_threshold,
+        negative_threshold=settings.vad_negative_threshold,
+        min_speech_ms=settings.vad_min_speech_ms,
+        redemption_ms=settings.vad_redemption_ms,
+        sample_rate=settings.audio_sample_rate,
+    )
+
+
+def shared_batcher() -> VADBatcher | None:
+    """Returns the cross-session batcher, or None when VAD_BATCH_WINDOW_MS is 0"""
+    global _shared_batcher
+    if settings.vad_batch_window_ms <= 0:
+        return None
+    if _shared_batcher is None:
+        _shared_batcher = VADBatcher(settings.vad_batch_window_ms)
+    return _shared_batcher
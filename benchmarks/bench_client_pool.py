@@ -0,0 +1,72 @@
+"""
+Benchmark: per-session memory and setup time with and without the client pool
+Run with: python -m benchmarks.bench_client_pool [--sessions N]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+from typing import Any
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-api-key")
+
+from app.services.client_pool import client_pool  # noqa: E402
+from app.services.gemini_live import GeminiLiveService  # noqa: E402
+
+
+class _NoopLiveConnect:
+    """Stand-in for client.aio.live.connect() that skips the network handshake"""
+
+    async def __aenter__(self) -> "_NoopLiveConnect":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
+
+
+async def _open_sessions(count: int, pooled: bool) -> dict[str, float]:
+    """Creates and connects `count` services, returning memory/time per session"""
+    client_pool.clear()
+    services: list[GeminiLiveService] = []
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(count):
+        if not pooled:
+            # Previous behaviour: one brand-new genai.Client per connection
+            client_pool.clear()
+        service = GeminiLiveService()
+        service.client.aio.live.connect = lambda **_: _NoopLiveConnect()
+        await service.connect()
+        services.append(service)
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for service in services:
+        await service.disconnect()
+
+    return {
+        "setup_ms_per_session": elapsed / count * 1000,
+        "kib_per_session": current / count / 1024,
+    }
+
+
+async def main(sessions: int) -> None:
+    before = await _open_sessions(sessions, pooled=False)
+    after = await _open_sessions(sessions, pooled=True)
+    client_pool.clear()
+
+    print(f"Sessions: {sessions}")
+    print(f"{'':<22}{'per-client':>14}{'pooled':>14}")
+    for metric in ("setup_ms_per_session", "kib_per_session"):
+        print(f"{metric:<22}{before[metric]:>14.3f}{after[metric]:>14.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions))
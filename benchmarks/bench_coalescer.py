@@ -0,0 +1,80 @@
+"""
+Benchmark: upstream message rate and CPU per session with and without coalescing
+Run with: python -m benchmarks.bench_coalescer [--seconds N] [--frames K]
+
+Audio goes through the real SDK serialization (AsyncSession.send_realtime_input)
+into a websocket stand-in that only counts messages.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-api-key")
+
+from google import genai  # noqa: E402
+from google.genai.live import AsyncSession  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services.gemini_live import GeminiLiveService  # noqa: E402
+
+FRAME_SAMPLES = 512  # One browser VAD frame
+FRAME_BYTES = FRAME_SAMPLES * 2
+
+
+class CountingWebSocket:
+    """Websocket stand-in that counts outgoing messages"""
+
+    def __init__(self) -> None:
+        self.messages = 0
+        self.bytes = 0
+
+    async def send(self, message: Any) -> None:
+        self.messages += 1
+        self.bytes += len(message)
+
+
+async def _stream(seconds: float, coalesce: bool, frames: int) -> dict[str, float]:
+    settings.audio_coalesce_enabled = coalesce
+    settings.audio_coalesce_frames = frames
+
+    service = GeminiLiveService()
+    websocket = CountingWebSocket()
+    client = genai.Client(api_key=settings.gemini_api_key)
+    service.session = AsyncSession(api_client=client._api_client, websocket=websocket)
+
+    frame = os.urandom(FRAME_BYTES)
+    total_frames = int(seconds * settings.audio_sample_rate / FRAME_SAMPLES)
+
+    cpu_start = time.process_time()
+    for _ in range(total_frames):
+        await service.send_audio(frame)
+    await service._flush_coalesced_audio()
+    cpu = time.process_time() - cpu_start
+
+    await service.disconnect()
+    return {
+        "messages_per_sec": websocket.messages / seconds,
+        "upstream_kib_per_sec": websocket.bytes / seconds / 1024,
+        "cpu_ms_per_audio_sec": cpu / seconds * 1000,
+    }
+
+
+async def main(seconds: float, frames: int) -> None:
+    before = await _stream(seconds, coalesce=False, frames=frames)
+    after = await _stream(seconds, coalesce=True, frames=frames)
+
+    print(f"Audio streamed: {seconds:.0f}s per session, coalescing {frames} frames")
+    print(f"{'':<24}{'per-frame':>12}{'coalesced':>12}")
+    for metric in before:
+        print(f"{metric:<24}{before[metric]:>12.2f}{after[metric]:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--frames", type=int, default=settings.audio_coalesce_frames)
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.frames))
@@ -0,0 +1,141 @@
+"""
+Benchmark: server message parsing throughput (messages/sec)
+Run with: python -m benchmarks.bench_parser [--turns N]
+
+Replays a conversation-shaped stream of real LiveServerMessage objects through
+the previous hasattr/dict extraction and through LiveMessageParser.
+"""
+
+import argparse
+import logging
+import os
+import time
+from typing import Any
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-api-key")
+
+from google.genai import types  # noqa: E402
+
+from app.services.live_events import LiveMessageParser  # noqa: E402
+
+AUDIO_CHUNK = bytes(9600)  # 200ms of 24 kHz PCM
+
+
+def recorded_turn() -> list[types.LiveServerMessage]:
+    """Message mix of one spoken turn as received from the Live API"""
+    messages = [
+        types.LiveServerMessage(
+            server_content=types.LiveServerContent(
+                input_transcription=types.Transcription(text=word)
+            )
+        )
+        for word in ["Hola, ", "¿cómo ", "estás?"]
+    ]
+    for index in range(40):
+        parts = [types.Part(inline_data=types.Blob(data=AUDIO_CHUNK))]
+        if index % 4 == 0:
+            parts.append(types.Part(inline_data=types.Blob(data=AUDIO_CHUNK)))
+        messages.append(
+            types.LiveServerMessage(
+                server_content=types.LiveServerContent(
+                    model_turn=types.Content(role="model", parts=parts)
+                )
+            )
+        )
+        if index % 5 == 0:
+            messages.append(
+                types.LiveServerMessage(
+                    server_content=types.LiveServerContent(
+                        output_transcription=types.Transcription(text="Muy bien ")
+                    )
+                )
+            )
+    messages.append(
+        types.LiveServerMessage(
+            server_content=types.LiveServerContent(turn_complete=True)
+        )
+    )
+    messages.append(
+        types.LiveServerMessage(
+            usage_metadata=types.UsageMetadata(total_token_count=1200)
+        )
+    )
+    return messages
+
+
+def legacy_parse(response: Any, state: dict[str, Any]) -> dict[str, Any] | None:
+    """The extraction previously inlined in GeminiLiveService.receive_responses"""
+    response_data: dict[str, Any] = {}
+    logging.getLogger("legacy").info(f"Response received: {type(response).__name__}")
+    if hasattr(response, "server_content") and response.server_content:
+        server_content = response.server_content
+        if (
+            hasattr(server_content, "input_transcription")
+            and server_content.input_transcription
+            and hasattr(server_content.input_transcription, "text")
+        ):
+            response_data["input_transcription"] = (
+                server_content.input_transcription.text
+            )
+        if (
+            hasattr(server_content, "output_transcription")
+            and server_content.output_transcription
+            and hasattr(server_content.output_transcription, "text")
+        ):
+            response_data["output_transcription"] = (
+                server_content.output_transcription.text
+            )
+        if hasattr(server_content, "model_turn") and server_content.model_turn:
+            if not state["speaking"]:
+                state["speaking"] = True
+                response_data["model_state"] = "speaking"
+            for part in getattr(server_content.model_turn, "parts", None) or []:
+                if hasattr(part, "text") and part.text:
+                    response_data["output_transcription"] = part.text
+                if hasattr(part, "inline_data") and part.inline_data:
+                    response_data["audio"] = part.inline_data.data
+        if hasattr(server_content, "turn_complete") and server_content.turn_complete:
+            response_data["turn_complete"] = True
+            state["speaking"] = False
+            response_data["model_state"] = "listening"
+        if hasattr(server_content, "interrupted") and server_content.interrupted:
+            response_data["interrupted"] = True
+            state["speaking"] = False
+            response_data["model_state"] = "listening"
+        if (
+            hasattr(server_content, "grounding_metadata")
+            and server_content.grounding_metadata
+        ):
+            response_data["model_state"] = "thinking"
+    return response_data or None
+
+
+def _rate(parse: Any, messages: list[types.LiveServerMessage]) -> float:
+    start = time.perf_counter()
+    for message in messages:
+        parse(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main(turns: int) -> None:
+    # Production log level: INFO records are formatted and emitted
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    logging.getLogger("app.services.live_events").setLevel(logging.WARNING)
+    messages = recorded_turn() * turns
+
+    state = {"speaking": False}
+    legacy = _rate(lambda message: legacy_parse(message, state), messages)
+    parser = LiveMessageParser()
+    typed = _rate(parser.parse, messages)
+
+    print(f"Messages: {len(messages)} ({turns} turns)")
+    print(f"{'parser':<28}{'messages/s':>14}")
+    print(f"{'hasattr + dict (previous)':<28}{legacy:>14,.0f}")
+    print(f"{'LiveMessageParser':<28}{typed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=500)
+    args = parser.parse_args()
+    main(args.turns)
@@ -0,0 +1,75 @@
+"""
+Benchmark: server-side VAD throughput in frames/sec on one core
+Run with: python -m benchmarks.bench_vad [--frames N] [--sessions S] [--backend B]
+
+Compares scoring one 512-sample frame per call with batched mode, where one
+vectorized call scores a frame from each of S concurrent sessions.
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-api-key")
+
+import numpy as np  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services.vad import (  # noqa: E402
+    VAD_FRAME_SAMPLES,
+    VoiceActivityDetector,
+    create_backend,
+    detect_batch,
+)
+
+FRAME_MS = VAD_FRAME_SAMPLES / 16000 * 1000
+
+
+def _frames(count: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(-3000, 3000, (count, VAD_FRAME_SAMPLES), dtype=np.int16)
+
+
+def _single(backend, frames: np.ndarray) -> float:
+    detector = VoiceActivityDetector(backend)
+    start = time.process_time()
+    for frame in frames:
+        detector.advance(backend.probabilities(frame[None, :], [detector.state]))
+    return len(frames) / (time.process_time() - start)
+
+
+def _batched(backend, frames: np.ndarray, sessions: int) -> float:
+    detectors = [VoiceActivityDetector(backend) for _ in range(sessions)]
+    rounds = len(frames) // sessions
+    start = time.process_time()
+    for index in range(rounds):
+        detect_batch(detectors, frames[index * sessions : (index + 1) * sessions])
+    return rounds * sessions / (time.process_time() - start)
+
+
+def main(count: int, sessions: int, backend_name: str) -> None:
+    backend = create_backend(
+        backend_name,
+        energy_threshold=settings.vad_energy_threshold,
+        max_zero_crossing_rate=settings.vad_max_zero_crossing_rate,
+        silero_model_path=settings.vad_silero_model_path,
+    )
+    frames = _frames(count)
+
+    single = _single(backend, frames)
+    batched = _batched(backend, frames, sessions)
+
+    print(f"Backend: {backend_name}, {count} frames of {FRAME_MS:.0f}ms")
+    print(f"{'mode':<28}{'frames/s/core':>16}{'realtime sessions':>20}")
+    for mode, rate in [("single frame", single), (f"batched x{sessions}", batched)]:
+        # Each live session produces 1000 / FRAME_MS frames per second
+        print(f"{mode:<28}{rate:>16,.0f}{rate * FRAME_MS / 1000:>20,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--backend", default=settings.vad_backend)
+    args = parser.parse_args()
+    main(args.frames, args.sessions, args.backend)
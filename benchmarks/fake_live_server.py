@@ -0,0 +1,370 @@
+"""
+Local stand-in for the Gemini Live API WebSocket endpoint
+Speaks enough of the BidiGenerateContent protocol to load-test the backend offline
+
+Run with: python -m benchmarks.fake_live_server [--port 9443] [--cert-dir certs]
+then start the backend with GEMINI_BASE_URL=https://localhost:9443 and
+GEMINI_CA_FILE=certs/localhost.pem. The self-signed certificate is generated
+into --cert-dir (a temporary directory by default) unless one is already there.
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import json
+import logging
+import random
+import shutil
+import ssl
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+logger = logging.getLogger(__name__)
+
+CERT_NAME = "localhost.pem"
+KEY_NAME = "localhost-key.pem"
+
+OUTPUT_SAMPLE_RATE = 24000
+OUTPUT_MIME_TYPE = f"audio/pcm;rate={OUTPUT_SAMPLE_RATE}"
+
+
+def ensure_self_signed_cert(directory: Path) -> tuple[Path, Path]:
+    """
+    Returns the localhost certificate and key in `directory`, creating them
+
+    The certificate is self-signed, valid for a day, and doubles as the CA
+    file the backend trusts (GEMINI_CA_FILE).
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    cert_file, key_file = directory / CERT_NAME, directory / KEY_NAME
+    if not (cert_file.exists() and key_file.exists()):
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes"]
+            + ["-keyout", str(key_file), "-out", str(cert_file), "-days", "1"]
+            + ["-subj", "/CN=localhost"]
+            + ["-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"],
+            check=True,
+            capture_output=True,
+        )
+    return cert_file, key_file
+
+
+@dataclass
+class FakeLiveConfig:
+    """Response timing, sizes and failure injection of the fake server"""
+
+    # Delay between activity_end (or a text turn) and the first response
+    turn_delay_ms: float = 300.0
+    # Response audio per turn, split into chunks of audio_chunk_ms
+    response_audio_ms: float = 2000.0
+    audio_chunk_ms: float = 40.0
+    # Pause between audio chunks; None paces them in real time, 0 sends a burst
+    chunk_interval_ms: float | None = None
+    input_transcript: str = "hola, ¿cómo estás?"
+    output_transcript: str = "muy bien, gracias por preguntar"
+    # Send goAway this long after setup (0 = never) and close after time_left
+    go_away_after_seconds: float = 0.0
+    go_away_time_left_seconds: float = 5.0
+    # Failure injection
+    setup_failure_rate: float = 0.0  # Close instead of setupComplete
+    drop_after_messages: int = 0  # Close abruptly after N server messages (0 = never)
+    seed: int | None = None
+
+
+@dataclass
+class FakeLiveStats:
+    """What the fake server observed, for assertions and load reports"""
+
+    sessions: int = 0
+    active_sessions: int = 0
+    setup_failures: int = 0
+    audio_messages: int = 0
+    audio_bytes: int = 0
+    activity_starts: int = 0
+    activity_ends: int = 0
+    text_turns: int = 0
+    turns_completed: int = 0
+    interruptions: int = 0
+    go_aways: int = 0
+    dropped_connections: int = 0
+    resumed_sessions: int = 0  # Setups carrying a session resumption handle
+    setups: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _field(message: dict[str, Any], snake: str, camel: str) -> Any:
+    # The SDK mixes snake_case and camelCase keys depending on the method
+    return message.get(snake, message.get(camel))
+
+
+class _FakeSession:
+    """One client connection: reads client messages and plays back turns"""
+
+    def __init__(self, server: "FakeLiveServer", websocket: ServerConnection) -> None:
+        self.server = server
+        self.config = server.config
+        self.stats = server.stats
+        self.websocket = websocket
+        self._sent: int = 0
+        self._turn: asyncio.Task[None] | None = None
+        self._resumption: bool = False  # Send handles, like the real API
+
+    async def run(self) -> None:
+        setup = json.loads(await self.websocket.recv()).get("setup", {})
+        self.stats.setups.append(setup)
+        if self.server.random.random() < self.config.setup_failure_rate:
+            self.stats.setup_failures += 1
+            await self.websocket.close(1011, "Injected setup failure")
+            return
+        await self._send({"setupComplete": {}})
+        resumption = _field(setup, "session_resumption", "sessionResumption")
+        if resumption is not None:
+            self._resumption = True
+            self.stats.resumed_sessions += "handle" in resumption
+            await self._send_resumption_update()
+
+        go_away = None
+        if self.config.go_away_after_seconds > 0:
+            go_away = asyncio.create_task(self._go_away())
+        try:
+            async for raw in self.websocket:
+                await self._handle(json.loads(raw))
+        finally:
+            for task in (self._turn, go_away):
+                if task:
+                    task.cancel()
+
+    async def _handle(self, message: dict[str, Any]) -> None:
+        realtime = _field(message, "realtime_input", "realtimeInput")
+        if realtime:
+            audio = realtime.get("audio")
+            if audio:
+                self.stats.audio_messages += 1
+                # The SDK sends URL-safe base64; only the decoded size is needed
+                self.stats.audio_bytes += len(audio["data"].rstrip("=")) * 3 // 4
+            if _field(realtime, "activity_start", "activityStart") is not None:
+                self.stats.activity_starts += 1
+                await self._interrupt()
+            if _field(realtime, "activity_end", "activityEnd") is not None:
+                self.stats.activity_ends += 1
+                self._start_turn()
+            return
+
+        client_content = _field(message, "client_content", "clientContent")
+        if client_content and _field(client_content, "turn_complete", "turnComplete"):
+            self.stats.text_turns += 1
+            self._start_turn()
+
+    def _start_turn(self) -> None:
+        if self._turn and not self._turn.done():
+            self._turn.cancel()
+        self._turn = asyncio.create_task(self._play_turn())
+
+    async def _interrupt(self) -> None:
+        if self._turn and not self._turn.done():
+            self._turn.cancel()
+            self.stats.interruptions += 1
+            await self._send({"serverContent": {"interrupted": True}})
+
+    async def _play_turn(self) -> None:
+        config = self.config
+        await asyncio.sleep(config.turn_delay_ms / 1000)
+        await self._send(
+            {"serverContent": {"inputTranscription": {"text": config.input_transcript}}}
+        )
+
+        chunk_samples = int(OUTPUT_SAMPLE_RATE * config.audio_chunk_ms / 1000)
+        audio = {
+            "mimeType": OUTPUT_MIME_TYPE,
+            "data": base64.b64encode(bytes(chunk_samples * 2)).decode("ascii"),
+        }
+        # Every chunk is identical, so it is serialized once per turn
+        audio_message = json.dumps(
+            {"serverContent": {"modelTurn": {"parts": [{"inlineData": audio}]}}}
+        )
+        chunks = max(1, round(config.response_audio_ms / config.audio_chunk_ms))
+        words = config.output_transcript.split()
+        interval = (
+            config.audio_chunk_ms
+            if config.chunk_interval_ms is None
+            else config.chunk_interval_ms
+        ) / 1000
+
+        for index in range(chunks):
+            await self._send(audio_message)
+            if index < len(words):
+                transcription = {"text": words[index] + " "}
+                await self._send(
+                    {"serverContent": {"outputTranscription": transcription}}
+                )
+            if interval:
+                await asyncio.sleep(interval)
+
+        await self._send({"serverContent": {"turnComplete": True}})
+        self.stats.turns_completed += 1
+        if self._resumption:
+            await self._send_resumption_update()
+
+    async def _send_resumption_update(self) -> None:
+        self.server.handles += 1
+        handle = f"fake-handle-{self.server.handles}"
+        await self._send(
+            {"sessionResumptionUpdate": {"newHandle": handle, "resumable": True}}
+        )
+
+    async def _go_away(self) -> None:
+        await asyncio.sleep(self.config.go_away_after_seconds)
+        time_left = self.config.go_away_time_left_seconds
+        await self._send({"goAway": {"timeLeft": f"{time_left:g}s"}})
+        self.stats.go_aways += 1
+        await asyncio.sleep(time_left)
+        await self.websocket.close(1000, "Session lifetime reached")
+
+    async def _send(self, message: dict[str, Any] | str) -> None:
+        if not isinstance(message, str):
+            message = json.dumps(message)
+        await self.websocket.send(message)
+        self._sent += 1
+        drop_after = self.config.drop_after_messages
+        if drop_after and self._sent >= drop_after:
+            self.stats.dropped_connections += 1
+            self.websocket.transport.abort()  # Abrupt: no close frame
+            raise ConnectionClosed(None, None)
+
+
+class FakeLiveServer:
+    """
+    TLS WebSocket server emulating the Live API for one or many clients
+
+    Usable as an async context manager; `base_url` is what GEMINI_BASE_URL
+    should be set to.
+    """
+
+    def __init__(
+        self,
+        config: FakeLiveConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        cert_dir: Path | None = None,
+    ) -> None:
+        self.config = config or FakeLiveConfig()
+        self.host = host
+        self.port = port
+        self.cert_dir = cert_dir
+        self._temporary_cert_dir: str | None = None  # Removed on stop()
+        self.stats = FakeLiveStats()
+        self.random = random.Random(self.config.seed)
+        self.handles: int = 0  # Session resumption handles issued
+        self._server: Server | None = None
+        self._connections: set[ServerConnection] = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"https://localhost:{self.port}"
+
+    @property
+    def cert_file(self) -> Path:
+        """Certificate of the server, to use as GEMINI_CA_FILE"""
+        assert self.cert_dir is not None, "start() creates the certificate"
+        return self.cert_dir / CERT_NAME
+
+    async def start(self) -> None:
+        if self.cert_dir is None:
+            self._temporary_cert_dir = tempfile.mkdtemp(prefix="fake-live-")
+            self.cert_dir = Path(self._temporary_cert_dir)
+        cert_file, key_file = await asyncio.to_thread(
+            ensure_self_signed_cert, self.cert_dir
+        )
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(cert_file, key_file)
+        self._server = await serve(
+            self._handle, self.host, self.port, ssl=ssl_context, max_size=None
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(
+            f"Fake Live server listening on {self.base_url} (CA file {self.cert_file})"
+        )
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._temporary_cert_dir is not None:
+            shutil.rmtree(self._temporary_cert_dir, ignore_errors=True)
+            self._temporary_cert_dir = None
+            self.cert_dir = None
+
+    def drop_connections(self) -> None:
+        """Aborts every open connection without a close frame (network failure)"""
+        for websocket in list(self._connections):
+            self.stats.dropped_connections += 1
+            websocket.transport.abort()
+
+    async def __aenter__(self) -> "FakeLiveServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        await self.stop()
+
+    async def _handle(self, websocket: ServerConnection) -> None:
+        self.stats.sessions += 1
+        self.stats.active_sessions += 1
+        self._connections.add(websocket)
+        started = time.monotonic()
+        try:
+            await _FakeSession(self, websocket).run()
+        except ConnectionClosed:
+            pass
+        finally:
+            self._connections.discard(websocket)
+            self.stats.active_sessions -= 1
+            logger.debug(f"Fake session ended after {time.monotonic() - started:.1f}s")
+
+
+async def _serve_forever(server: FakeLiveServer) -> None:
+    async with server:
+        with contextlib.suppress(asyncio.CancelledError):
+            await asyncio.Future()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--cert-dir", type=Path, default=None)
+    parser.add_argument("--turn-delay-ms", type=float, default=300.0)
+    parser.add_argument("--response-audio-ms", type=float, default=2000.0)
+    parser.add_argument("--audio-chunk-ms", type=float, default=40.0)
+    parser.add_argument("--chunk-interval-ms", type=float, default=None)
+    parser.add_argument("--go-away-after-seconds", type=float, default=0.0)
+    parser.add_argument("--setup-failure-rate", type=float, default=0.0)
+    parser.add_argument("--drop-after-messages", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = FakeLiveConfig(
+        turn_delay_ms=args.turn_delay_ms,
+        response_audio_ms=args.response_audio_ms,
+        audio_chunk_ms=args.audio_chunk_ms,
+        chunk_interval_ms=args.chunk_interval_ms,
+        go_away_after_seconds=args.go_away_after_seconds,
+        setup_failure_rate=args.setup_failure_rate,
+        drop_after_messages=args.drop_after_messages,
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(
+            _serve_forever(FakeLiveServer(config, args.host, args.port, args.cert_dir))
+        )
+
+
+if __name__ == "__main__":
+    main()
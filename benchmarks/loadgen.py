@@ -0,0 +1,467 @@
+"""
+Load test: N synthetic browser callers against the /ws endpoint
+Run with: python -m benchmarks.loadgen [--callers N] [--profile ramp|soak|spike] [--spawn]
+
+Each caller streams 16 kHz PCM (WAV files or a synthetic tone) at real-time
+pace with the framing of static/index.html: activity_start, a 400 ms
+pre-speech burst, 512-sample frames every 32 ms, a periodic flush every 15 s
+of speech and activity_end, then waits for turn_complete before the next
+utterance. Server CPU and RSS come from its /metrics endpoint.
+
+--spawn starts the fake Live server and a uvicorn backend pointed at it, so
+the whole FastAPI -> SDK -> socket path runs offline.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import wave
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from websockets.asyncio.client import ClientConnection, connect
+
+from benchmarks.fake_live_server import ensure_self_signed_cert
+
+SAMPLE_RATE = 16000
+OUTPUT_SAMPLE_RATE = 24000
+FRAME_SAMPLES = 512  # Same as VAD_FRAME_SAMPLES in static/index.html
+FRAME_BYTES = FRAME_SAMPLES * 2
+FRAME_SECONDS = FRAME_SAMPLES / SAMPLE_RATE
+PRE_SPEECH_FRAMES = 13  # ceil(400 ms / 32 ms), sent in one burst
+FLUSH_INTERVAL_SECONDS = 15.0
+UNDERRUN_TOLERANCE_SECONDS = 0.005  # Shorter playback gaps are inaudible
+
+# Counters scraped from /metrics before and after the run
+SERVER_COUNTERS = (
+    "process_cpu_seconds_total",
+    "gemini_live_uplink_dropped_total",
+    "gemini_live_downlink_dropped_audio_total",
+    "gemini_live_downlink_slow_consumer_events_total",
+    "gemini_live_upstream_connect_failures_total",
+)
+
+
+@dataclass
+class CallerResult:
+    """Measurements of one simulated browser session"""
+
+    caller: int
+    connect_ms: float | None = None
+    turns: int = 0
+    ttfa_ms: list[float] = field(default_factory=list)  # activity_end -> first audio
+    jitter_ms: float = 0.0  # Stdev of audio inter-arrival gaps within turns
+    late_uplink_frames: int = 0  # Frames sent more than one frame period late
+    playout_underruns: int = 0  # Audio that arrived after the player ran dry
+    playout_stall_ms: float = 0.0
+    audio_bytes_sent: int = 0
+    audio_bytes_received: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class _Downlink:
+    """Reads server messages and tracks per-turn audio timing"""
+
+    def __init__(self, result: CallerResult) -> None:
+        self.result = result
+        self.connected = asyncio.Event()
+        self.turn_done = asyncio.Event()
+        self.activity_end_at: float | None = None
+        self._last_audio_at: float | None = None
+        self._playout_end: float = 0.0
+        self.gaps: list[float] = []
+
+    async def run(self, websocket: ClientConnection) -> None:
+        async for message in websocket:
+            now = time.perf_counter()
+            if isinstance(message, bytes):
+                self._on_audio(message, now)
+                continue
+            kind = json.loads(message).get("type")
+            if kind == "status":
+                self.connected.set()
+            elif kind in ("turn_complete", "interrupted"):
+                self._last_audio_at = None
+                self.turn_done.set()
+            elif kind == "error":
+                self.result.errors.append(json.loads(message).get("message", ""))
+
+    def _on_audio(self, chunk: bytes, now: float) -> None:
+        result = self.result
+        result.audio_bytes_received += len(chunk)
+        if self.activity_end_at is not None:
+            result.ttfa_ms.append((now - self.activity_end_at) * 1000)
+            self.activity_end_at = None
+        if self._last_audio_at is None:
+            self._playout_end = now
+        else:
+            self.gaps.append((now - self._last_audio_at) * 1000)
+            stall = now - self._playout_end
+            if stall > UNDERRUN_TOLERANCE_SECONDS:
+                result.playout_underruns += 1
+                result.playout_stall_ms += stall * 1000
+        self._last_audio_at = now
+        # A browser player queues each chunk right after the previous one
+        duration = len(chunk) / 2 / OUTPUT_SAMPLE_RATE
+        self._playout_end = max(self._playout_end, now) + duration
+
+
+def load_utterances(paths: list[str]) -> list[bytes]:
+    """Reads 16 kHz mono PCM16 WAV files, or synthesizes one utterance"""
+    if not paths:
+        t = np.arange(int(SAMPLE_RATE * 1.5)) / SAMPLE_RATE
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)  # Syllable-like bursts
+        tone = 6000 * envelope * np.sin(2 * np.pi * 220 * t)
+        return [tone.astype(np.int16).tobytes()]
+
+    utterances = []
+    for path in paths:
+        with wave.open(path, "rb") as wav:
+            if (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) != (
+                1,
+                2,
+                SAMPLE_RATE,
+            ):
+                raise SystemExit(f"{path}: expected 16 kHz mono 16-bit PCM")
+            utterances.append(wav.readframes(wav.getnframes()))
+    return utterances
+
+
+async def _speak(
+    websocket: ClientConnection, utterance: bytes, result: CallerResult
+) -> None:
+    """Streams one utterance like the browser's VAD callbacks do"""
+    frames = [
+        utterance[offset : offset + FRAME_BYTES]
+        for offset in range(0, len(utterance), FRAME_BYTES)
+    ]
+    await websocket.send(json.dumps({"type": "activity_start"}))
+    for frame in frames[:PRE_SPEECH_FRAMES]:
+        await websocket.send(frame)
+
+    started = last_flush = time.perf_counter()
+    for index, frame in enumerate(frames[PRE_SPEECH_FRAMES:]):
+        due = started + index * FRAME_SECONDS
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif -delay > FRAME_SECONDS:
+            result.late_uplink_frames += 1
+        await websocket.send(frame)
+        if time.perf_counter() - last_flush >= FLUSH_INTERVAL_SECONDS:
+            await websocket.send(json.dumps({"type": "activity_end"}))
+            await websocket.send(json.dumps({"type": "activity_start"}))
+            last_flush = time.perf_counter()
+    result.audio_bytes_sent += len(utterance)
+
+
+async def run_caller(
+    caller: int,
+    url: str,
+    utterances: list[bytes],
+    start_at: float,
+    stop_at: float,
+    think_seconds: float,
+    turn_timeout: float,
+) -> CallerResult:
+    """One browser session from `start_at` to `stop_at` (perf_counter times)"""
+    result = CallerResult(caller)
+    await asyncio.sleep(max(0.0, start_at - time.perf_counter()))
+
+    downlink = _Downlink(result)
+    reader: asyncio.Task[None] | None = None
+    try:
+        started = time.perf_counter()
+        async with connect(url, max_size=None) as websocket:
+            reader = asyncio.create_task(downlink.run(websocket))
+            await asyncio.wait_for(downlink.connected.wait(), turn_timeout)
+            result.connect_ms = (time.perf_counter() - started) * 1000
+
+            turn = 0
+            while time.perf_counter() < stop_at:
+                downlink.turn_done.clear()
+                await _speak(websocket, utterances[turn % len(utterances)], result)
+                downlink.activity_end_at = time.perf_counter()
+                await websocket.send(json.dumps({"type": "activity_end"}))
+                try:
+                    await asyncio.wait_for(downlink.turn_done.wait(), turn_timeout)
+                    result.turns += 1
+                except TimeoutError:
+                    result.errors.append("turn timeout")
+                turn += 1
+                await asyncio.sleep(think_seconds)
+    except Exception as e:
+        result.errors.append(f"{type(e).__name__}: {e}")
+    finally:
+        if reader:
+            reader.cancel()
+
+    if len(downlink.gaps) > 1:
+        result.jitter_ms = statistics.stdev(downlink.gaps)
+    return result
+
+
+def schedule(
+    profile: str, callers: int, duration: float, ramp: float
+) -> list[tuple[float, float]]:
+    """Returns (start, stop) offsets in seconds for every caller"""
+    if profile == "ramp":
+        # Add callers linearly over `ramp`, then hold them all for `duration`
+        return [(i * ramp / callers, ramp + duration) for i in range(callers)]
+    if profile == "soak":
+        # Everyone within the first second, held for the whole run
+        return [(i / callers, duration) for i in range(callers)]
+    if profile == "spike":
+        # A 10% baseline for the whole run, the rest arrive together mid-run
+        baseline = max(1, callers // 10)
+        spike_start, spike_stop = duration / 3, 2 * duration / 3
+        return [
+            (0.0, duration) if i < baseline else (spike_start, spike_stop)
+            for i in range(callers)
+        ]
+    raise SystemExit(f"Unknown profile {profile!r}")
+
+
+def scrape_metrics(metrics_url: str) -> dict[str, float]:
+    """Sums every sample of each metric family in a Prometheus text page"""
+    try:
+        with urllib.request.urlopen(metrics_url, timeout=5) as response:
+            text = response.read().decode()
+    except OSError:
+        return {}
+    totals: dict[str, float] = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        name_part, _, value = line.rpartition(" ")
+        name = name_part.split("{", 1)[0]
+        totals[name] = totals.get(name, 0.0) + float(value)
+    return totals
+
+
+async def _sample_rss(metrics_url: str, samples: list[float], stop: asyncio.Event):
+    while not stop.is_set():
+        metrics = await asyncio.to_thread(scrape_metrics, metrics_url)
+        if "process_resident_memory_bytes" in metrics:
+            samples.append(metrics["process_resident_memory_bytes"])
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop.wait(), 1.0)
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "p50": rank(0.5),
+        "p90": rank(0.9),
+        "p99": rank(0.99),
+        "max": ordered[-1],
+    }
+
+
+def summarize(
+    results: list[CallerResult],
+    before: dict[str, float],
+    after: dict[str, float],
+    rss_samples: list[float],
+    peak_callers: int,
+) -> dict[str, Any]:
+    server: dict[str, Any] = {
+        name: after[name] - before.get(name, 0.0)
+        for name in SERVER_COUNTERS
+        if name in after
+    }
+    if "process_cpu_seconds_total" in server:
+        server["cpu_seconds_per_session"] = server["process_cpu_seconds_total"] / max(
+            1, len(results)
+        )
+    if rss_samples:
+        baseline = before.get("process_resident_memory_bytes", rss_samples[0])
+        server["rss_bytes_peak"] = max(rss_samples)
+        server["rss_bytes_per_session"] = (max(rss_samples) - baseline) / max(
+            1, peak_callers
+        )
+
+    return {
+        "sessions": len(results),
+        "failed_sessions": sum(1 for r in results if r.connect_ms is None),
+        "turns": sum(r.turns for r in results),
+        "errors": sum(len(r.errors) for r in results),
+        "connect_ms": _percentiles([r.connect_ms for r in results if r.connect_ms]),
+        "ttfa_ms": _percentiles([v for r in results for v in r.ttfa_ms]),
+        "jitter_ms": _percentiles([r.jitter_ms for r in results if r.turns]),
+        "late_uplink_frames": sum(r.late_uplink_frames for r in results),
+        "playout_underruns": sum(r.playout_underruns for r in results),
+        "playout_stall_ms": sum(r.playout_stall_ms for r in results),
+        "server": server,
+    }
+
+
+def _peak_concurrency(plan: list[tuple[float, float]]) -> int:
+    edges = sorted([(start, 1) for start, _ in plan] + [(stop, -1) for _, stop in plan])
+    current = peak = 0
+    for _, delta in edges:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def _spawn(port: int, fake_port: int) -> list[subprocess.Popen]:
+    """Starts the fake Live server and a backend pointed at it"""
+    cert_dir = Path(tempfile.mkdtemp(prefix="loadgen-certs-"))
+    cert_file, _key_file = ensure_self_signed_cert(cert_dir)
+    env = {
+        **os.environ,
+        "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "loadgen-api-key"),
+        "GEMINI_BASE_URL": f"https://localhost:{fake_port}",
+        "GEMINI_CA_FILE": str(cert_file),
+        "LOG_LEVEL": "WARNING",
+    }
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.fake_live_server"]
+            + ["--port", str(fake_port), "--cert-dir", str(cert_dir)],
+            env=env,
+        ),
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)]
+            + ["--log-level", "warning"],
+            env=env,
+        ),
+    ]
+    deadline = time.monotonic() + 30
+    while not scrape_metrics(f"http://127.0.0.1:{port}/metrics"):
+        if time.monotonic() > deadline:
+            raise SystemExit("Spawned backend did not come up")
+        time.sleep(0.2)
+    return processes
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    utterances = load_utterances(args.wav)
+    plan = schedule(args.profile, args.callers, args.duration, args.ramp)
+    metrics_url = args.url.replace("ws", "http", 1).rsplit("/", 1)[0] + "/metrics"
+
+    before = await asyncio.to_thread(scrape_metrics, metrics_url)
+    rss_samples: list[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(metrics_url, rss_samples, stop))
+
+    origin = time.perf_counter() + 0.1
+    results = await asyncio.gather(
+        *(
+            run_caller(
+                index,
+                args.url,
+                utterances,
+                origin + start,
+                origin + stop_at,
+                args.think_seconds,
+                args.turn_timeout,
+            )
+            for index, (start, stop_at) in enumerate(plan)
+        )
+    )
+    elapsed = time.perf_counter() - origin
+
+    stop.set()
+    await sampler
+    after = await asyncio.to_thread(scrape_metrics, metrics_url)
+
+    return {
+        "profile": args.profile,
+        "callers": args.callers,
+        "peak_concurrency": _peak_concurrency(plan),
+        "duration_seconds": elapsed,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "summary": summarize(
+            results, before, after, rss_samples, _peak_concurrency(plan)
+        ),
+        "sessions": [asdict(result) for result in results],
+    }
+
+
+def _print_report(report: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    summary = report["summary"]
+    previous = baseline["summary"] if baseline else {}
+    print(
+        f"Profile {report['profile']}: {report['callers']} callers "
+        f"(peak {report['peak_concurrency']}), {report['duration_seconds']:.0f}s"
+    )
+    rows = [
+        ("connect p50 ms", ("connect_ms", "p50")),
+        ("connect p99 ms", ("connect_ms", "p99")),
+        ("time to first audio p50 ms", ("ttfa_ms", "p50")),
+        ("time to first audio p99 ms", ("ttfa_ms", "p99")),
+        ("downlink jitter p90 ms", ("jitter_ms", "p90")),
+        ("turns", ("turns",)),
+        ("errors", ("errors",)),
+        ("late uplink frames", ("late_uplink_frames",)),
+        ("playout underruns", ("playout_underruns",)),
+        ("playout stall ms", ("playout_stall_ms",)),
+        ("server CPU s/session", ("server", "cpu_seconds_per_session")),
+        ("server RSS bytes/session", ("server", "rss_bytes_per_session")),
+    ]
+    for label, path in rows:
+        value: Any = summary
+        old: Any = previous
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+            old = old.get(key) if isinstance(old, dict) else None
+        if value is None:
+            continue
+        line = f"{label:<30}{value:>14,.2f}"
+        if old is not None:
+            line += f"  (baseline {old:,.2f})"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws")
+    parser.add_argument("--callers", type=int, default=10)
+    parser.add_argument("--profile", choices=["ramp", "soak", "spike"], default="ramp")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--ramp", type=float, default=10.0)
+    parser.add_argument("--wav", action="append", default=[])
+    parser.add_argument("--think-seconds", type=float, default=1.0)
+    parser.add_argument("--turn-timeout", type=float, default=15.0)
+    parser.add_argument("--output", default="loadgen-results.json")
+    parser.add_argument("--compare", help="Previous results JSON to print next to")
+    parser.add_argument("--spawn", action="store_true")
+    parser.add_argument("--fake-port", type=int, default=9443)
+    args = parser.parse_args()
+
+    spawned: list[subprocess.Popen] = []
+    if args.spawn:
+        port = int(args.url.rsplit(":", 1)[1].split("/", 1)[0])
+        spawned = _spawn(port, args.fake_port)
+    try:
+        report = asyncio.run(main(args))
+    finally:
+        for process in spawned:
+            process.terminate()
+            process.wait()
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    _print_report(report, baseline)
+    print(f"Results written to {args.output}")
@@ -0,0 +1,214 @@
+"""
+Replays session recordings made with SESSION_RECORDING_ENABLED
+Drives a GeminiLiveService from the recorded uplink, against the real API or a recorded upstream
+
+Run with: python -m benchmarks.session_replay FILE [--speed 1.0] [--upstream fake|real]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+from collections.abc import AsyncIterator, Iterable
+from pathlib import Path
+from typing import Any
+
+from google.genai import types
+
+from app.services.gemini_live import GeminiLiveService
+from app.services.latency import latency_metrics
+from app.services.session_recorder import Record, RecordKind, read_records
+
+
+class Recording:
+    """A capture loaded in memory, split by direction"""
+
+    def __init__(self, records: Iterable[Record]) -> None:
+        self.metadata: dict[str, Any] = {}
+        self.uplink: list[Record] = []  # Browser audio and client control signals
+        self.downlink: list[Record] = []  # Server messages
+        for record in records:
+            if record.kind is RecordKind.METADATA:
+                self.metadata = record.json()
+            elif record.kind is RecordKind.SERVER_MESSAGE:
+                self.downlink.append(record)
+            elif record.kind is RecordKind.AUDIO_IN:
+                self.uplink.append(record)
+            elif record.json().get("source", "client") == "client":
+                # The service regenerates signals of its own server-side VAD
+                self.uplink.append(record)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "Recording":
+        return cls(read_records(path))
+
+    def server_messages(self) -> list[types.LiveServerMessage]:
+        return [record.server_message() for record in self.downlink]
+
+    def origin(self, speed: float) -> float:
+        """Monotonic time that maps to recording time 0 for a replay starting now"""
+        first = min(
+            (
+                records[0].timestamp
+                for records in (self.uplink, self.downlink)
+                if records
+            ),
+            default=0.0,
+        )
+        # Skip the idle time before the first record
+        return time.monotonic() - (first / speed if speed > 0 else 0.0)
+
+
+async def _pace(origin: float, timestamp: float, speed: float) -> None:
+    """Sleeps until `timestamp` seconds of recording time after `origin`"""
+    if speed > 0:
+        delay = origin + timestamp / speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ReplayUpstream:
+    """
+    Stand-in for the SDK's AsyncSession that plays back recorded server messages
+
+    `receive()` behaves like the SDK's: it yields messages until the end of a
+    turn. Once the recording is exhausted it sets `finished` and waits, like
+    an idle Live socket. Sends are counted and discarded.
+    """
+
+    def __init__(
+        self, recording: Recording, speed: float = 1.0, origin: float | None = None
+    ) -> None:
+        self.messages = recording.server_messages()
+        self.timestamps = [record.timestamp for record in recording.downlink]
+        self.speed = speed
+        self.origin = recording.origin(speed) if origin is None else origin
+        self.index = 0
+        self.sent: dict[str, int] = {}
+        self.finished = asyncio.Event()
+
+    async def receive(self) -> AsyncIterator[types.LiveServerMessage]:
+        if self.index >= len(self.messages):
+            self.finished.set()
+            await asyncio.Future()  # Nothing more will arrive
+        while self.index < len(self.messages):
+            await _pace(self.origin, self.timestamps[self.index], self.speed)
+            message = self.messages[self.index]
+            self.index += 1
+            yield message
+            if message.server_content and message.server_content.turn_complete:
+                return
+
+    async def send_realtime_input(self, **kwargs: Any) -> None:
+        for name in kwargs:
+            self.sent[name] = self.sent.get(name, 0) + 1
+
+    async def send(self, **_kwargs: Any) -> None:
+        self.sent["text"] = self.sent.get("text", 0) + 1
+
+
+async def replay_uplink(
+    service: GeminiLiveService,
+    recording: Recording,
+    speed: float = 1.0,
+    origin: float | None = None,
+) -> int:
+    """Feeds the recorded browser input to `service`; returns records sent"""
+    if origin is None:
+        origin = recording.origin(speed)
+    for record in recording.uplink:
+        await _pace(origin, record.timestamp, speed)
+        if record.kind is RecordKind.AUDIO_IN:
+            await service.send_audio(record.payload)
+            continue
+        control = record.json()
+        if control["type"] == "activity_start":
+            await service.send_activity_start()
+        elif control["type"] == "activity_end":
+            await service.send_activity_end()
+        elif control["type"] == "activity_cancel":
+            await service.send_activity_cancel()
+        elif control["type"] == "text":
+            await service.send_text(control["content"])
+    return len(recording.uplink)
+
+
+async def replay_session(
+    recording: Recording,
+    speed: float = 1.0,
+    upstream: str = "fake",
+    settle_seconds: float = 10.0,
+) -> dict[str, Any]:
+    """
+    Replays a whole session through GeminiLiveService
+
+    With upstream="fake" the recorded server messages answer the replayed
+    input; with "real" the service connects to the configured endpoint and
+    its answers are collected for up to `settle_seconds` after the input ends.
+    """
+    service = GeminiLiveService()
+    fake: ReplayUpstream | None = None
+    if upstream == "fake":
+        service.session = fake = ReplayUpstream(recording, speed)
+    else:
+        await service.connect()
+    origin = fake.origin if fake else recording.origin(speed)
+
+    events = turns = audio_bytes = 0
+
+    async def consume() -> None:
+        nonlocal events, turns, audio_bytes
+        async for event in service.receive_responses():
+            events += 1
+            turns += event.turn_complete
+            audio_bytes += len(event.audio or b"")
+
+    reader = asyncio.create_task(consume())
+    started = time.monotonic()
+    try:
+        sent = await replay_uplink(service, recording, speed, origin)
+        with contextlib.suppress(TimeoutError):
+            if fake is not None:
+                await fake.finished.wait()
+            else:
+                await asyncio.wait_for(asyncio.shield(reader), settle_seconds)
+    finally:
+        reader.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await reader
+        await service.disconnect()
+
+    return {
+        "uplink_records": sent,
+        "events": events,
+        "turns": turns,
+        "audio_bytes_out": audio_bytes,
+        "seconds": time.monotonic() - started,
+        "upstream_sent": fake.sent if fake else None,
+        "latency": latency_metrics.snapshot()["process"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="0 = no pacing")
+    parser.add_argument("--upstream", choices=["fake", "real"], default="fake")
+    parser.add_argument("--settle-seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    recording = Recording.load(args.recording)
+    print(
+        f"{args.recording}: {len(recording.uplink)} uplink and "
+        f"{len(recording.downlink)} server records, model "
+        f"{recording.metadata.get('model', '?')}"
+    )
+    result = asyncio.run(
+        replay_session(recording, args.speed, args.upstream, args.settle_seconds)
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Microbenchmark suite for the per-frame audio and message hot paths
+Run with: python -m benchmarks.suite [--only NAME] [--save-baseline] [--tolerance 0.2]
+
+Times each case in ops/sec and measures, with tracemalloc, the bytes
+allocated while one op runs (peak above the starting point) and the bytes it
+leaves behind. Results are compared with benchmarks/baseline.json and the
+run exits with status 1 when a case is slower or allocates more than the
+tolerance allows. Baselines are machine-specific: regenerate them with
+--save-baseline on the machine that runs the comparison, with the locked
+dependencies (uv sync --frozen). The baseline records the Python and library
+versions it was measured with; under other versions nothing is compared.
+
+Cases:
+  send_audio           GeminiLiveService.send_audio through a real SDK session
+  receive_responses    receive_responses over recorded server JSON messages
+                       (synthetic, or the server messages of --recording FILE)
+  send_to_browser      /ws fan-out of LiveEvents as JSON and binary frames
+  receive_from_browser /ws dispatch of browser JSON control messages
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-api-key")
+
+from fastapi import WebSocketDisconnect  # noqa: E402
+from google.genai import live  # noqa: E402
+from websockets.exceptions import ConnectionClosedOK  # noqa: E402
+
+from app.routers import websocket as websocket_router  # noqa: E402
+from app.services.client_pool import client_pool  # noqa: E402
+from app.services.gemini_live import GeminiLiveService  # noqa: E402
+from app.services.live_events import LiveEvent, LiveMessageParser  # noqa: E402
+from app.services.session_recorder import RecordKind, read_records  # noqa: E402
+from benchmarks.bench_parser import recorded_turn  # noqa: E402
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+# Libraries on the measured paths: a different release changes the numbers
+MEASURED_PACKAGES = ("google-genai", "websockets", "pydantic", "fastapi")
+FRAME = bytes(1024)  # One 512-sample browser frame of 16 kHz PCM
+TURNS_PER_SESSION = 10
+CONTROL_MESSAGES_PER_SESSION = 500
+# Session capture (SESSION_RECORDING_ENABLED) whose server messages are replayed
+recording_file: Path | None = None
+
+Op = Callable[[], Awaitable[None]]
+Setup = Callable[[], tuple[Op, int]]  # The op and the frames/messages it handles
+
+
+@dataclass
+class Case:
+    """A benchmark: builds the op once, then runs it repeatedly"""
+
+    name: str
+    setup: Setup
+    ops: int
+
+
+class _FakeUpstream:
+    """Socket under a real AsyncSession: discards sends, replays recorded messages"""
+
+    def __init__(self, messages: list[str] | None = None) -> None:
+        self.messages = messages or []
+        self.index = 0
+        self.sent_bytes = 0
+
+    async def send(self, message: str | memoryview, text: bool | None = None) -> None:  # noqa: ARG002
+        self.sent_bytes += len(message)
+
+    async def recv(self, decode: bool | None = None) -> str:  # noqa: ARG002
+        if self.index >= len(self.messages):
+            raise ConnectionClosedOK(None, None)
+        self.index += 1
+        return self.messages[self.index - 1]
+
+
+def _live_session(upstream: _FakeUpstream) -> live.AsyncSession:
+    client = client_pool.get(os.environ["GEMINI_API_KEY"], "benchmark-model")
+    return live.AsyncSession(api_client=client.aio._api_client, websocket=upstream)
+
+
+def _recorded_json() -> list[str]:
+    """One turn of server messages as they arrive on the wire"""
+    if recording_file is not None:
+        return [
+            record.payload.decode()
+            for record in read_records(recording_file)
+            if record.kind is RecordKind.SERVER_MESSAGE
+        ]
+    return [
+        message.model_dump_json(by_alias=True, exclude_none=True)
+        for message in recorded_turn()
+    ]
+
+
+def _recorded_events() -> list[LiveEvent]:
+    parser = LiveMessageParser()
+    events = [parser.parse(message) for message in recorded_turn()]
+    return [event for event in events if event is not None]
+
+
+class _FakeBrowser:
+    """Starlette WebSocket stand-in fed from a script of browser messages"""
+
+    def __init__(self, script: list[dict[str, Any]]) -> None:
+        self.script = script
+        self.index = 0
+        self.sent_bytes = 0
+
+    async def accept(self) -> None:
+        return None
+
+    async def receive(self) -> dict[str, Any]:
+        if self.index >= len(self.script):
+            raise WebSocketDisconnect(1000)
+        self.index += 1
+        return self.script[self.index - 1]
+
+    async def send_json(self, data: Any) -> None:
+        # Same serialization as starlette.websockets.WebSocket.send_json
+        self.sent_bytes += len(json.dumps(data, separators=(",", ":")))
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent_bytes += len(data)
+
+
+class _FakeService:
+    """GeminiLiveService stand-in: the router paths run, upstream I/O does not"""
+
+    events: list[LiveEvent] = []
+
+    async def connect(self) -> bool:
+        return True
+
+    async def disconnect(self) -> None:
+        return None
+
+    async def send_audio(self, _audio_data: bytes) -> None:
+        return None
+
+    async def send_text(self, _text: str) -> None:
+        return None
+
+    async def send_activity_start(self) -> None:
+        return None
+
+    async def send_activity_end(self) -> None:
+        return None
+
+    async def send_activity_cancel(self) -> None:
+        return None
+
+    async def receive_responses(self) -> AsyncIterator[LiveEvent]:
+        for event in self.events:
+            yield event
+
+
+def _setup_send_audio() -> tuple[Op, int]:
+    service = GeminiLiveService()
+    service.session = _live_session(_FakeUpstream())
+
+    async def op() -> None:
+        await service.send_audio(FRAME)
+
+    return op, 1
+
+
+def _setup_receive_responses() -> tuple[Op, int]:
+    messages = _recorded_json()
+    service = GeminiLiveService()
+
+    async def op() -> None:
+        service.session = _live_session(_FakeUpstream(messages))
+        try:
+            async for _event in service.receive_responses():
+                pass
+        except Exception:  # The replay ends by closing the fake socket
+            pass
+
+    return op, len(messages)
+
+
+def _run_endpoint(
+    script: list[dict[str, Any]], events: list[LiveEvent]
+) -> tuple[Op, int]:
+    class Service(_FakeService):
+        pass
+
+    Service.events = events
+
+    async def op() -> None:
+        with patch.object(websocket_router, "GeminiLiveService", Service):
+            await websocket_router.websocket_endpoint(_FakeBrowser(script))
+
+    return op, len(script) + len(events)
+
+
+def _setup_send_to_browser() -> tuple[Op, int]:
+    return _run_endpoint([], _recorded_events() * TURNS_PER_SESSION)
+
+
+def _setup_receive_from_browser() -> tuple[Op, int]:
+    controls = [
+        {"type": "activity_start"},
+        {"type": "ping"},
+        {"type": "activity_end"},
+        {"type": "text", "content": "hola"},
+    ]
+    script = [
+        {"text": json.dumps(controls[index % len(controls)])}
+        for index in range(CONTROL_MESSAGES_PER_SESSION)
+    ]
+    return _run_endpoint(script, [])
+
+
+CASES = [
+    Case("send_audio", _setup_send_audio, ops=20000),
+    Case("receive_responses", _setup_receive_responses, ops=200),
+    Case("send_to_browser", _setup_send_to_browser, ops=100),
+    Case("receive_from_browser", _setup_receive_from_browser, ops=100),
+]
+
+
+async def _measure(case: Case) -> dict[str, float]:
+    op, units_per_op = case.setup()
+    for _ in range(max(1, case.ops // 10)):  # Warm-up
+        await op()
+
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(case.ops):
+        await op()
+    elapsed = time.perf_counter() - start
+
+    samples = max(1, min(case.ops, 200))
+    gc.collect()
+    tracemalloc.start()
+    transient = 0
+    retained_from = tracemalloc.get_traced_memory()[0]
+    for _ in range(samples):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await op()
+        transient += tracemalloc.get_traced_memory()[1] - before
+    retained = tracemalloc.get_traced_memory()[0] - retained_from
+    tracemalloc.stop()
+
+    per_op = samples * units_per_op
+    return {
+        "ops_per_second": round(case.ops * units_per_op / elapsed, 1),
+        "alloc_bytes_per_op": round(transient / per_op, 1),
+        "retained_bytes_per_op": round(max(0, retained) / per_op, 1),
+    }
+
+
+def _compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Returns a description of every case that regressed past `tolerance`"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result["ops_per_second"] < previous["ops_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['ops_per_second']:,.0f} ops/s "
+                f"vs {previous['ops_per_second']:,.0f} baseline"
+            )
+        # Small absolute growth (a few dozen bytes) is allocator noise
+        allowed = previous["alloc_bytes_per_op"] * (1 + tolerance) + 64
+        if result["alloc_bytes_per_op"] > allowed:
+            regressions.append(
+                f"{name}: {result['alloc_bytes_per_op']:,.0f} B/op allocated "
+                f"vs {previous['alloc_bytes_per_op']:,.0f} baseline"
+            )
+    return regressions
+
+
+def _print_results(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]]
+) -> None:
+    print(
+        f"{'case':<22}{'ops/s':>14}{'baseline':>14}{'change':>9}"
+        f"{'alloc B/op':>13}{'baseline':>11}{'retained B/op':>15}"
+    )
+    for name, result in results.items():
+        previous = baseline.get(name, {})
+        rate = result["ops_per_second"]
+        old_rate = previous.get("ops_per_second")
+        change = f"{rate / old_rate - 1:+.0%}" if old_rate else "-"
+        old_alloc = previous.get("alloc_bytes_per_op")
+        print(
+            f"{name:<22}{rate:>14,.0f}"
+            f"{f'{old_rate:,.0f}' if old_rate else '-':>14}{change:>9}"
+            f"{result['alloc_bytes_per_op']:>13,.0f}"
+            f"{f'{old_alloc:,.0f}' if old_alloc is not None else '-':>11}"
+            f"{result['retained_bytes_per_op']:>15,.1f}"
+        )
+
+
+def _environment() -> dict[str, str]:
+    """Python and library versions the results were measured with"""
+    return {
+        "python": ".".join(platform.python_version_tuple()[:2]),
+        **{package: version(package) for package in MEASURED_PACKAGES},
+    }
+
+
+async def main(only: list[str]) -> dict[str, dict[str, float]]:
+    # Production log level, with records formatted but not written anywhere
+    logging.basicConfig(
+        level=logging.INFO, handlers=[logging.NullHandler()], force=True
+    )
+    results = {}
+    for case in CASES:
+        if not only or case.name in only:
+            results[case.name] = await _measure(case)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--only", action="append", default=[])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--recording", type=Path)
+    args = parser.parse_args()
+    recording_file = args.recording
+
+    results = asyncio.run(main(args.only))
+    saved = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    environment = _environment()
+    if saved.get("environment") != environment:
+        saved = {"environment": environment, "cases": {}}
+        if not args.save_baseline:
+            print(
+                f"Baseline {args.baseline} was not measured with {environment}; "
+                "not comparing (regenerate it with --save-baseline)"
+            )
+    baseline = saved["cases"]
+    _print_results(results, baseline)
+
+    if args.save_baseline:
+        saved["cases"] = {**baseline, **results}
+        args.baseline.write_text(json.dumps(saved, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        sys.exit(0)
+
+    regressions = _compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
@@ -4,14 +4,30 @@ Real-time audio streaming and transcription application
 """
 
 import logging
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
 from app.routers import websocket
+from app.services.call_bridge import call_bridges
+from app.services.client_pool import client_pool
+from app.services.downlink_queue import aggregate_stats as downlink_stats
+from app.services.flush_scheduler import flush_totals
+from app.services.gemini_live import live_client, live_connect_config
+from app.services.latency import latency_metrics
+from app.services.lazy_connect import lazy_connect_totals
+from app.services.metrics import CONTENT_TYPE, MetricsReporter
+from app.services.pcm_ring_buffer import aggregate_stats as audio_history_stats
+from app.services.session_hibernation import aggregate_stats as hibernation_stats
+from app.services.session_pool import session_pool
+from app.services.silence_suppressor import silence_totals
+from app.services.speculative_activity import speculation_totals
+from app.services.uplink_queue import aggregate_stats as uplink_stats
 
 # Configure logging with settings
 logging.basicConfig(
@@ -20,11 +36,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+metrics_reporter = MetricsReporter(
+    multiproc_dir=settings.metrics_multiproc_dir,
+    lag_interval_seconds=settings.event_loop_lag_interval_seconds,
+    snapshot_interval_seconds=settings.metrics_snapshot_interval_seconds,
+)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    """Manage process-wide resources shared by all WebSocket sessions"""
+    metrics_reporter.start()
+    if settings.session_pool_enabled:
+        # Keep the default configuration warm before the first call arrives
+        session_pool.register(
+            live_client(), settings.gemini_model, live_connect_config()
+        )
+        session_pool.start()
+    yield
+    await call_bridges.close_all()
+    await session_pool.stop()
+    await client_pool.aclose()
+    await metrics_reporter.stop()
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Real-time conversation",
     description="Application for testing audio streaming and transcriptions with Gemini Live API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Include routers
@@ -51,6 +92,44 @@ async def health_check() -> dict[str, Any]:
     }
 
 
+@app.get("/stats")
+async def stats() -> dict[str, Any]:
+    """Runtime statistics for shared resources"""
+    return {
+        "client_pool": client_pool.stats(),
+        "session_pool": session_pool.stats(),
+        "uplink": uplink_stats(),
+        "downlink": downlink_stats(),
+        "server_flush": flush_totals.stats(),
+        "silence_suppression": silence_totals.stats(),
+        "audio_history": audio_history_stats(),
+        "speculative_activity": speculation_totals.stats(),
+        "reattach": call_bridges.stats(),
+        "hibernation": hibernation_stats(),
+        "lazy_connect": lazy_connect_totals.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus metrics (merged across workers when METRICS_MULTIPROC_DIR is set)"""
+    return PlainTextResponse(metrics_reporter.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/latency")
+async def latency(
+    metric: str | None = None, config: str | None = None
+) -> dict[str, Any]:
+    """
+    Per-turn latency quantiles (p50/p90/p99)
+
+    Args:
+        metric: Only this metric (e.g. activity_end_to_first_audio)
+        config: Only this model/voice/language configuration
+    """
+    return latency_metrics.snapshot(metric=metric, config_key=config)
+
+
 if __name__ == "__main__":
     import uvicorn
 
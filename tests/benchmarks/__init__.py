@@ -0,0 +1,3 @@
+"""
+Tests for the benchmark and load-test tooling
+"""
@@ -0,0 +1,218 @@
+"""
+Tests for the fake Gemini Live server, driven through the real SDK
+"""
+
+import asyncio
+
+import pytest
+
+from app.exceptions import GeminiAPIError
+from app.services.gemini_live import GeminiLiveService
+from benchmarks.fake_live_server import FakeLiveConfig, FakeLiveServer
+
+FAST = FakeLiveConfig(
+    turn_delay_ms=10, response_audio_ms=120, audio_chunk_ms=40, chunk_interval_ms=0
+)
+
+
+def _point_at(mocker, server: FakeLiveServer) -> None:
+    mocker.patch("app.services.gemini_live.settings.gemini_base_url", server.base_url)
+    mocker.patch(
+        "app.services.gemini_live.settings.gemini_ca_file", str(server.cert_file)
+    )
+
+
+async def _collect_turn(service: GeminiLiveService) -> list:
+    events = []
+    async for event in service.receive_responses():
+        events.append(event)
+        if event.turn_complete or event.interrupted:
+            return events
+    return events
+
+
+async def test_voice_turn_round_trip(mock_gemini_api_key, mocker):
+    """Test that a full activity cycle gets transcriptions, audio and turnComplete"""
+    async with FakeLiveServer(FAST) as server:
+        _point_at(mocker, server)
+        service = GeminiLiveService()
+        await service.connect()
+        try:
+            await service.send_activity_start()
+            await service.send_audio(b"\x10\x00" * 512)
+            await service.send_activity_end()
+            events = await asyncio.wait_for(_collect_turn(service), timeout=5)
+        finally:
+            await service.disconnect()
+
+    assert events[0].input_transcription == FAST.input_transcript
+    audio = b"".join(event.audio for event in events if event.audio)
+    assert len(audio) == 3 * 960 * 2  # 3 chunks of 40 ms at 24 kHz
+    assert events[-1].turn_complete
+    assert server.stats.audio_bytes == 1024
+    assert server.stats.activity_starts == 1
+    assert server.stats.activity_ends == 1
+    assert server.stats.turns_completed == 1
+    assert server.stats.setups[0]["model"].endswith("gemini-2.0-flash-exp")
+
+
+async def test_text_turn_round_trip(mock_gemini_api_key, mocker):
+    """Test that a text message is answered like a voice turn"""
+    async with FakeLiveServer(FAST) as server:
+        _point_at(mocker, server)
+        service = GeminiLiveService()
+        await service.connect()
+        try:
+            await service.send_text("hola")
+            events = await asyncio.wait_for(_collect_turn(service), timeout=5)
+        finally:
+            await service.disconnect()
+
+    assert events[-1].turn_complete
+    assert server.stats.text_turns == 1
+
+
+async def test_activity_start_interrupts_response(mock_gemini_api_key, mocker):
+    """Test that speaking over the model cancels the response with interrupted"""
+    config = FakeLiveConfig(
+        turn_delay_ms=0, response_audio_ms=5000, audio_chunk_ms=40, chunk_interval_ms=40
+    )
+    async with FakeLiveServer(config) as server:
+        _point_at(mocker, server)
+        service = GeminiLiveService()
+        await service.connect()
+        try:
+            await service.send_activity_start()
+            await service.send_activity_end()
+            events = []
+
+            async def barge_in() -> None:
+                async for event in service.receive_responses():
+                    events.append(event)
+                    if event.audio and len(events) >= 3:
+                        await service.send_activity_start()
+                    if event.interrupted or event.turn_complete:
+                        return
+
+            await asyncio.wait_for(barge_in(), timeout=5)
+        finally:
+            await service.disconnect()
+
+    assert events[-1].interrupted
+    assert server.stats.interruptions == 1
+    assert server.stats.turns_completed == 0
+
+
+async def test_injected_setup_failure(mock_gemini_api_key, mocker):
+    """Test that an injected setup failure surfaces as GeminiAPIError"""
+    async with FakeLiveServer(FakeLiveConfig(setup_failure_rate=1.0)) as server:
+        _point_at(mocker, server)
+        service = GeminiLiveService()
+        with pytest.raises(GeminiAPIError):
+            await service.connect()
+
+    assert server.stats.setup_failures == 1
+
+
+async def test_go_away_is_sent(mock_gemini_api_key, mocker):
+    """Test that goAway reaches the SDK session with its time left"""
+    config = FakeLiveConfig(go_away_after_seconds=0.05, go_away_time_left_seconds=1)
+    async with FakeLiveServer(config) as server:
+        _point_at(mocker, server)
+        service = GeminiLiveService()
+        await service.connect()
+        try:
+            message = await asyncio.wait_for(
+                anext(service.session.receive()), timeout=5
+            )
+        finally:
+            await service.disconnect()
+
+    assert message.go_away is not None
+    assert server.stats.go_aways == 1
+
+
+async def test_service_resumes_after_dropped_connection(mock_gemini_api_key, mocker):
+    """Test that a dropped Live session is resumed with its handle mid-call"""
+    mocker.patch("app.services.gemini_live.settings.session_resumption_enabled", True)
+    async with FakeLiveServer(FAST) as server:
+        _point_at(mocker, server)
+        service = GeminiLiveService()
+        await service.connect()
+        try:
+            await service.send_activity_start()
+            await service.send_audio(b"\x10\x00" * 512)
+            await service.send_activity_end()
+            await asyncio.wait_for(_collect_turn(service), timeout=5)
+
+            responses = service.receive_responses()
+            next_event = asyncio.ensure_future(anext(responses))
+            await asyncio.sleep(0.05)
+            server.drop_connections()
+            await service.send_activity_start()
+            await service.send_audio(b"\x10\x00" * 512)
+            await service.send_activity_end()
+            first = await asyncio.wait_for(next_event, timeout=5)
+            await responses.aclose()
+        finally:
+            await service.disconnect()
+
+    assert first.input_transcription == FAST.input_transcript
+    assert server.stats.sessions == 2
+    assert server.stats.resumed_sessions == 1
+    assert server.stats.setups[1]["sessionResumption"]["handle"] == "fake-handle-2"
+    assert server.stats.activity_starts == 2
+
+
+async def _wait_for(condition, timeout: float = 5.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("resumption", [False, True])
+async def test_service_rolls_over_on_go_away(mock_gemini_api_key, mocker, resumption):
+    """Test that goAway moves an idle call to a successor session"""
+    from app.services.metrics import UPSTREAM_ROLLOVERS
+
+    mocker.patch("app.services.gemini_live.settings.session_rollover_enabled", True)
+    mocker.patch(
+        "app.services.gemini_live.settings.session_resumption_enabled", resumption
+    )
+    config = FakeLiveConfig(
+        turn_delay_ms=10,
+        response_audio_ms=120,
+        chunk_interval_ms=0,
+        go_away_after_seconds=0.05,
+        go_away_time_left_seconds=5,
+    )
+    rollovers = UPSTREAM_ROLLOVERS.labels("go_away").value
+    async with FakeLiveServer(config) as server:
+        _point_at(mocker, server)
+        service = GeminiLiveService()
+        await service.connect()
+        events = []
+
+        async def consume() -> None:
+            async for event in service.receive_responses():
+                events.append(event)
+
+        consumer = asyncio.create_task(consume())
+        try:
+            await _wait_for(
+                lambda: UPSTREAM_ROLLOVERS.labels("go_away").value > rollovers
+            )
+            await _wait_for(lambda: server.stats.active_sessions == 1)
+            await service.send_activity_start()
+            await service.send_audio(b"\x10\x00" * 512)
+            await service.send_activity_end()
+            await _wait_for(lambda: any(event.turn_complete for event in events))
+        finally:
+            consumer.cancel()
+            await service.disconnect()
+
+    assert server.stats.sessions == 2
+    assert server.stats.go_aways == 1
+    assert events[0].input_transcription == config.input_transcript
+    handle = server.stats.setups[1].get("sessionResumption", {}).get("handle")
+    assert handle == ("fake-handle-1" if resumption else None)
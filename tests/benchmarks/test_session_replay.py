@@ -0,0 +1,81 @@
+"""
+Tests for session replay
+"""
+
+from unittest.mock import AsyncMock
+
+from google.genai import types
+
+from app.services.session_recorder import RecordKind, SessionRecorder
+from benchmarks.session_replay import Recording, replay_session, replay_uplink
+
+FRAME = b"\x10\x00" * 512
+
+
+def audio_message(data: bytes) -> types.LiveServerMessage:
+    return types.LiveServerMessage(
+        server_content=types.LiveServerContent(
+            model_turn=types.Content(
+                parts=[types.Part(inline_data=types.Blob(data=data))]
+            )
+        )
+    )
+
+
+async def make_recording(tmp_path) -> Recording:
+    recorder = SessionRecorder(tmp_path / "session.glrec")
+    recorder.open({"model": "test-model"})
+    recorder.record(RecordKind.CONTROL, {"type": "activity_start", "source": "client"})
+    for _ in range(3):
+        recorder.record(RecordKind.AUDIO_IN, FRAME)
+    recorder.record(RecordKind.CONTROL, {"type": "activity_end", "source": "client"})
+    recorder.record(RecordKind.CONTROL, {"type": "activity_end", "source": "vad"})
+    recorder.record(RecordKind.SERVER_MESSAGE, audio_message(b"\x01\x00" * 240))
+    recorder.record(
+        RecordKind.SERVER_MESSAGE,
+        types.LiveServerMessage(
+            server_content=types.LiveServerContent(turn_complete=True)
+        ),
+    )
+    await recorder.close()
+    return Recording.load(recorder.path)
+
+
+async def test_recording_splits_directions(tmp_path):
+    """Test that VAD-generated signals are left for the service to regenerate"""
+    recording = await make_recording(tmp_path)
+
+    assert recording.metadata["model"] == "test-model"
+    assert len(recording.uplink) == 5
+    assert len(recording.downlink) == 2
+
+
+async def test_replay_uplink_drives_service(tmp_path, mocker):
+    """Test that recorded input is fed to the service in order"""
+    recording = await make_recording(tmp_path)
+    service = mocker.Mock()
+    service.send_audio = AsyncMock()
+    service.send_activity_start = AsyncMock()
+    service.send_activity_end = AsyncMock()
+
+    sent = await replay_uplink(service, recording, speed=0)
+
+    assert sent == 5
+    assert service.send_audio.await_count == 3
+    service.send_activity_start.assert_awaited_once()
+    service.send_activity_end.assert_awaited_once()
+
+
+async def test_replay_against_recorded_upstream(mock_gemini_api_key, tmp_path):
+    """Test that a full replay gets the recorded answers through the service"""
+    recording = await make_recording(tmp_path)
+
+    result = await replay_session(recording, speed=0, upstream="fake")
+
+    assert result["turns"] == 1
+    assert result["audio_bytes_out"] == 480
+    assert result["upstream_sent"] == {
+        "activity_start": 1,
+        "audio": 3,
+        "activity_end": 1,
+    }
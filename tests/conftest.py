@@ -15,6 +15,15 @@ os.environ["GEMINI_API_KEY"] = "test-api-key-for-testing"
 from main import app  # noqa: E402
 
 
+@pytest.fixture(autouse=True)
+def reset_client_pool():
+    """Give every test a fresh shared GenAI client registry"""
+    from app.services.client_pool import client_pool
+
+    yield
+    client_pool.clear()
+
+
 @pytest.fixture
 def test_client() -> TestClient:
     """Synchronous test client for FastAPI"""
@@ -78,6 +87,23 @@ def mock_genai_client(mocker):
     return mock_client, mock_session
 
 
+@pytest.fixture
+def next_live_session(mocker):
+    """Makes a service's next connect (resume, reopen) return a fresh mock session"""
+    from unittest.mock import AsyncMock
+
+    def patch_connect(service):
+        new_session = AsyncMock()
+        context_manager = AsyncMock()
+        context_manager.__aenter__.return_value = new_session
+        connect = mocker.patch.object(
+            service.client.aio.live, "connect", return_value=context_manager
+        )
+        return connect, new_session
+
+    return patch_connect
+
+
 @pytest.fixture
 def audio_test_data():
     """Provide test audio data of various sizes"""
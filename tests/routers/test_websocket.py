@@ -2,10 +2,12 @@
 
 import asyncio
 import logging
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from app.services.live_events import LiveEvent
+
 
 def test_websocket_connection_accepts(test_client, mocker):
     """Test WebSocket accepts connections"""
@@ -15,7 +17,7 @@ def test_websocket_connection_accepts(test_client, mocker):
     mock_instance.disconnect.return_value = None
 
     async def empty_generator():
-        return
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
         yield
 
     mock_instance.receive_responses = lambda: empty_generator()
@@ -27,6 +29,25 @@ def test_websocket_connection_accepts(test_client, mocker):
         assert "Connected to Gemini" in data["message"]
 
 
+def test_websocket_status_announces_server_lookback(test_client, mocker):
+    """Test that the status tells clients the server keeps pre-speech audio"""
+    mocker.patch("app.routers.websocket.settings.pre_speech_lookback_ms", 400.0)
+    mock_service_class = mocker.patch("app.routers.websocket.GeminiLiveService")
+    mock_instance = AsyncMock()
+
+    async def empty_generator():
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
+        yield
+
+    mock_instance.receive_responses = lambda: empty_generator()
+    mock_service_class.return_value = mock_instance
+
+    with test_client.websocket_connect("/ws") as websocket:
+        data = websocket.receive_json()
+
+    assert data["lookback_ms"] == 400.0
+
+
 def test_websocket_connection_initializes_gemini(test_client, mocker):
     """Test WebSocket initializes Gemini service"""
     mock_service_class = mocker.patch("app.routers.websocket.GeminiLiveService")
@@ -35,7 +56,7 @@ def test_websocket_connection_initializes_gemini(test_client, mocker):
     mock_instance.disconnect.return_value = None
 
     async def empty_generator():
-        return
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
         yield
 
     mock_instance.receive_responses = lambda: empty_generator()
@@ -56,7 +77,7 @@ def test_websocket_receives_audio_bytes(test_client, mocker):
     mock_instance.send_audio = AsyncMock()
 
     async def empty_generator():
-        return
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
         yield
 
     mock_instance.receive_responses = lambda: empty_generator()
@@ -115,7 +136,7 @@ def test_websocket_handles_text_message(test_client, mocker):
     mock_instance.send_text = AsyncMock()
 
     async def empty_generator():
-        return
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
         yield
 
     mock_instance.receive_responses = lambda: empty_generator()
@@ -167,7 +188,7 @@ def test_websocket_handles_activity_start(test_client, mocker):
     mock_instance.send_activity_start = AsyncMock()
 
     async def empty_generator():
-        return
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
         yield
 
     mock_instance.receive_responses = lambda: empty_generator()
@@ -194,7 +215,7 @@ def test_websocket_handles_activity_end(test_client, mocker):
     mock_instance.send_activity_end = AsyncMock()
 
     async def empty_generator():
-        return
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
         yield
 
     mock_instance.receive_responses = lambda: empty_generator()
@@ -212,6 +233,83 @@ def test_websocket_handles_activity_end(test_client, mocker):
     mock_instance.send_activity_end.assert_called_once()
 
 
+def test_websocket_handles_activity_cancel(test_client, mocker):
+    """Test WebSocket forwards VAD activity_cancel (misfire) to the service"""
+    mock_service_class = mocker.patch("app.routers.websocket.GeminiLiveService")
+    mock_instance = AsyncMock()
+    mock_instance.connect.return_value = True
+    mock_instance.disconnect.return_value = None
+    mock_instance.send_activity_cancel = AsyncMock()
+
+    async def empty_generator():
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
+        yield
+
+    mock_instance.receive_responses = lambda: empty_generator()
+    mock_service_class.return_value = mock_instance
+
+    with test_client.websocket_connect("/ws") as websocket:
+        websocket.receive_json()
+
+        websocket.send_json({"type": "activity_cancel"})
+
+        import time
+
+        time.sleep(0.1)
+
+    mock_instance.send_activity_cancel.assert_called_once()
+
+
+def test_websocket_forwards_speech_hints(test_client, mocker):
+    """Test WebSocket passes speech_probable hints on to the service"""
+    mocker.patch("app.routers.websocket.settings.hibernate_idle_seconds", 30.0)
+    mock_service_class = mocker.patch("app.routers.websocket.GeminiLiveService")
+    mock_instance = AsyncMock()
+    mock_instance.expect_speech = Mock()
+
+    async def empty_generator():
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
+        yield
+
+    mock_instance.receive_responses = lambda: empty_generator()
+    mock_service_class.return_value = mock_instance
+
+    with test_client.websocket_connect("/ws") as websocket:
+        status = websocket.receive_json()
+
+        websocket.send_json({"type": "speech_probable"})
+
+        import time
+
+        time.sleep(0.1)
+
+    assert status["speech_hints"] is True
+    mock_instance.expect_speech.assert_called_once_with()
+
+
+def test_websocket_lazy_connect_defers_the_upstream(test_client, mocker):
+    """Test WebSocket accepts the call without connecting in lazy mode"""
+    mocker.patch("app.routers.websocket.settings.lazy_connect_enabled", True)
+    mock_service_class = mocker.patch("app.routers.websocket.GeminiLiveService")
+    mock_instance = AsyncMock()
+    mock_instance.defer_connect = Mock()
+
+    async def empty_generator():
+        await asyncio.Event().wait()  # Waiting for the first turn to connect
+        yield
+
+    mock_instance.receive_responses = lambda: empty_generator()
+    mock_service_class.return_value = mock_instance
+
+    with test_client.websocket_connect("/ws") as websocket:
+        status = websocket.receive_json()
+
+    assert status["type"] == "status"
+    mock_instance.defer_connect.assert_called_once_with()
+    mock_instance.connect.assert_not_called()
+    mock_instance.disconnect.assert_called_once()
+
+
 @pytest.mark.timeout(5)
 def test_websocket_forwards_model_state(test_client, mocker):
     """Test WebSocket forwards model state to browser"""
@@ -221,7 +319,7 @@ def test_websocket_forwards_model_state(test_client, mocker):
     mock_instance.disconnect.return_value = None
 
     async def mock_responses():
-        yield {"model_state": "speaking"}
+        yield LiveEvent(model_state="speaking")
         # Don't yield more to avoid infinite loop
 
     mock_instance.receive_responses = lambda: mock_responses()
@@ -244,7 +342,7 @@ def test_websocket_forwards_input_transcription(test_client, mocker):
     mock_instance.disconnect.return_value = None
 
     async def mock_responses():
-        yield {"input_transcription": "User said this"}
+        yield LiveEvent(input_transcription="User said this")
 
     mock_instance.receive_responses = lambda: mock_responses()
     mock_service_class.return_value = mock_instance
@@ -266,7 +364,7 @@ def test_websocket_forwards_output_transcription(test_client, mocker):
     mock_instance.disconnect.return_value = None
 
     async def mock_responses():
-        yield {"output_transcription": "AI response"}
+        yield LiveEvent(output_transcription="AI response")
 
     mock_instance.receive_responses = lambda: mock_responses()
     mock_service_class.return_value = mock_instance
@@ -290,7 +388,7 @@ def test_websocket_forwards_audio_bytes(test_client, mocker):
     audio_bytes = b"response audio"
 
     async def mock_responses():
-        yield {"audio": audio_bytes}
+        yield LiveEvent(audio=audio_bytes)
 
     mock_instance.receive_responses = lambda: mock_responses()
     mock_service_class.return_value = mock_instance
@@ -311,7 +409,7 @@ def test_websocket_forwards_turn_complete(test_client, mocker):
     mock_instance.disconnect.return_value = None
 
     async def mock_responses():
-        yield {"turn_complete": True}
+        yield LiveEvent(turn_complete=True)
 
     mock_instance.receive_responses = lambda: mock_responses()
     mock_service_class.return_value = mock_instance
@@ -332,7 +430,7 @@ def test_websocket_forwards_interrupted_signal(test_client, mocker):
     mock_instance.disconnect.return_value = None
 
     async def mock_responses():
-        yield {"interrupted": True}
+        yield LiveEvent(interrupted=True)
 
     mock_instance.receive_responses = lambda: mock_responses()
     mock_service_class.return_value = mock_instance
@@ -410,7 +508,7 @@ def test_websocket_handles_disconnection(test_client, mocker):
     mock_instance.disconnect.return_value = None
 
     async def empty_generator():
-        return
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
         yield
 
     mock_instance.receive_responses = lambda: empty_generator()
@@ -476,12 +574,12 @@ def test_websocket_multiple_response_types_in_sequence(test_client, mocker):
     mock_instance.disconnect.return_value = None
 
     async def mock_responses():
-        yield {"model_state": "listening"}
-        yield {"input_transcription": "Hello"}
-        yield {"model_state": "speaking"}
-        yield {"output_transcription": "Hi there"}
-        yield {"audio": b"audio_data"}
-        yield {"turn_complete": True}
+        yield LiveEvent(model_state="listening")
+        yield LiveEvent(input_transcription="Hello")
+        yield LiveEvent(model_state="speaking")
+        yield LiveEvent(output_transcription="Hi there")
+        yield LiveEvent(audio=b"audio_data")
+        yield LiveEvent(turn_complete=True)
 
     mock_instance.receive_responses = lambda: mock_responses()
     mock_service_class.return_value = mock_instance
@@ -506,3 +604,214 @@ def test_websocket_multiple_response_types_in_sequence(test_client, mocker):
 
         msg5 = websocket.receive_json()
         assert msg5["type"] == "turn_complete"
+
+
+def test_websocket_forwards_uplink_in_order(test_client, mocker):
+    """Test that control messages and audio reach Gemini in browser order"""
+    mock_service_class = mocker.patch("app.routers.websocket.GeminiLiveService")
+    mock_instance = AsyncMock()
+    mock_instance.connect.return_value = True
+    mock_instance.disconnect.return_value = None
+
+    async def empty_generator():
+        await asyncio.sleep(0.5)
+        return
+        yield
+
+    mock_instance.receive_responses = lambda: empty_generator()
+    mock_service_class.return_value = mock_instance
+
+    with test_client.websocket_connect("/ws") as websocket:
+        websocket.receive_json()
+
+        websocket.send_json({"type": "activity_start"})
+        websocket.send_bytes(b"audio")
+        websocket.send_json({"type": "activity_end"})
+
+        import time
+
+        time.sleep(0.1)
+
+    called = [
+        name
+        for name, *_ in mock_instance.method_calls
+        if name in ("send_activity_start", "send_audio", "send_activity_end")
+    ]
+    assert called == ["send_activity_start", "send_audio", "send_activity_end"]
+
+
+@pytest.mark.timeout(5)
+def test_websocket_merges_queued_transcription_deltas(test_client, mocker):
+    """Test that transcription deltas queued behind a slow write are merged"""
+    mock_service_class = mocker.patch("app.routers.websocket.GeminiLiveService")
+    mock_instance = AsyncMock()
+    mock_instance.connect.return_value = True
+    mock_instance.disconnect.return_value = None
+
+    async def mock_responses():
+        yield LiveEvent(output_transcription="Hel")
+        yield LiveEvent(output_transcription="lo")
+        yield LiveEvent(turn_complete=True)
+
+    mock_instance.receive_responses = lambda: mock_responses()
+    mock_service_class.return_value = mock_instance
+
+    with test_client.websocket_connect("/ws") as websocket:
+        websocket.receive_json()
+
+        texts = []
+        while True:
+            message = websocket.receive_json()
+            if message["type"] == "turn_complete":
+                break
+            texts.append(message["text"])
+
+    assert "".join(texts) == "Hello"
+
+
+class DroppingBrowser:
+    """Browser that sends a few audio frames and hangs up"""
+
+    def __init__(self, frames: int) -> None:
+        self.frames = frames
+
+    async def accept(self) -> None:
+        return None
+
+    async def receive(self) -> dict:
+        from fastapi import WebSocketDisconnect
+
+        await asyncio.sleep(0)
+        if not self.frames:
+            raise WebSocketDisconnect(1000)
+        self.frames -= 1
+        return {"bytes": bytes(1024)}
+
+    async def send_json(self, _data) -> None:
+        return None
+
+    async def send_bytes(self, _data) -> None:
+        return None
+
+
+class IdleUpstreamService:
+    """GeminiLiveService stand-in: the upstream stays open and silent"""
+
+    open_sessions = 0
+
+    async def connect(self) -> bool:
+        IdleUpstreamService.open_sessions += 1
+        return True
+
+    async def disconnect(self) -> None:
+        IdleUpstreamService.open_sessions -= 1
+
+    async def send_audio(self, _audio_data) -> None:
+        return None
+
+    async def receive_responses(self):
+        await asyncio.Event().wait()
+        yield
+
+
+@pytest.mark.timeout(60)
+async def test_dropped_connections_leave_no_sessions_or_tasks(mocker):
+    """Test that thousands of hung-up calls release every session and task"""
+    from app.routers.websocket import websocket_endpoint
+    from app.services.metrics import ACTIVE_SESSIONS
+
+    mocker.patch("app.routers.websocket.GeminiLiveService", IdleUpstreamService)
+    tasks_before = asyncio.all_tasks()
+    active_before = ACTIVE_SESSIONS.labels().value
+
+    calls = [websocket_endpoint(DroppingBrowser(index % 5)) for index in range(3000)]
+    await asyncio.wait_for(asyncio.gather(*calls), timeout=30)
+
+    assert IdleUpstreamService.open_sessions == 0
+    assert ACTIVE_SESSIONS.labels().value == active_before
+    assert asyncio.all_tasks() == tasks_before
+
+
+async def test_failing_task_cancels_the_rest():
+    """Test that an error in one bridge task cancels the others and propagates"""
+    from app.routers.websocket import run_until_first_done
+
+    cancelled = asyncio.Event()
+
+    async def fails() -> None:
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream failed")
+
+    async def waits() -> None:
+        try:
+            await asyncio.Event().wait()
+        finally:
+            cancelled.set()
+
+    with pytest.raises(RuntimeError, match="upstream failed"):
+        await run_until_first_done(waits(), background=[fails()])
+
+    assert cancelled.is_set()
+
+
+@pytest.mark.timeout(10)
+def test_browser_reattaches_and_gets_missed_messages(mocker):
+    """Test that a reconnecting browser keeps its call and gets what it missed"""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    mocker.patch("app.routers.websocket.settings.reattach_grace_seconds", 5.0)
+    mock_service_class = mocker.patch("app.routers.websocket.GeminiLiveService")
+    mock_instance = AsyncMock()
+
+    async def mock_responses():
+        yield LiveEvent(model_state="speaking")
+        yield LiveEvent(output_transcription="Hola")
+        await asyncio.Event().wait()
+
+    mock_instance.receive_responses = lambda: mock_responses()
+    mock_service_class.return_value = mock_instance
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as websocket:
+            status = websocket.receive_json()
+            websocket.receive_json()
+            websocket.receive_json()  # Got two messages, acknowledged one
+            websocket.close(code=4000)  # Dropped, not hung up
+
+        token = status["session"]
+        with client.websocket_connect(f"/ws?session={token}&last_seq=1") as websocket:
+            resumed = websocket.receive_json()
+            missed = websocket.receive_json()
+
+        mock_instance.disconnect.assert_called_once()
+
+    assert status["resumed"] is False
+    assert resumed["resumed"] is True
+    assert resumed["seq"] == 1
+    assert missed == {"type": "output_transcription", "text": "Hola"}
+    mock_service_class.assert_called_once()
+
+
+@pytest.mark.timeout(10)
+def test_unknown_session_token_starts_a_new_call(test_client, mocker):
+    """Test that a token of no live call gets a fresh session"""
+    mocker.patch("app.routers.websocket.settings.reattach_grace_seconds", 5.0)
+    mock_service_class = mocker.patch("app.routers.websocket.GeminiLiveService")
+    mock_instance = AsyncMock()
+
+    async def empty_generator():
+        await asyncio.Event().wait()  # Idle upstream: open, but no responses
+        yield
+
+    mock_instance.receive_responses = lambda: empty_generator()
+    mock_service_class.return_value = mock_instance
+
+    with test_client.websocket_connect("/ws?session=expired&last_seq=7") as websocket:
+        status = websocket.receive_json()
+
+    assert status["resumed"] is False
+    assert status["session"] != "expired"
+    mock_instance.connect.assert_called_once()
+    mock_instance.disconnect.assert_called_once()
@@ -0,0 +1,207 @@
+"""
+Tests for the upstream audio coalescer
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.audio_coalescer import AudioCoalescer
+
+
+def copying_send() -> AsyncMock:
+    """send mock keeping a copy of each chunk (views are reused after send)"""
+    send = AsyncMock(side_effect=lambda chunk: send.chunks.append(bytes(chunk)))
+    send.chunks = []
+    return send
+
+
+@pytest.mark.asyncio
+async def test_frames_below_target_are_held():
+    """Test that frames are buffered until the target size"""
+    send = AsyncMock()
+    coalescer = AudioCoalescer(send, target_bytes=4096, max_hold_ms=1000)
+
+    await coalescer.add(b"\x01" * 1024)
+    await coalescer.add(b"\x02" * 1024)
+
+    send.assert_not_called()
+    assert coalescer.pending_bytes == 2048
+    coalescer.close()
+
+
+@pytest.mark.asyncio
+async def test_target_size_triggers_single_chunk():
+    """Test that reaching the target sends one merged chunk"""
+    send = copying_send()
+    coalescer = AudioCoalescer(send, target_bytes=4096, max_hold_ms=1000)
+
+    for i in range(4):
+        await coalescer.add(bytes([i]) * 1024)
+
+    send.assert_awaited_once()
+    (chunk,) = send.chunks
+    assert len(chunk) == 4096
+    assert chunk[:1024] == b"\x00" * 1024
+    assert chunk[-1024:] == b"\x03" * 1024
+    assert coalescer.pending_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_odd_length_frames_carry_over():
+    """Test that a trailing odd byte stays buffered for the next chunk"""
+    send = copying_send()
+    coalescer = AudioCoalescer(send, target_bytes=8, max_hold_ms=1000)
+
+    await coalescer.add(b"abcde")
+    await coalescer.add(b"fghi")
+
+    assert send.chunks == [b"abcdefgh"]
+    assert coalescer.pending_bytes == 1
+
+    await coalescer.add(b"j")
+    await coalescer.flush()
+
+    assert send.chunks[-1] == b"ij"
+
+
+@pytest.mark.asyncio
+async def test_flush_skips_single_byte():
+    """Test that flush never sends half a sample"""
+    send = AsyncMock()
+    coalescer = AudioCoalescer(send, target_bytes=8, max_hold_ms=1000)
+
+    await coalescer.add(b"x")
+    await coalescer.flush()
+
+    send.assert_not_called()
+    assert coalescer.pending_bytes == 1
+    coalescer.close()
+
+
+@pytest.mark.asyncio
+async def test_max_hold_time_flushes_partial_chunk():
+    """Test that the deadline sends held audio without new frames"""
+    send = copying_send()
+    coalescer = AudioCoalescer(send, target_bytes=4096, max_hold_ms=20)
+
+    await coalescer.add(b"\x01" * 1024)
+    await asyncio.sleep(0.05)
+
+    assert send.chunks == [b"\x01" * 1024]
+
+
+@pytest.mark.asyncio
+async def test_frames_added_during_send_are_kept():
+    """Test that audio arriving while a chunk is in flight is not lost"""
+    chunks: list[bytes] = []
+    release = asyncio.Event()
+
+    async def send(chunk):
+        chunks.append(bytes(chunk))
+        await release.wait()
+
+    coalescer = AudioCoalescer(send, target_bytes=8, max_hold_ms=1000)
+    first = asyncio.create_task(coalescer.add(b"\x01" * 9))
+    await asyncio.sleep(0)
+    # Large enough to replace the buffer while its view is being sent
+    second = asyncio.create_task(coalescer.add(b"\x02" * 20000))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert chunks == [b"\x01" * 8, b"\x01" + b"\x02" * 19999]
+    assert coalescer.pending_bytes == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_flush_errors_are_logged(caplog):
+    """Test that a failing deadline flush does not crash the loop"""
+    send = AsyncMock(side_effect=Exception("upstream closed"))
+    coalescer = AudioCoalescer(send, target_bytes=4096, max_hold_ms=10)
+
+    await coalescer.add(b"\x01" * 64)
+    await asyncio.sleep(0.03)
+
+    assert "Error flushing coalesced audio" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_close_drops_buffer_and_timer():
+    """Test that close discards pending audio"""
+    send = AsyncMock()
+    coalescer = AudioCoalescer(send, target_bytes=4096, max_hold_ms=10)
+
+    await coalescer.add(b"\x01" * 64)
+    coalescer.close()
+    await asyncio.sleep(0.03)
+
+    send.assert_not_called()
+    assert coalescer.pending_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_report_reduction_ratio():
+    """Test frame/chunk counters"""
+    send = AsyncMock()
+    coalescer = AudioCoalescer(send, target_bytes=4096, max_hold_ms=1000)
+
+    for _ in range(8):
+        await coalescer.add(b"\x00" * 1024)
+
+    stats = coalescer.stats()
+    assert stats["frames_in"] == 8
+    assert stats["chunks_out"] == 2
+    assert stats["reduction_ratio"] == 4.0
+
+
+def test_target_bytes_aligned_to_samples():
+    """Test that an odd target is rounded down to whole samples"""
+    coalescer = AudioCoalescer(AsyncMock(), target_bytes=1025, max_hold_ms=10)
+    assert coalescer.target_bytes == 1024
+
+
+# GeminiLiveService integration
+
+
+@pytest.fixture
+def coalescing_service(mock_gemini_api_key, mocker):
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.audio_coalesce_enabled", True)
+    mocker.patch("app.services.gemini_live.settings.audio_coalesce_frames", 4)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_service_coalesces_frames(coalescing_service):
+    """Test that send_audio merges 4 frames of 512 samples per message"""
+    for _ in range(8):
+        await coalescing_service.send_audio(b"\x00" * 1024)
+
+    assert coalescing_service.session.send_realtime_input.await_count == 2
+    assert coalescing_service._total_audio_bytes == 8192
+
+
+@pytest.mark.asyncio
+async def test_service_activity_end_flushes_first(coalescing_service):
+    """Test that held audio is sent before the activity_end signal"""
+    await coalescing_service.send_audio(b"\x00" * 1024)
+    await coalescing_service.send_activity_end()
+
+    calls = coalescing_service.session.send_realtime_input.await_args_list
+    assert len(calls) == 2
+    assert "audio" in calls[0].kwargs
+    assert "activity_end" in calls[1].kwargs
+
+
+@pytest.mark.asyncio
+async def test_service_disconnect_closes_coalescer(coalescing_service):
+    """Test that disconnect drops audio that was never sent"""
+    await coalescing_service.send_audio(b"\x00" * 1024)
+    await coalescing_service.disconnect()
+
+    assert coalescing_service._coalescer.pending_bytes == 0
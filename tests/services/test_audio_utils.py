@@ -0,0 +1,29 @@
+"""
+Tests for PCM audio helpers
+"""
+
+import pytest
+
+from app.services.audio_utils import pcm16_rms, pcm16_samples
+
+
+def test_pcm16_samples_ignores_trailing_odd_byte():
+    """Test that misaligned buffers are truncated to whole samples"""
+    samples = pcm16_samples(b"\x01\x00\x02\x00\x03")
+
+    assert samples.tolist() == [1, 2]
+
+
+def test_pcm16_rms_of_silence_and_empty():
+    """Test RMS of zeros and of an empty buffer"""
+    assert pcm16_rms(b"\x00\x00" * 100) == 0.0
+    assert pcm16_rms(b"") == 0.0
+
+
+def test_pcm16_rms_of_square_wave():
+    """Test RMS of a constant-amplitude signal"""
+    data = (1000).to_bytes(2, "little", signed=True) + (-1000).to_bytes(
+        2, "little", signed=True
+    )
+
+    assert pcm16_rms(data * 50) == pytest.approx(1000.0)
@@ -0,0 +1,99 @@
+"""
+Tests for reattachable calls
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.call_bridge import (
+    BrowserReplacedError,
+    CallBridgeRegistry,
+    bridge_totals,
+)
+from app.services.downlink_queue import DownlinkQueue
+from app.services.metrics import ACTIVE_SESSIONS
+from app.services.uplink_queue import UplinkQueue
+
+
+async def idle() -> None:
+    await asyncio.Event().wait()
+
+
+def open_bridge(registry: CallBridgeRegistry, grace_seconds: float = 5.0):
+    bridge = registry.open(
+        AsyncMock(),
+        UplinkQueue(maxsize=10),
+        DownlinkQueue(maxsize=10, slow_depth=5, slow_send_ms=100.0),
+        grace_seconds,
+    )
+    bridge.start(idle)
+    ACTIVE_SESSIONS.inc()  # As /ws does for the call; close() releases it
+    return bridge
+
+
+async def test_claim_returns_open_calls_by_token():
+    """Test that only the token of a live call is claimed"""
+    registry = CallBridgeRegistry()
+    bridge = open_bridge(registry)
+
+    assert registry.claim(bridge.token) is bridge
+    assert registry.claim("unknown") is None
+    assert registry.claim(None) is None
+
+    await bridge.close()
+    assert registry.claim(bridge.token) is None
+
+
+async def test_detached_call_ends_after_grace_period():
+    """Test that a call whose browser does not return is closed"""
+    registry = CallBridgeRegistry()
+    bridge = open_bridge(registry, grace_seconds=0.01)
+    expired = bridge_totals.expired
+    connection = await bridge.attach()
+    bridge.release()
+
+    bridge.detach(connection)
+    await asyncio.sleep(0.05)
+
+    assert bridge.closed
+    assert bridge.upstream.cancelled()
+    bridge.service.disconnect.assert_awaited_once()
+    assert bridge_totals.expired == expired + 1
+    assert registry.stats()["calls"] == 0
+
+
+async def test_reattach_cancels_the_grace_period():
+    """Test that a browser coming back in time keeps the call"""
+    registry = CallBridgeRegistry()
+    bridge = open_bridge(registry, grace_seconds=0.01)
+    connection = await bridge.attach()
+    bridge.release()
+    bridge.detach(connection)
+    assert registry.stats()["detached_calls"] == 1
+
+    await bridge.attach()
+    await asyncio.sleep(0.05)
+
+    assert not bridge.closed
+    assert registry.stats()["detached_calls"] == 0
+    await bridge.close()
+
+
+async def test_new_connection_replaces_the_attached_one():
+    """Test that the previous connection of a call is told to stop"""
+    registry = CallBridgeRegistry()
+    bridge = open_bridge(registry)
+    first = await bridge.attach()
+    watcher = asyncio.ensure_future(bridge.watch(first))
+    await asyncio.sleep(0)
+
+    second = asyncio.ensure_future(bridge.attach())
+    with pytest.raises(BrowserReplacedError):
+        await watcher
+    bridge.release()  # The first connection has stopped
+    await second
+
+    assert not bridge.detached
+    await bridge.close()
@@ -0,0 +1,116 @@
+"""
+Tests for the shared GenAI client registry
+"""
+
+import pytest
+
+from app.services.client_pool import GenAIClientPool
+from app.services.gemini_live import GeminiLiveService
+
+
+def test_pool_returns_same_client_for_same_key():
+    """Test that the same API key/model borrows the same client"""
+    pool = GenAIClientPool()
+
+    first = pool.get("key-a", "model-x")
+    second = pool.get("key-a", "model-x")
+
+    assert first is second
+
+
+def test_pool_separates_clients_by_key_and_model():
+    """Test that different API keys or models get distinct clients"""
+    pool = GenAIClientPool()
+
+    base = pool.get("key-a", "model-x")
+
+    assert pool.get("key-b", "model-x") is not base
+    assert pool.get("key-a", "model-y") is not base
+
+
+def test_pool_stats_track_reuse():
+    """Test created/borrowed/reused counters"""
+    pool = GenAIClientPool()
+
+    for _ in range(4):
+        pool.get("key-a", "model-x")
+    pool.get("key-b", "model-x")
+
+    stats = pool.stats()
+    assert stats["clients"] == 2
+    assert stats["created"] == 2
+    assert stats["borrowed"] == 5
+    assert stats["reused"] == 3
+    assert stats["reuse_ratio"] == pytest.approx(0.6)
+
+
+def test_pool_stats_empty():
+    """Test stats before any client is borrowed"""
+    stats = GenAIClientPool().stats()
+
+    assert stats["borrowed"] == 0
+    assert stats["reuse_ratio"] == 0.0
+
+
+def test_pool_clear_resets_state():
+    """Test that clear forgets clients and counters"""
+    pool = GenAIClientPool()
+    first = pool.get("key-a", "model-x")
+
+    pool.clear()
+
+    assert pool.stats()["created"] == 0
+    assert pool.get("key-a", "model-x") is not first
+
+
+@pytest.mark.asyncio
+async def test_pool_aclose_closes_clients(mocker):
+    """Test that aclose closes async and sync transports of every client"""
+    from unittest.mock import AsyncMock
+
+    pool = GenAIClientPool()
+    client = mocker.Mock()
+    client.aio.aclose = AsyncMock()
+    mocker.patch("app.services.client_pool.genai.Client", return_value=client)
+
+    pool.get("key-a", "model-x")
+    await pool.aclose()
+
+    client.aio.aclose.assert_awaited_once()
+    client.close.assert_called_once()
+    assert pool.stats()["clients"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_aclose_handles_errors(mocker, caplog):
+    """Test that a failing client does not abort shutdown"""
+    from unittest.mock import AsyncMock
+
+    pool = GenAIClientPool()
+    client = mocker.Mock()
+    client.aio.aclose = AsyncMock(side_effect=Exception("close failed"))
+    mocker.patch("app.services.client_pool.genai.Client", return_value=client)
+
+    pool.get("key-a", "model-x")
+    await pool.aclose()
+
+    assert "Error closing GenAI client" in caplog.text
+
+
+def test_services_share_pooled_client(mock_gemini_api_key):
+    """Test that GeminiLiveService instances borrow one shared client"""
+    first = GeminiLiveService()
+    second = GeminiLiveService()
+
+    assert first.client is second.client
+
+
+def test_pool_keys_clients_by_base_url():
+    """Test that a custom endpoint gets its own client with that base URL"""
+    pool = GenAIClientPool()
+
+    default = pool.get("key-a", "model-x")
+    custom = pool.get("key-a", "model-x", base_url="https://localhost:9443")
+
+    assert custom is not default
+    assert custom._api_client._http_options.base_url == "https://localhost:9443"
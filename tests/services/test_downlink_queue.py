@@ -0,0 +1,232 @@
+"""
+Tests for the outbound (downlink) queue
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.downlink_queue import (
+    DownlinkClosedError,
+    DownlinkQueue,
+    aggregate_stats,
+)
+
+
+def make_queue(**overrides) -> DownlinkQueue:
+    options = {"maxsize": 10, "slow_depth": 5, "slow_send_ms": 100.0}
+    options.update(overrides)
+    return DownlinkQueue(**options)
+
+
+async def drain(queue: DownlinkQueue) -> list:
+    messages = []
+    queue.close()
+    while True:
+        try:
+            messages.append((await queue.get()).message)
+        except DownlinkClosedError:
+            return messages
+
+
+@pytest.mark.asyncio
+async def test_messages_keep_order():
+    """Test FIFO order of JSON and audio messages"""
+    queue = make_queue()
+
+    await queue.put_json({"type": "model_state", "state": "speaking"})
+    await queue.put_audio(b"pcm")
+    await queue.put_json({"type": "turn_complete"})
+
+    assert await drain(queue) == [
+        {"type": "model_state", "state": "speaking"},
+        b"pcm",
+        {"type": "turn_complete"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_consecutive_transcriptions_are_merged():
+    """Test that queued transcription deltas of the same type are concatenated"""
+    queue = make_queue()
+
+    await queue.put_json({"type": "output_transcription", "text": "Hel"})
+    await queue.put_json({"type": "output_transcription", "text": "lo"})
+    await queue.put_json({"type": "input_transcription", "text": "Hi"})
+
+    assert await drain(queue) == [
+        {"type": "output_transcription", "text": "Hello"},
+        {"type": "input_transcription", "text": "Hi"},
+    ]
+    assert queue.merged == 1
+
+
+@pytest.mark.asyncio
+async def test_merging_can_be_disabled():
+    """Test that merge_transcriptions=False keeps every delta"""
+    queue = make_queue(merge_transcriptions=False)
+
+    await queue.put_json({"type": "output_transcription", "text": "Hel"})
+    await queue.put_json({"type": "output_transcription", "text": "lo"})
+
+    assert len(await drain(queue)) == 2
+
+
+@pytest.mark.asyncio
+async def test_interruption_drops_stale_audio():
+    """Test that queued audio is discarded when the model is interrupted"""
+    queue = make_queue()
+
+    await queue.put_audio(b"old-1")
+    await queue.put_json({"type": "output_transcription", "text": "partial"})
+    await queue.put_audio(b"old-2")
+    await queue.put_json({"type": "interrupted"})
+
+    assert await drain(queue) == [
+        {"type": "output_transcription", "text": "partial"},
+        {"type": "interrupted"},
+    ]
+    assert queue.dropped_audio == 2
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest_audio():
+    """Test the bounded size keeps JSON and evicts the oldest audio"""
+    queue = make_queue(maxsize=2, slow_depth=10)
+
+    await queue.put_json({"type": "turn_complete"})
+    await queue.put_audio(b"a1")
+    await queue.put_audio(b"a2")
+
+    assert await drain(queue) == [{"type": "turn_complete"}, b"a2"]
+    assert queue.dropped_audio == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_of_json_waits_for_the_writer():
+    """Test that JSON alone cannot grow the queue past maxsize"""
+    queue = make_queue(maxsize=2, slow_depth=10)
+    await queue.put_json({"type": "model_state", "state": "speaking"})
+    await queue.put_json({"type": "turn_complete"})
+
+    producer = asyncio.create_task(queue.put_json({"type": "pong"}))
+    await asyncio.sleep(0.01)
+    assert not producer.done()
+    assert queue.depth == 2
+
+    await queue.get()
+    await asyncio.wait_for(producer, timeout=1)
+    assert await drain(queue) == [{"type": "turn_complete"}, {"type": "pong"}]
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_detected_by_depth(caplog):
+    """Test that a growing backlog marks the consumer as slow"""
+    queue = make_queue(slow_depth=2)
+
+    for _ in range(3):
+        await queue.put_audio(b"pcm")
+
+    assert queue.slow is True
+    assert queue.slow_events == 1
+    assert "Slow browser consumer detected" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_detected_by_send_latency_and_recovers():
+    """Test slow detection from write latency and recovery once drained"""
+    queue = make_queue()
+    await queue.put_audio(b"pcm")
+    item = await queue.get()
+
+    queue.record_sent(item, send_seconds=0.5)
+    assert queue.slow is True
+
+    queue.record_sent(item, send_seconds=0.001)
+    assert queue.slow is False
+    assert queue.stats()["send_latency_ms_max"] == pytest.approx(500.0)
+
+
+@pytest.mark.asyncio
+async def test_get_waits_for_messages():
+    """Test that the writer wakes up when a message arrives"""
+    queue = make_queue()
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+
+    await queue.put_json({"type": "pong"})
+
+    item = await asyncio.wait_for(getter, timeout=1)
+    assert item.message == {"type": "pong"}
+
+
+@pytest.mark.asyncio
+async def test_closed_queue_ignores_puts():
+    """Test that messages after close are discarded"""
+    queue = make_queue()
+    queue.close()
+
+    await queue.put_json({"type": "pong"})
+    await queue.put_audio(b"pcm")
+
+    with pytest.raises(DownlinkClosedError):
+        await queue.get()
+
+
+@pytest.mark.asyncio
+async def test_lag_and_aggregate_stats():
+    """Test per-session lag and process-wide aggregation"""
+    queue = make_queue()
+    await queue.put_audio(b"pcm")
+    await asyncio.sleep(0.01)
+
+    assert queue.stats()["lag_ms"] >= 10.0
+    assert aggregate_stats()["lag_ms_max"] >= 10.0
+
+
+async def write_all(queue: DownlinkQueue) -> None:
+    queue.close()
+    while True:
+        try:
+            queue.record_sent(await queue.get(), 0.001)
+        except DownlinkClosedError:
+            return
+
+
+async def test_written_messages_are_numbered_for_replay():
+    """Test that replay returns the messages written after a sequence number"""
+    queue = make_queue(replay_bytes=1024)
+    for index in range(3):
+        await queue.put_json({"type": "model_state", "state": str(index)})
+    await write_all(queue)
+
+    items, missed = queue.replay(after=1)
+
+    assert [item.seq for item in items] == [2, 3]
+    assert [item.message["state"] for item in items] == ["1", "2"]
+    assert missed == 0
+
+
+async def test_replay_buffer_is_bounded():
+    """Test that the oldest written messages are evicted and reported as missed"""
+    queue = make_queue(maxsize=20, slow_depth=20, replay_bytes=1000)
+    for _ in range(4):
+        await queue.put_audio(bytes(400))
+    await write_all(queue)
+
+    items, missed = queue.replay(after=0)
+
+    assert [item.seq for item in items] == [3, 4]
+    assert missed == 2
+
+
+async def test_requeued_message_is_written_first():
+    """Test that a message the browser did not get goes back to the front"""
+    queue = make_queue()
+    await queue.put_json({"type": "turn_complete"})
+    await queue.put_json({"type": "pong"})
+    item = await queue.get()
+
+    queue.requeue(item)
+
+    assert await drain(queue) == [{"type": "turn_complete"}, {"type": "pong"}]
@@ -0,0 +1,176 @@
+"""
+Tests for the server-side periodic flush scheduler
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.flush_scheduler import FlushScheduler
+from app.services.pcm_ring_buffer import PcmRingBuffer
+
+QUIET = b"\x00\x00" * 512
+LOUD = b"\xff\x7f\x00\x80" * 256
+
+
+def make_scheduler(**overrides) -> FlushScheduler:
+    options = {
+        "interval_bytes": 4096,
+        "interval_seconds": 60.0,
+        "search_window_ms": 1000.0,
+        "silence_rms_threshold": 300.0,
+    }
+    options.update(overrides)
+    return FlushScheduler(**options)
+
+
+def test_no_flush_before_interval():
+    """Test that quiet frames do not flush before the interval is reached"""
+    scheduler = make_scheduler()
+
+    assert scheduler.should_flush(QUIET) is False
+    assert scheduler.should_flush(QUIET) is False
+
+
+def test_flush_waits_for_low_energy_frame():
+    """Test that a due flush is deferred until a quiet frame arrives"""
+    scheduler = make_scheduler()
+    for _ in range(4):
+        assert scheduler.should_flush(LOUD) is False
+
+    assert scheduler.should_flush(QUIET) is True
+    assert scheduler.forced_flushes == 0
+
+
+def test_flush_forced_after_search_window(mocker):
+    """Test that continuous loud audio is flushed after the search window"""
+    clock = mocker.patch("app.services.flush_scheduler.time.monotonic")
+    clock.return_value = 100.0
+    scheduler = make_scheduler(search_window_ms=500.0)
+    for _ in range(4):
+        scheduler.should_flush(LOUD)
+
+    clock.return_value = 100.6
+    assert scheduler.should_flush(LOUD) is True
+    assert scheduler.forced_flushes == 1
+
+
+def test_flush_due_by_elapsed_time(mocker):
+    """Test that the time threshold triggers a flush without enough bytes"""
+    clock = mocker.patch("app.services.flush_scheduler.time.monotonic")
+    clock.return_value = 0.0
+    scheduler = make_scheduler(interval_bytes=10**9, interval_seconds=15.0)
+
+    clock.return_value = 16.0
+    assert scheduler.should_flush(QUIET) is True
+
+
+def test_record_flush_restarts_accumulation():
+    """Test that counters restart after a flush"""
+    scheduler = make_scheduler()
+    for _ in range(4):
+        scheduler.should_flush(LOUD)
+
+    scheduler.record_flush()
+
+    assert scheduler.flushes == 1
+    assert scheduler.should_flush(QUIET) is False
+
+
+def test_transcription_latency_split_by_cause(mocker):
+    """Test latency tracking after flushes vs client activity_end"""
+    clock = mocker.patch("app.services.flush_scheduler.time.monotonic")
+    clock.return_value = 10.0
+    scheduler = make_scheduler()
+
+    scheduler.record_flush()
+    clock.return_value = 10.4
+    scheduler.record_transcription()
+    scheduler.record_transcription()  # Later deltas are not measured
+
+    scheduler.record_activity_end()
+    clock.return_value = 11.0
+    scheduler.record_transcription()
+
+    stats = scheduler.stats()
+    assert stats["flush_to_transcription_ms_avg"] == pytest.approx(400.0)
+    assert stats["activity_end_to_transcription_ms_avg"] == pytest.approx(600.0)
+
+
+# GeminiLiveService integration
+
+
+@pytest.fixture
+def flushing_service(mock_gemini_api_key, mocker):
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.server_flush_enabled", True)
+    mocker.patch("app.services.gemini_live.settings.flush_interval_bytes", 4096)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    return service
+
+
+def signals(service) -> list[str]:
+    return [
+        next(iter(call.kwargs))
+        for call in service.session.send_realtime_input.await_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_service_flushes_at_quiet_point(flushing_service):
+    """Test that the service sends activity_end/start itself at a quiet frame"""
+    await flushing_service.send_activity_start()
+    for _ in range(4):
+        await flushing_service.send_audio(LOUD)
+    await flushing_service.send_audio(QUIET)
+
+    assert signals(flushing_service) == [
+        "activity_start",
+        "audio",
+        "audio",
+        "audio",
+        "audio",
+        "audio",
+        "activity_end",
+        "activity_start",
+    ]
+    assert flushing_service._flush_scheduler.flushes == 1
+    assert flushing_service._bytes_since_last_activity_end == 0
+
+
+@pytest.mark.asyncio
+async def test_service_flush_is_a_turn_boundary_for_resumption(
+    flushing_service, mocker
+):
+    """Test that a resumed session replays the flush's activity_end/start"""
+    mocker.patch("app.services.gemini_live.settings.session_resumption_enabled", True)
+    flushing_service._history = PcmRingBuffer(5.0, 16000)
+    await flushing_service.send_activity_start()
+    for _ in range(4):
+        await flushing_service.send_audio(LOUD)
+    await flushing_service.send_audio(QUIET)
+
+    end = flushing_service._history.end - len(QUIET)
+    assert flushing_service._activity_marks[-2:] == [(end, False), (end, True)]
+
+
+@pytest.mark.asyncio
+async def test_service_does_not_flush_outside_activity(flushing_service):
+    """Test that audio outside an activity never triggers a flush"""
+    for _ in range(8):
+        await flushing_service.send_audio(QUIET)
+
+    assert "activity_end" not in signals(flushing_service)
+
+
+@pytest.mark.asyncio
+async def test_service_stops_flushing_after_activity_end(flushing_service):
+    """Test that activity_end leaves the flush-eligible state"""
+    await flushing_service.send_activity_start()
+    await flushing_service.send_activity_end()
+    for _ in range(8):
+        await flushing_service.send_audio(QUIET)
+
+    assert signals(flushing_service).count("activity_end") == 1
@@ -150,6 +150,31 @@ async def test_disconnect_handles_errors(mock_gemini_api_key, mocker, caplog):
     assert "Error closing connection" in caplog.text
 
 
+@pytest.mark.asyncio
+async def test_disconnect_is_bounded_by_timeout(mock_gemini_api_key, mocker, caplog):
+    """Test that an upstream that never closes does not block disconnect"""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    mocker.patch("app.services.gemini_live.settings.disconnect_timeout_seconds", 0.05)
+
+    async def never_closes(*_args) -> None:
+        await asyncio.Event().wait()
+
+    mock_context_manager = AsyncMock()
+    mock_context_manager.__aexit__.side_effect = never_closes
+
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    service._context_manager = mock_context_manager
+
+    await asyncio.wait_for(service.disconnect(), timeout=1)
+
+    assert service.session is None
+    assert service._context_manager is None
+    assert "did not close" in caplog.text
+
+
 # Text message tests
 
 
@@ -370,7 +395,7 @@ async def test_receive_responses_input_transcription(mock_gemini_api_key, mocker
         break
 
     assert len(responses) == 1
-    assert responses[0]["input_transcription"] == "Hello"
+    assert responses[0].input_transcription == "Hello"
 
 
 @pytest.mark.asyncio
@@ -402,7 +427,7 @@ async def test_receive_responses_output_transcription(mock_gemini_api_key, mocke
         responses.append(response)
         break
 
-    assert responses[0]["output_transcription"] == "Response"
+    assert responses[0].output_transcription == "Response"
 
 
 @pytest.mark.asyncio
@@ -438,8 +463,8 @@ async def test_receive_responses_model_turn_with_audio(mock_gemini_api_key, mock
         responses.append(response)
         break
 
-    assert responses[0]["audio"] == b"audio bytes"
-    assert responses[0]["model_state"] == "speaking"
+    assert responses[0].audio == b"audio bytes"
+    assert responses[0].model_state == "speaking"
 
 
 @pytest.mark.asyncio
@@ -475,8 +500,8 @@ async def test_receive_responses_model_turn_with_text(mock_gemini_api_key, mocke
         responses.append(response)
         break
 
-    assert responses[0]["output_transcription"] == "Model response text"
-    assert responses[0]["model_state"] == "speaking"
+    assert responses[0].output_transcription == "Model response text"
+    assert responses[0].model_state == "speaking"
 
 
 @pytest.mark.asyncio
@@ -508,8 +533,8 @@ async def test_receive_responses_turn_complete(mock_gemini_api_key, mocker):
         responses.append(response)
         break
 
-    assert responses[0]["turn_complete"] is True
-    assert responses[0]["model_state"] == "listening"
+    assert responses[0].turn_complete is True
+    assert responses[0].model_state == "listening"
 
 
 @pytest.mark.asyncio
@@ -541,8 +566,8 @@ async def test_receive_responses_interrupted(mock_gemini_api_key, mocker):
         responses.append(response)
         break
 
-    assert responses[0]["interrupted"] is True
-    assert responses[0]["model_state"] == "listening"
+    assert responses[0].interrupted is True
+    assert responses[0].model_state == "listening"
 
 
 @pytest.mark.asyncio
@@ -574,7 +599,7 @@ async def test_receive_responses_grounding_metadata(mock_gemini_api_key, mocker)
         responses.append(response)
         break
 
-    assert responses[0]["model_state"] == "thinking"
+    assert responses[0].model_state == "thinking"
 
 
 @pytest.mark.asyncio
@@ -672,8 +697,8 @@ async def test_receive_responses_multiple_turns(mock_gemini_api_key, mocker):
             break
 
     assert len(responses) == 2
-    assert responses[0]["input_transcription"] == "Turn 1"
-    assert responses[1]["input_transcription"] == "Turn 2"
+    assert responses[0].input_transcription == "Turn 1"
+    assert responses[1].input_transcription == "Turn 2"
 
 
 @pytest.mark.asyncio
@@ -735,3 +760,155 @@ async def test_receive_responses_empty_response_not_yielded(
         pass
 
     assert len(responses) == 0  # Empty response should not be yielded
+
+
+@pytest.fixture
+def lookback_service(mock_gemini_api_key, mocker):
+    """Service keeping 100 ms (3200 bytes) of pre-speech lookback"""
+    from unittest.mock import AsyncMock
+
+    mocker.patch("app.services.gemini_live.settings.pre_speech_lookback_ms", 100.0)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    return service
+
+
+def sent_audio(service) -> list[bytes]:
+    return [
+        bytes(call.kwargs["audio"]["data"])
+        for call in service.session.send_realtime_input.await_args_list
+        if "audio" in call.kwargs
+    ]
+
+
+@pytest.mark.asyncio
+async def test_lookback_holds_audio_outside_activity(lookback_service):
+    """Test that audio before activity_start is kept rather than forwarded"""
+    await lookback_service.send_audio(b"\x01" * 1024)
+
+    assert sent_audio(lookback_service) == []
+
+
+@pytest.mark.asyncio
+async def test_lookback_is_forwarded_after_activity_start(lookback_service):
+    """Test that the last lookback window precedes live audio after activity_start"""
+    for value in range(1, 6):
+        await lookback_service.send_audio(bytes([value]) * 1024)
+
+    await lookback_service.send_activity_start()
+    await lookback_service.send_audio(b"\x09" * 1024)
+
+    calls = lookback_service.session.send_realtime_input.await_args_list
+    assert "activity_start" in calls[0].kwargs
+    # 3200 bytes: the tail of frame 2, then frames 3 to 5, then live audio
+    assert b"".join(sent_audio(lookback_service)) == (
+        b"\x02" * 128
+        + b"\x03" * 1024
+        + b"\x04" * 1024
+        + b"\x05" * 1024
+        + b"\x09" * 1024
+    )
+
+
+@pytest.mark.asyncio
+async def test_lookback_skips_audio_of_previous_activity(lookback_service):
+    """Test that audio already forwarded in an activity is not sent again"""
+    await lookback_service.send_activity_start()
+    await lookback_service.send_audio(b"\x01" * 1024)
+    await lookback_service.send_activity_end()
+    await lookback_service.send_audio(b"\x02" * 512)
+
+    await lookback_service.send_activity_start()
+
+    assert sent_audio(lookback_service) == [b"\x01" * 1024, b"\x02" * 512]
+
+
+@pytest.fixture
+def resumable_service(mock_gemini_api_key, mocker):
+    """Connected service with session resumption and a known handle"""
+    from unittest.mock import AsyncMock, Mock
+
+    mocker.patch("app.services.gemini_live.settings.session_resumption_enabled", True)
+    mocker.patch("app.services.gemini_live.settings.resumption_replay_ms", 100.0)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    service._context_manager = AsyncMock()
+    update = Mock(new_handle="handle-1", resumable=True)
+    service._track_resumption(Mock(session_resumption_update=update))
+    return service
+
+
+@pytest.mark.asyncio
+async def test_resume_uses_handle_and_replays_uplink(
+    resumable_service, next_live_session
+):
+    """Test that resumption reconnects with the handle and replays recent input"""
+    await resumable_service.send_activity_start()
+    await resumable_service.send_audio(b"\x01" * 1024)
+    await resumable_service.send_activity_end()
+    connect, new_session = next_live_session(resumable_service)
+
+    await resumable_service._resume()
+
+    config = connect.call_args.kwargs["config"]
+    assert config["session_resumption"] == {"handle": "handle-1"}
+    sent = [
+        next(iter(call.kwargs))
+        for call in new_session.send_realtime_input.await_args_list
+    ]
+    assert sent == ["activity_start", "audio", "activity_end"]
+    assert resumable_service.session is new_session
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_uplink_covered_by_handle(
+    resumable_service, next_live_session
+):
+    """Test that input sent before the latest handle is not replayed"""
+    from unittest.mock import Mock
+
+    await resumable_service.send_activity_start()
+    await resumable_service.send_audio(b"\x01" * 1024)
+    await resumable_service.send_activity_end()
+    update = Mock(new_handle="handle-2", resumable=True)
+    resumable_service._track_resumption(Mock(session_resumption_update=update))
+    _connect, new_session = next_live_session(resumable_service)
+
+    await resumable_service._resume()
+
+    new_session.send_realtime_input.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_receive_failure_without_resumption_is_raised(mock_gemini_api_key):
+    """Test that upstream errors still end reception when resumption is off"""
+    from unittest.mock import AsyncMock, Mock
+
+    async def failing_receive():
+        raise ConnectionError("upstream lost")
+        yield
+
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    service.session.receive = Mock(side_effect=failing_receive)
+
+    with pytest.raises(ConnectionError):
+        async for _event in service.receive_responses():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_failed_resumption_raises(resumable_service, mocker):
+    """Test that resumption gives up after the configured attempts"""
+    from app.exceptions import GeminiAPIError
+
+    mocker.patch("app.services.gemini_live.settings.resumption_max_attempts", 1)
+    mocker.patch.object(
+        resumable_service.client.aio.live, "connect", side_effect=OSError("refused")
+    )
+
+    with pytest.raises(GeminiAPIError, match="Failed to resume"):
+        await resumable_service._resume()
+
+    assert resumable_service.session is None
+    assert resumable_service._resumed.is_set()
@@ -0,0 +1,155 @@
+"""
+Tests for per-turn latency histograms
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.latency import (
+    LatencyHistogram,
+    LatencyRegistry,
+    TurnMetric,
+    TurnTimer,
+    latency_metrics,
+)
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    """Test p50/p90/p99 estimates from bucket counts"""
+    histogram = LatencyHistogram(buckets_ms=(100, 200, 400))
+    for value in [50] * 50 + [150] * 40 + [300] * 10:
+        histogram.observe(value)
+
+    summary = histogram.summary()
+
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == pytest.approx(100.0)
+    assert summary["p90_ms"] == pytest.approx(200.0)
+    assert 200.0 < summary["p99_ms"] <= 300.0
+    assert summary["max_ms"] == 300.0
+
+
+def test_histogram_overflow_bucket_reports_max():
+    """Test that values above the last bound are reported via the maximum"""
+    histogram = LatencyHistogram(buckets_ms=(100,))
+    histogram.observe(5000)
+
+    assert histogram.quantile(0.99) == 5000
+
+
+def test_empty_histogram_is_zero():
+    """Test quantiles of an empty histogram"""
+    assert LatencyHistogram().summary()["p50_ms"] == 0.0
+
+
+def test_registry_keeps_process_and_per_config_histograms():
+    """Test aggregation per process and per model/voice configuration"""
+    registry = LatencyRegistry()
+    registry.observe(TurnMetric.END_TO_AUDIO, "model/Aoede/es-US", 0.2)
+    registry.observe(TurnMetric.END_TO_AUDIO, "model/Puck/en-US", 0.4)
+
+    snapshot = registry.snapshot()
+
+    assert snapshot["process"]["activity_end_to_first_audio"]["count"] == 2
+    assert (
+        snapshot["by_config"]["model/Puck/en-US"]["activity_end_to_first_audio"][
+            "count"
+        ]
+        == 1
+    )
+    filtered = registry.snapshot(metric="interruption_to_silence")
+    assert filtered["process"] == {}
+
+
+@pytest.fixture
+def clock(mocker):
+    clock = mocker.patch("app.services.latency.time.monotonic")
+    clock.return_value = 100.0
+    return clock
+
+
+def test_turn_timer_records_response_latencies(clock):
+    """Test activity_end → transcription/audio and audio → turn_complete"""
+    registry = LatencyRegistry()
+    timer = TurnTimer("cfg", registry)
+
+    timer.activity_end()
+    clock.return_value = 100.3
+    timer.input_transcription()
+    timer.input_transcription()  # Later deltas are not measured
+    clock.return_value = 100.5
+    timer.audio()
+    clock.return_value = 102.5
+    timer.audio()
+    timer.turn_complete()
+
+    process = registry.snapshot()["process"]
+    assert process["activity_end_to_first_transcription"]["count"] == 1
+    assert process["activity_end_to_first_transcription"]["max_ms"] == pytest.approx(
+        300.0
+    )
+    assert process["activity_end_to_first_audio"]["max_ms"] == pytest.approx(500.0)
+    assert process["first_audio_to_turn_complete"]["max_ms"] == pytest.approx(2000.0)
+
+
+def test_turn_timer_records_interruption_to_silence(clock):
+    """Test barge-in latency from activity_start to the interrupted signal"""
+    registry = LatencyRegistry()
+    timer = TurnTimer("cfg", registry)
+    timer.audio()
+
+    clock.return_value = 101.0
+    timer.activity_start()
+    clock.return_value = 101.25
+    timer.interrupted()
+
+    process = registry.snapshot()["process"]
+    assert process["interruption_to_silence"]["max_ms"] == pytest.approx(250.0)
+
+
+def test_activity_start_without_model_audio_is_not_barge_in(clock):
+    """Test that a normal turn start records no interruption latency"""
+    registry = LatencyRegistry()
+    timer = TurnTimer("cfg", registry)
+
+    timer.activity_start()
+    timer.interrupted()
+
+    assert "interruption_to_silence" not in registry.snapshot()["process"]
+
+
+@pytest.mark.asyncio
+async def test_service_feeds_latency_registry(mock_gemini_api_key, mocker):
+    """Test that GeminiLiveService times turns under its config label"""
+    from google.genai import types
+
+    from app.services.gemini_live import GeminiLiveService
+
+    latency_metrics.clear()
+    message = types.LiveServerMessage(
+        server_content=types.LiveServerContent(
+            model_turn=types.Content(
+                parts=[types.Part(inline_data=types.Blob(data=b"a"))]
+            )
+        )
+    )
+
+    async def turn():
+        yield message
+
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    service.session.receive = mocker.Mock(return_value=turn())
+    await service.send_activity_end()
+
+    async for _ in service.receive_responses():
+        break
+
+    by_config = latency_metrics.snapshot()["by_config"]
+    assert (
+        by_config[f"{service.model}/Aoede/es-US"]["activity_end_to_first_audio"][
+            "count"
+        ]
+        == 1
+    )
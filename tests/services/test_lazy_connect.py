@@ -0,0 +1,106 @@
+"""
+Tests for lazy connect: calls that open their Live session on the first turn
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.exceptions import GeminiAPIError
+from app.services.gemini_live import GeminiLiveService
+from app.services.lazy_connect import lazy_connect_totals
+
+
+@pytest.fixture
+def deferred_service(mock_gemini_api_key, mocker):
+    """Service that has deferred its connect, with a mocked Live API"""
+    service = GeminiLiveService()
+    session = AsyncMock()
+    context_manager = AsyncMock()
+    context_manager.__aenter__.return_value = session
+    connect = mocker.patch.object(
+        service.client.aio.live, "connect", return_value=context_manager
+    )
+    service.defer_connect()
+    return service, connect, session
+
+
+@pytest.mark.asyncio
+async def test_first_turn_connects(deferred_service):
+    """Test that activity_start opens the session and is sent on it"""
+    service, connect, session = deferred_service
+    await service.send_audio(b"\x01" * 1024)  # Before the turn: not forwarded
+    connect.assert_not_called()
+
+    await service.send_activity_start()
+
+    connect.assert_called_once()
+    assert service.session is session
+    session.send_realtime_input.assert_awaited_once()
+    await service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_reader_waits_for_the_connect(deferred_service):
+    """Test that receive_responses starts reading once the session is open"""
+    service, _connect, session = deferred_service
+
+    async def idle_upstream():
+        await asyncio.Event().wait()
+        yield
+
+    session.receive = Mock(side_effect=idle_upstream)
+    reader = asyncio.ensure_future(anext(service.receive_responses()))
+    await asyncio.sleep(0.01)
+    assert not reader.done()
+
+    await service.send_text("hola")
+    await asyncio.sleep(0.01)
+
+    session.receive.assert_called_once()
+    reader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await reader
+    await service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_speech_hint_starts_the_connect(deferred_service):
+    """Test that a browser speech hint connects in the background"""
+    service, connect, session = deferred_service
+
+    service.expect_speech()
+    await asyncio.sleep(0.01)
+
+    connect.assert_called_once()
+    assert service.session is session
+    await service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_unused_call_never_connects(deferred_service):
+    """Test that a call ending before its first turn is counted as avoided"""
+    service, connect, _session = deferred_service
+    avoided = lazy_connect_totals.avoided
+
+    await service.disconnect()
+
+    connect.assert_not_called()
+    assert lazy_connect_totals.avoided == avoided + 1
+
+
+@pytest.mark.asyncio
+async def test_connect_is_retried_before_failing(deferred_service, mocker):
+    """Test that the call fails only once every connect attempt has"""
+    service, connect, _session = deferred_service
+    mocker.patch("app.services.gemini_live.settings.lazy_connect_attempts", 2)
+    connect.side_effect = [OSError("refused"), OSError("refused")]
+    failed = lazy_connect_totals.failed
+
+    with pytest.raises(GeminiAPIError, match="Failed to connect"):
+        await service.send_text("hola")
+
+    assert connect.call_count == 2
+    assert lazy_connect_totals.failed == failed + 1
+    await service.disconnect()
@@ -0,0 +1,99 @@
+"""
+Tests for the Live API server message parser
+"""
+
+import logging
+
+from google.genai import types
+
+from app.services.live_events import LiveEvent, LiveMessageParser
+
+
+def audio_message(*chunks: bytes) -> types.LiveServerMessage:
+    parts = [
+        types.Part(inline_data=types.Blob(data=chunk, mime_type="audio/pcm"))
+        for chunk in chunks
+    ]
+    return types.LiveServerMessage(
+        server_content=types.LiveServerContent(model_turn=types.Content(parts=parts))
+    )
+
+
+def test_all_audio_parts_are_concatenated():
+    """Test that a model_turn with several inline_data parts keeps all audio"""
+    event = LiveMessageParser().parse(audio_message(b"one", b"two", b"three"))
+
+    assert event is not None
+    assert event.audio == b"onetwothree"
+
+
+def test_single_audio_part_is_not_copied():
+    """Test that the common single-part case hands the SDK bytes through"""
+    chunk = bytes(960)
+    message = audio_message(chunk)
+
+    event = LiveMessageParser().parse(message)
+
+    assert event is not None
+    assert event.audio is message.server_content.model_turn.parts[0].inline_data.data
+
+
+def test_speaking_state_is_kept_across_messages():
+    """Test that only the first model output of a turn reports speaking"""
+    parser = LiveMessageParser()
+
+    first = parser.parse(audio_message(b"a"))
+    second = parser.parse(audio_message(b"b"))
+    done = parser.parse(
+        types.LiveServerMessage(
+            server_content=types.LiveServerContent(turn_complete=True)
+        )
+    )
+
+    assert first == LiveEvent(audio=b"a", model_state="speaking", speech_started=True)
+    assert second == LiveEvent(audio=b"b")
+    assert done == LiveEvent(turn_complete=True, model_state="listening")
+    assert parser.is_speaking is False
+    assert parser.turn_count == 1
+
+
+def test_transcriptions_are_extracted():
+    """Test input and output transcription extraction"""
+    message = types.LiveServerMessage(
+        server_content=types.LiveServerContent(
+            input_transcription=types.Transcription(text="hola"),
+            output_transcription=types.Transcription(text="buenas"),
+        )
+    )
+
+    event = LiveMessageParser().parse(message)
+
+    assert event == LiveEvent(input_transcription="hola", output_transcription="buenas")
+
+
+def test_messages_without_content_yield_nothing():
+    """Test that setup/tool/usage-only messages are skipped"""
+    parser = LiveMessageParser()
+
+    assert parser.parse(types.LiveServerMessage()) is None
+    assert parser.parse(types.LiveServerMessage(setup_complete={})) is None
+    assert (
+        parser.parse(types.LiveServerMessage(server_content=types.LiveServerContent()))
+        is None
+    )
+
+
+def test_no_logging_per_message(caplog):
+    """Test that ordinary messages are parsed without log records"""
+    parser = LiveMessageParser()
+
+    with caplog.at_level(logging.DEBUG, logger="app.services.live_events"):
+        for _ in range(10):
+            parser.parse(audio_message(b"pcm"))
+
+    assert caplog.records == []
+
+
+def test_event_uses_slots():
+    """Test that events have no per-instance __dict__"""
+    assert not hasattr(LiveEvent(), "__dict__")
@@ -0,0 +1,214 @@
+"""
+Tests for the Prometheus-compatible metrics registry
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from app.services.metrics import (
+    MetricsRegistry,
+    MetricsReporter,
+    MultiProcessStore,
+    merge,
+    render,
+)
+
+
+def test_render_counters_gauges_and_labels():
+    """Test the text exposition format of simple metrics"""
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", labelnames=("source",))
+    depth = registry.gauge("queue_depth", "Depth")
+    requests.labels("pool").inc()
+    requests.labels("pool").inc(2)
+    depth.set(4)
+
+    text = render(merge([registry.collect()]))
+
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{source="pool"} 3' in text
+    assert "queue_depth 4" in text
+
+
+def test_render_histogram_is_cumulative():
+    """Test bucket, sum and count lines of a histogram"""
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value)
+
+    text = render(merge([registry.collect()]))
+
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_sum 4.05" in text
+    assert "latency_seconds_count 4" in text
+
+
+def test_function_metrics_are_computed_at_collection():
+    """Test callback metrics used to export existing totals"""
+    registry = MetricsRegistry()
+    totals = {"flushes": 1}
+    registry.counter("flushes_total", "Flushes", function=lambda: totals["flushes"])
+    totals["flushes"] = 7
+
+    assert "flushes_total 7" in render(merge([registry.collect()]))
+
+
+def test_merge_across_processes():
+    """Test that counters/histograms add up and max-mode gauges take the max"""
+
+    def worker(sessions: int, lag: float, observed: float) -> dict:
+        registry = MetricsRegistry()
+        registry.gauge("sessions", "Sessions").set(sessions)
+        registry.gauge("lag_seconds", "Lag", mode="max").set(lag)
+        registry.counter("frames_total", "Frames").inc(100)
+        registry.histogram("connect_seconds", "Connect", buckets=(1.0,)).observe(
+            observed
+        )
+        return json.loads(json.dumps(registry.collect()))  # As read from disk
+
+    text = render(merge([worker(2, 0.01, 0.5), worker(3, 0.2, 2.0)]))
+
+    assert "sessions 5" in text
+    assert "lag_seconds 0.2" in text
+    assert "frames_total 200" in text
+    assert 'connect_seconds_bucket{le="1"} 1' in text
+    assert "connect_seconds_count 2" in text
+
+
+def test_duplicate_registration_is_rejected():
+    """Test that metric names are unique"""
+    registry = MetricsRegistry()
+    registry.counter("frames_total", "Frames")
+
+    with pytest.raises(ValueError):
+        registry.gauge("frames_total", "Frames")
+
+
+def test_store_reads_live_workers_and_removes_dead_ones(tmp_path):
+    """Test the multi-process snapshot directory"""
+    store = MultiProcessStore(str(tmp_path))
+    store.write({"a": {"type": "counter", "help": "", "samples": [[{}, 1]]}})
+    other = tmp_path / f"metrics-{os.getppid()}.json"
+    other.write_text(json.dumps({"a": {"type": "counter", "help": "", "samples": []}}))
+    dead = tmp_path / "metrics-999999999.json"
+    dead.write_text("{}")
+
+    assert len(store.read_all()) == 2
+    assert not dead.exists()
+
+    store.retire({"a": {"type": "counter", "help": "", "samples": [[{}, 1]]}})
+    assert not store.path.exists()
+    assert store.retired_path.exists()
+
+
+def test_dead_workers_keep_their_counters_but_not_their_gauges(tmp_path):
+    """Test that totals survive a worker restart while its gauges go away"""
+    store = MultiProcessStore(str(tmp_path))
+    store.write(
+        {
+            "frames_total": {"type": "counter", "help": "", "samples": [[{}, 5]]},
+            "sessions": {"type": "gauge", "help": "", "samples": [[{}, 1]]},
+        }
+    )
+    for pid in (999999998, 999999999):
+        (tmp_path / f"metrics-{pid}.json").write_text(
+            json.dumps(
+                {
+                    "frames_total": {
+                        "type": "counter",
+                        "help": "",
+                        "samples": [[{}, 3]],
+                    },
+                    "sessions": {"type": "gauge", "help": "", "samples": [[{}, 7]]},
+                }
+            )
+        )
+
+    merged = merge(store.read_all())
+    assert merged["frames_total"]["samples"] == [[{}, 11]]
+    assert merged["sessions"]["samples"] == [[{}, 1]]
+    # Folded once: a second scrape does not count the dead workers again
+    assert merge(store.read_all())["frames_total"]["samples"] == [[{}, 11]]
+
+
+def test_reporter_render_merges_worker_snapshots(tmp_path):
+    """Test that a scrape includes the snapshots of other workers"""
+    other = tmp_path / f"metrics-{os.getppid()}.json"
+    other.write_text(
+        json.dumps(
+            {
+                "gemini_live_websocket_sessions_active": {
+                    "type": "gauge",
+                    "help": "Browser WebSocket sessions open",
+                    "mode": "sum",
+                    "samples": [[{}, 5]],
+                }
+            }
+        )
+    )
+    reporter = MetricsReporter(str(tmp_path), 0.5, 1.0)
+
+    text = reporter.render()
+
+    assert "gemini_live_websocket_sessions_active 5" in text
+    assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_reporter_measures_event_loop_lag(tmp_path):
+    """Test that a blocked loop shows up as lag and snapshots are published"""
+    from app.services.metrics import EVENT_LOOP_LAG
+
+    reporter = MetricsReporter(str(tmp_path), 0.01, 0.1)
+    reporter.start()
+    await asyncio.sleep(0.015)
+    time.sleep(0.05)  # Block the loop
+    await asyncio.sleep(0.02)
+
+    assert EVENT_LOOP_LAG._default.value > 0.02
+    await asyncio.sleep(0.1)
+    assert list(tmp_path.glob("metrics-*.json"))
+    await reporter.stop()
+    assert [path.name for path in tmp_path.glob("metrics-*.json")] == [
+        "metrics-retired.json"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stopped_reporter_keeps_its_counters(tmp_path):
+    """Test that a worker shutting down gracefully does not take its totals along"""
+    from app.services.metrics import TURNS
+
+    TURNS.inc(3)
+    reporter = MetricsReporter(str(tmp_path), 0.5, 60.0)
+    reporter.start()
+    await reporter.stop()
+
+    merged = merge(MultiProcessStore(str(tmp_path)).read_all())
+    assert merged["gemini_live_turns_total"]["samples"] == [[{}, TURNS._default.value]]
+    assert "gemini_live_websocket_sessions_active" not in merged  # Gauges go
+
+
+@pytest.mark.asyncio
+async def test_service_counts_connect_failures(mock_gemini_api_key, mocker):
+    """Test upstream connect counters in GeminiLiveService"""
+    from app.exceptions import GeminiAPIError
+    from app.services.gemini_live import GeminiLiveService
+    from app.services.metrics import UPSTREAM_CONNECT_FAILURES
+
+    service = GeminiLiveService()
+    service.client = mocker.Mock()
+    service.client.aio.live.connect.side_effect = RuntimeError("boom")
+    before = UPSTREAM_CONNECT_FAILURES._default.value
+
+    with pytest.raises(GeminiAPIError):
+        await service.connect()
+
+    assert UPSTREAM_CONNECT_FAILURES._default.value == before + 1
@@ -0,0 +1,129 @@
+"""
+Tests for the PCM ring buffer
+"""
+
+from app.services.pcm_ring_buffer import PcmRingBuffer, aggregate_stats
+
+
+def frame(value: int, samples: int = 4) -> bytes:
+    return bytes([value, 0]) * samples
+
+
+def joined(views: list[memoryview]) -> bytes:
+    return b"".join(bytes(view) for view in views)
+
+
+def test_capacity_is_fixed_by_duration():
+    """Test that capacity is the duration in whole int16 samples"""
+    buffer = PcmRingBuffer(0.5, sample_rate=16000)
+    assert buffer.capacity == 16000
+
+
+def test_append_and_read_before_wrapping():
+    """Test that appended frames are read back in order"""
+    buffer = PcmRingBuffer(1.0, sample_rate=8)  # 16 bytes
+    buffer.append(frame(1))
+    buffer.append(frame(2, samples=2))
+
+    assert joined(buffer.read(0)) == frame(1) + frame(2, samples=2)
+    assert buffer.buffered_bytes == 12
+
+
+def test_oldest_audio_is_overwritten_when_full():
+    """Test that only the most recent capacity bytes are kept"""
+    buffer = PcmRingBuffer(1.0, sample_rate=8)
+    for value in range(1, 4):
+        buffer.append(frame(value))  # 8 bytes each
+
+    assert buffer.start == 8
+    assert buffer.end == 24
+    assert joined(buffer.read(0)) == frame(2) + frame(3)
+
+
+def test_wrapped_window_is_returned_as_two_views():
+    """Test that a window across the end of the ring is read without copying"""
+    buffer = PcmRingBuffer(1.0, sample_rate=8)
+    buffer.append(frame(1, samples=6))
+    buffer.append(frame(2, samples=4))  # Wraps by 4 bytes
+
+    views = buffer.read(8)
+
+    assert len(views) == 2
+    assert all(isinstance(view, memoryview) for view in views)
+    assert joined(views) == frame(1, samples=2) + frame(2)
+
+
+def test_frame_larger_than_capacity_keeps_its_tail():
+    """Test that an oversized frame leaves its last capacity bytes"""
+    buffer = PcmRingBuffer(1.0, sample_rate=8)
+    buffer.append(frame(9, samples=3))
+    audio = bytes(range(40))
+
+    buffer.append(audio)
+
+    assert joined(buffer.read(0)) == audio[-16:]
+    assert buffer.end == 46
+
+
+def test_window_by_stream_time():
+    """Test that stream seconds index the audio"""
+    buffer = PcmRingBuffer(2.0, sample_rate=8)  # 16 bytes per second
+    for value in range(1, 5):
+        buffer.append(frame(value))  # 0.5 s each
+
+    assert joined(buffer.window(0.5, 1.5)) == frame(2) + frame(3)
+    assert joined(buffer.last(0.5)) == frame(4)
+    assert buffer.duration_seconds == 2.0
+    assert buffer.time_of(buffer.offset_at(1.0)) == 1.0
+
+
+def test_reads_are_clamped_to_held_audio():
+    """Test that windows outside the held audio shrink or come back empty"""
+    buffer = PcmRingBuffer(1.0, sample_rate=8)
+    for value in range(1, 4):
+        buffer.append(frame(value))
+
+    assert joined(buffer.window(0.0, 1.0)) == frame(2)
+    assert buffer.read(30) == []
+
+
+def test_clear_forgets_audio_but_keeps_offsets():
+    """Test that clear empties the buffer without resetting stream offsets"""
+    buffer = PcmRingBuffer(1.0, sample_rate=8)
+    buffer.append(frame(1))
+    buffer.clear()
+    buffer.append(frame(2, samples=2))
+
+    assert joined(buffer.read(0)) == frame(2, samples=2)
+    assert buffer.start == 8
+
+
+def test_aggregate_stats_reports_reserved_memory():
+    """Test that live buffers are summed for /stats"""
+    buffer = PcmRingBuffer(1.0, sample_rate=8)
+    buffer.append(frame(1))
+
+    stats = aggregate_stats()
+
+    assert stats["buffers"] >= 1
+    assert stats["capacity_bytes"] >= 16
+    assert stats["buffered_bytes"] >= 8
+    assert buffer.stats()["buffered_seconds"] == 0.5
+
+
+async def test_service_keeps_received_audio(mock_gemini_api_key, mocker):
+    """Test that send_audio appends every received frame to the history"""
+    from unittest.mock import AsyncMock
+
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.audio_history_seconds", 1.0)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+
+    await service.send_audio(frame(1))
+    await service.send_audio(memoryview(frame(2)))
+
+    assert service._history is not None
+    assert service._history.capacity == 32000
+    assert joined(service._history.read(0)) == frame(1) + frame(2)
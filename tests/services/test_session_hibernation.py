@@ -0,0 +1,151 @@
+"""
+Tests for session hibernation: idle calls closing and reopening their Live session
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.services.gemini_live import GeminiLiveService
+from app.services.live_events import LiveEvent
+from app.services.session_hibernation import (
+    Hibernation,
+    aggregate_stats,
+    hibernation_totals,
+)
+
+
+def test_stats_count_live_and_hibernated_calls():
+    """Test that /stats separates hibernated calls from live ones"""
+    before = aggregate_stats()
+    live, idle = Hibernation(30.0), Hibernation(30.0)
+
+    idle.hibernate()
+    stats = aggregate_stats()
+
+    assert stats["live"] == before["live"] + 1
+    assert stats["hibernated"] == before["hibernated"] + 1
+    assert stats["hibernations"] == before["hibernations"] + 1
+    idle.wake()
+    live.close()
+    idle.close()
+    assert aggregate_stats()["live"] == before["live"]
+
+
+@pytest.fixture
+def idle_service(mock_gemini_api_key, mocker):
+    """Connected service that hibernates after 10ms without activity"""
+    mocker.patch("app.services.gemini_live.settings.hibernate_idle_seconds", 0.01)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    service._context_manager = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_idle_call_hibernates(idle_service):
+    """Test that the session of a call idle for the configured time is closed"""
+    context_manager = idle_service._context_manager
+
+    idle_service._start_idle_watch()
+    await asyncio.sleep(0.05)
+
+    assert idle_service.session is None
+    assert idle_service._hibernated
+    context_manager.__aexit__.assert_awaited_once()
+    await idle_service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_call_mid_turn_stays_live(idle_service):
+    """Test that a call waiting for the model's answer is not hibernated"""
+    idle_service._turn_open = True
+    session = idle_service.session
+
+    idle_service._start_idle_watch()
+    await asyncio.sleep(0.05)
+
+    assert idle_service.session is session
+    assert not idle_service._hibernated
+    await idle_service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_activity_start_reopens_with_the_handle(idle_service, next_live_session):
+    """Test that the next turn reopens the session with the resumption handle"""
+    update = Mock(new_handle="handle-1", resumable=True)
+    idle_service._track_resumption(Mock(session_resumption_update=update))
+    await idle_service._hibernate()
+    connect, new_session = next_live_session(idle_service)
+
+    await idle_service.send_activity_start()
+
+    assert connect.call_args.kwargs["config"]["session_resumption"] == {
+        "handle": "handle-1"
+    }
+    assert idle_service.session is new_session
+    assert not idle_service._hibernated
+    new_session.send_realtime_input.assert_awaited_once()
+    await idle_service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_reopen_without_handle_sends_the_transcript(
+    idle_service, next_live_session
+):
+    """Test that a call without a handle reopens warmed with its transcript"""
+    for event in [
+        LiveEvent(input_transcription="hola"),
+        LiveEvent(output_transcription="hola, ¿qué tal?"),
+        LiveEvent(turn_complete=True),
+    ]:
+        idle_service._transcript.add(event)
+    await idle_service._hibernate()
+    _connect, new_session = next_live_session(idle_service)
+
+    await idle_service.send_text("sigo aquí")
+
+    warmed = new_session.send_client_content.await_args.kwargs
+    assert len(warmed["turns"]) == 2
+    new_session.send.assert_awaited_once_with(input="sigo aquí", end_of_turn=True)
+    await idle_service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_coalescing_deadline_after_hibernation_sends_nothing(
+    mock_gemini_api_key, mocker, caplog
+):
+    """Test that audio coalesced before hibernating is not flushed afterwards"""
+    mocker.patch("app.services.gemini_live.settings.hibernate_idle_seconds", 60.0)
+    mocker.patch("app.services.gemini_live.settings.audio_coalesce_enabled", True)
+    mocker.patch("app.services.gemini_live.settings.audio_coalesce_max_hold_ms", 10.0)
+    service = GeminiLiveService()
+    session = service.session = AsyncMock()
+    service._context_manager = AsyncMock()
+    service._in_activity = True
+
+    await service.send_audio(b"\x01\x00" * 64)  # Below the chunk size: held
+    await service._hibernate()
+    await asyncio.sleep(0.05)  # Past the coalescing deadline
+
+    session.send_realtime_input.assert_not_called()
+    assert service._coalescer.pending_bytes == 0
+    assert "Error flushing coalesced audio" not in caplog.text
+    await service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_speech_hint_starts_reopening_early(idle_service, next_live_session):
+    """Test that a browser speech hint reopens the session in the background"""
+    await idle_service._hibernate()
+    _connect, new_session = next_live_session(idle_service)
+    speculative_wakes = hibernation_totals.speculative_wakes
+
+    idle_service.expect_speech()
+    assert idle_service._hibernated  # Not waited for
+    await asyncio.sleep(0.01)
+
+    assert idle_service.session is new_session
+    assert hibernation_totals.speculative_wakes == speculative_wakes + 1
+    await idle_service.disconnect()
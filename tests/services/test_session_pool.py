@@ -0,0 +1,227 @@
+"""
+Tests for the pre-warmed Live session pool
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.session_pool import LiveSessionPool, PooledSession, bucket_key
+
+CONFIG = {
+    "speech_config": {
+        "voice_config": {"prebuilt_voice_config": {"voice_name": "Aoede"}},
+        "language_code": "es-US",
+    }
+}
+
+
+def make_pool(**overrides) -> LiveSessionPool:
+    options = {
+        "min_size": 2,
+        "max_size": 4,
+        "max_idle_seconds": 60.0,
+        "max_age_seconds": 540.0,
+        "refill_interval_seconds": 0.01,
+    }
+    options.update(overrides)
+    return LiveSessionPool(**options)
+
+
+@pytest.fixture
+def live_client(mocker):
+    """Client whose live.connect() returns a fresh context manager per call"""
+    client = mocker.Mock()
+
+    def connect(**_kwargs):
+        context_manager = AsyncMock()
+        context_manager.__aenter__.return_value = AsyncMock()
+        return context_manager
+
+    client.aio.live.connect = mocker.Mock(side_effect=connect)
+    return client
+
+
+def test_bucket_key_uses_model_voice_and_language():
+    """Test bucket key extraction from session config"""
+    assert bucket_key("model-x", CONFIG) == ("model-x", "Aoede", "es-US")
+    assert bucket_key("model-x", {}) == ("model-x", "", "")
+
+
+@pytest.mark.asyncio
+async def test_refill_opens_min_size_sessions(live_client):
+    """Test that refill warms each bucket up to min_size"""
+    pool = make_pool()
+    pool.register(live_client, "model-x", CONFIG)
+
+    await pool.refill()
+
+    assert pool.idle_count == 2
+    assert live_client.aio.live.connect.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_refill_respects_max_size(live_client):
+    """Test that the pool never holds more than max_size sessions"""
+    pool = make_pool(min_size=3, max_size=4)
+    pool.register(live_client, "model-x", CONFIG)
+    pool.register(live_client, "model-y", CONFIG)
+
+    await pool.refill()
+
+    assert pool.idle_count == 4
+
+
+@pytest.mark.asyncio
+async def test_checkout_hit_returns_warm_session(live_client):
+    """Test that checkout hands out a warm session and counts a hit"""
+    pool = make_pool()
+    pool.register(live_client, "model-x", CONFIG)
+    await pool.refill()
+
+    pooled = await pool.checkout(live_client, "model-x", CONFIG)
+
+    assert pooled is not None
+    assert pool.idle_count == 1
+    stats = pool.stats()
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_checkout_miss_registers_bucket(live_client):
+    """Test that a miss returns None and registers the bucket for warming"""
+    pool = make_pool()
+
+    pooled = await pool.checkout(live_client, "model-x", CONFIG)
+
+    assert pooled is None
+    assert pool.stats()["misses"] == 1
+    assert pool.stats()["buckets"] == 1
+
+
+@pytest.mark.asyncio
+async def test_checkout_skips_expired_sessions(live_client):
+    """Test that sessions past their idle age are closed, not handed out"""
+    pool = make_pool(max_idle_seconds=10.0)
+    pool.register(live_client, "model-x", CONFIG)
+    await pool.refill()
+    for pooled in pool._buckets[bucket_key("model-x", CONFIG)].idle:
+        pooled.opened_at -= 11.0
+
+    pooled = await pool.checkout(live_client, "model-x", CONFIG)
+
+    assert pooled is None
+    assert pool.stats()["evicted"] == 2
+
+
+@pytest.mark.asyncio
+async def test_evict_expired_closes_old_sessions(live_client):
+    """Test background eviction of sessions nearing their lifetime"""
+    pool = make_pool(max_age_seconds=30.0)
+    pool.register(live_client, "model-x", CONFIG)
+    await pool.refill()
+    bucket = pool._buckets[bucket_key("model-x", CONFIG)]
+    old = bucket.idle[0]
+    old.opened_at -= 31.0
+
+    await pool.evict_expired()
+
+    assert pool.idle_count == 1
+    old.context_manager.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_open_failure_is_counted(mocker, caplog):
+    """Test that failed warm-ups are logged and counted"""
+    client = mocker.Mock()
+    client.aio.live.connect = mocker.Mock(side_effect=Exception("quota"))
+    pool = make_pool()
+    pool.register(client, "model-x", CONFIG)
+
+    await pool.refill()
+
+    assert pool.idle_count == 0
+    assert pool.stats()["open_failures"] == 2
+    assert "failed to open a session" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_background_task_refills_after_checkout(live_client):
+    """Test that the maintenance task replaces checked-out sessions"""
+    pool = make_pool()
+    pool.register(live_client, "model-x", CONFIG)
+    pool.start()
+    try:
+        for _ in range(50):
+            if pool.idle_count == 2:
+                break
+            await asyncio.sleep(0.01)
+        await pool.checkout(live_client, "model-x", CONFIG)
+        for _ in range(50):
+            if pool.idle_count == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        assert pool.idle_count == 2
+        assert pool.stats()["opened"] == 3
+    finally:
+        await pool.stop()
+
+    assert pool.idle_count == 0
+
+
+@pytest.mark.asyncio
+async def test_close_errors_are_logged(caplog):
+    """Test that errors closing a pooled session are swallowed"""
+    context_manager = AsyncMock()
+    context_manager.__aexit__.side_effect = Exception("already closed")
+    pool = make_pool()
+
+    await pool._close(PooledSession(context_manager, AsyncMock()))
+
+    assert "Error closing pooled session" in caplog.text
+
+
+# GeminiLiveService integration
+
+
+@pytest.mark.asyncio
+async def test_service_connect_uses_warm_session(mock_gemini_api_key, mocker):
+    """Test that connect() checks out a warm session when the pool is enabled"""
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.session_pool_enabled", True)
+    pooled = PooledSession(AsyncMock(), AsyncMock())
+    checkout = mocker.patch(
+        "app.services.gemini_live.session_pool.checkout",
+        AsyncMock(return_value=pooled),
+    )
+
+    service = GeminiLiveService()
+    service.client.aio.live.connect = mocker.Mock()
+
+    assert await service.connect() is True
+    assert service.session is pooled.session
+    assert service._session_opened_at == pooled.opened_at
+    checkout.assert_awaited_once()
+    service.client.aio.live.connect.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_service_connect_falls_back_on_miss(mock_gemini_api_key, mocker):
+    """Test that connect() opens a new session when the pool misses"""
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.session_pool_enabled", True)
+    mocker.patch(
+        "app.services.gemini_live.session_pool.checkout",
+        AsyncMock(return_value=None),
+    )
+    context_manager = AsyncMock()
+    service = GeminiLiveService()
+    service.client.aio.live.connect = mocker.Mock(return_value=context_manager)
+
+    assert await service.connect() is True
+    service.client.aio.live.connect.assert_called_once()
@@ -0,0 +1,184 @@
+"""
+Tests for session recording
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from google.genai import types
+
+from app.services.session_recorder import (
+    MAGIC,
+    RecordKind,
+    SessionRecorder,
+    read_records,
+)
+
+FRAME = b"\x01\x02" * 512
+MESSAGE = types.LiveServerMessage(
+    server_content=types.LiveServerContent(
+        model_turn=types.Content(
+            parts=[types.Part(inline_data=types.Blob(data=b"\x00\xff" * 8))]
+        )
+    )
+)
+
+
+async def test_records_round_trip(tmp_path):
+    """Test that every record kind reads back with ordered timestamps"""
+    recorder = SessionRecorder(tmp_path / "session.glrec")
+    recorder.open({"model": "test-model"})
+    recorder.record(RecordKind.AUDIO_IN, FRAME)
+    recorder.record(RecordKind.CONTROL, {"type": "activity_end", "source": "client"})
+    recorder.record(RecordKind.SERVER_MESSAGE, MESSAGE)
+    await recorder.close()
+
+    records = list(read_records(recorder.path))
+
+    assert [record.kind for record in records] == list(RecordKind)
+    assert records[0].json()["model"] == "test-model"
+    assert records[1].payload == FRAME
+    assert records[2].json() == {"type": "activity_end", "source": "client"}
+    assert records[3].server_message() == MESSAGE
+    timestamps = [record.timestamp for record in records]
+    assert timestamps == sorted(timestamps)
+
+
+async def test_writes_are_batched(tmp_path):
+    """Test that records stay in memory until the buffer fills"""
+    recorder = SessionRecorder(tmp_path / "session.glrec", buffer_bytes=4 * len(FRAME))
+    recorder.open({})
+    for _ in range(3):
+        recorder.record(RecordKind.AUDIO_IN, FRAME)
+    assert recorder._last_write is None
+
+    recorder.record(RecordKind.AUDIO_IN, FRAME)
+    await recorder._last_write
+
+    assert len(list(read_records(recorder.path))) == 5
+    await recorder.close()
+
+
+async def test_reused_buffers_are_copied(tmp_path):
+    """Test that a bytearray payload is captured at record time"""
+    recorder = SessionRecorder(tmp_path / "session.glrec")
+    recorder.open({})
+    buffer = bytearray(FRAME)
+    recorder.record(RecordKind.AUDIO_IN, buffer)
+    buffer[:] = bytes(len(buffer))
+    await recorder.close()
+
+    assert list(read_records(recorder.path))[1].payload == FRAME
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    """Test that a record cut short by a crash ends the read cleanly"""
+    path = tmp_path / "session.glrec"
+    from app.services.session_recorder import RECORD_HEADER
+
+    path.write_bytes(
+        MAGIC
+        + RECORD_HEADER.pack(RecordKind.AUDIO_IN, 0.5, 4)
+        + b"abcd"
+        + RECORD_HEADER.pack(RecordKind.AUDIO_IN, 0.6, 4)
+        + b"ab"
+    )
+
+    assert [record.payload for record in read_records(path)] == [b"abcd"]
+
+
+def test_rejects_other_files(tmp_path):
+    """Test that a file without the magic prefix is refused"""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"RIFF....")
+
+    with pytest.raises(ValueError):
+        list(read_records(path))
+
+
+async def test_write_errors_stop_recording_without_raising(tmp_path, caplog):
+    """Test that a failed write is logged and the file still gets closed"""
+    recorder = SessionRecorder(tmp_path / "session.glrec", buffer_bytes=len(FRAME))
+    recorder.open({})
+    file = recorder._file
+    file.close()  # Every write now fails
+
+    recorder.record(RecordKind.AUDIO_IN, FRAME)
+    await asyncio.wait((recorder._last_write,))
+    recorder.record(RecordKind.AUDIO_IN, FRAME)
+    await recorder.close()
+
+    assert recorder._failed
+    assert recorder.records == 2  # Metadata and the first frame only
+    assert "no longer recording" in caplog.text
+
+
+def test_record_before_open_is_ignored(tmp_path):
+    """Test that nothing is kept before the session is connected"""
+    recorder = SessionRecorder(tmp_path / "session.glrec")
+    recorder.record(RecordKind.AUDIO_IN, FRAME)
+
+    assert recorder.records == 0
+    assert not recorder.path.exists()
+
+
+async def test_service_records_session(mock_gemini_api_key, mocker, tmp_path):
+    """Test that GeminiLiveService captures uplink, signals and server messages"""
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.session_recording_enabled", True)
+    mocker.patch("app.services.gemini_live.settings.session_recording_dir", tmp_path)
+    service = GeminiLiveService()
+    session = AsyncMock()
+    context_manager = AsyncMock()
+    context_manager.__aenter__.return_value = session
+    service.client = mocker.Mock()
+    service.client.aio.live.connect.return_value = context_manager
+
+    async def receive():
+        yield MESSAGE
+
+    session.receive = receive
+    await service.connect()
+    await service.send_activity_start()
+    await service.send_audio(FRAME)
+    await service.send_activity_end()
+    responses = service.receive_responses()
+    await anext(responses)
+    await responses.aclose()
+    await service.disconnect()
+
+    (path,) = tmp_path.glob("*.glrec")
+    kinds = [record.kind for record in read_records(path)]
+    assert kinds == [
+        RecordKind.METADATA,
+        RecordKind.CONTROL,
+        RecordKind.AUDIO_IN,
+        RecordKind.CONTROL,
+        RecordKind.SERVER_MESSAGE,
+    ]
+
+
+async def test_service_closes_upstream_before_recording(
+    mock_gemini_api_key, mocker, tmp_path
+):
+    """Test that the recorder is closed only once the Live session is"""
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.session_recording_enabled", True)
+    mocker.patch("app.services.gemini_live.settings.session_recording_dir", tmp_path)
+    service = GeminiLiveService()
+    context_manager = AsyncMock()
+    service.session = AsyncMock()
+    service._context_manager = context_manager
+    upstream_closed_first = []
+
+    async def close():
+        upstream_closed_first.append(context_manager.__aexit__.await_count == 1)
+
+    mocker.patch.object(service._recorder, "close", side_effect=close)
+
+    await service.disconnect()
+
+    assert upstream_closed_first == [True]
@@ -0,0 +1,126 @@
+"""
+Tests for session rollover: the conversation transcript and successor switchover
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.gemini_live import GeminiLiveService
+from app.services.live_events import LiveEvent
+from app.services.session_rollover import ConversationTranscript, Successor
+
+
+def turn(user: str, model: str) -> list[LiveEvent]:
+    return [
+        LiveEvent(input_transcription=user),
+        LiveEvent(output_transcription=model),
+        LiveEvent(turn_complete=True),
+    ]
+
+
+def test_transcript_joins_fragments_per_turn():
+    """Test that transcription fragments become one user and one model turn"""
+    transcript = ConversationTranscript(max_turns=10)
+    for event in [
+        LiveEvent(input_transcription="hola, "),
+        LiveEvent(input_transcription="¿qué tal?"),
+        LiveEvent(output_transcription="muy "),
+        LiveEvent(output_transcription="bien"),
+        LiveEvent(turn_complete=True),
+    ]:
+        transcript.add(event)
+
+    assert transcript.since(0) == [
+        {"role": "user", "parts": [{"text": "hola, ¿qué tal?"}]},
+        {"role": "model", "parts": [{"text": "muy bien"}]},
+    ]
+
+
+def test_transcript_returns_only_new_turns():
+    """Test that since() skips turns a successor has already seen"""
+    transcript = ConversationTranscript(max_turns=10)
+    for event in turn("uno", "one"):
+        transcript.add(event)
+    seen = transcript.closed
+    for event in turn("dos", "two"):
+        transcript.add(event)
+
+    assert [content["parts"][0]["text"] for content in transcript.since(seen)] == [
+        "dos",
+        "two",
+    ]
+    assert transcript.since(transcript.closed) == []
+
+
+def test_transcript_keeps_the_last_turns():
+    """Test that old turns are dropped beyond max_turns"""
+    transcript = ConversationTranscript(max_turns=2)
+    for index in range(3):
+        for event in turn(f"u{index}", f"m{index}"):
+            transcript.add(event)
+
+    assert [content["parts"][0]["text"] for content in transcript.since(0)] == [
+        "u2",
+        "m2",
+    ]
+
+
+@pytest.fixture
+def rollover_service(mock_gemini_api_key, mocker):
+    """Connected service with an open successor waiting to take over"""
+    mocker.patch("app.services.gemini_live.settings.session_rollover_enabled", True)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    service._context_manager = AsyncMock()
+    service._successor = Successor(AsyncMock(), AsyncMock(), 0.0, None, 0)
+    service._rollover_trigger = "go_away"
+    mocker.patch.object(service, "_schedule_rollover")
+    return service
+
+
+@pytest.mark.asyncio
+async def test_next_turn_starts_on_the_successor(rollover_service):
+    """Test that a caller turn at a turn boundary goes to the successor"""
+    old_session = rollover_service.session
+    successor = rollover_service._successor
+    for event in turn("hola", "hola, ¿en qué te ayudo?"):
+        rollover_service._transcript.add(event)
+
+    await rollover_service.send_activity_start()
+    await rollover_service.disconnect()
+
+    assert rollover_service._successor is None
+    successor.session.send_realtime_input.assert_awaited_once()
+    old_session.send_realtime_input.assert_not_awaited()
+    warmed = successor.session.send_client_content.await_args.kwargs
+    assert warmed["turn_complete"] is False
+    assert len(warmed["turns"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_successor_waits_while_the_model_answers(rollover_service):
+    """Test that a barge-in during a model turn stays on the current session"""
+    rollover_service._turn_open = True  # Model turn not complete yet
+    old_session = rollover_service.session
+
+    await rollover_service.send_activity_start()
+
+    assert rollover_service.session is old_session
+    assert rollover_service._successor is not None
+    old_session.send_realtime_input.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stale_handle_successor_is_reopened(rollover_service, mocker):
+    """Test that a successor opened with an outdated handle is replaced"""
+    rollover_service._successor.handle = "handle-1"
+    rollover_service._resumption_handle = "handle-2"
+    roll_over = mocker.patch.object(rollover_service, "_roll_over")
+    old_session = rollover_service.session
+
+    await rollover_service._switch_over()
+
+    assert rollover_service.session is old_session
+    assert rollover_service._successor is None
+    roll_over.assert_called_once_with(0.0, "go_away")
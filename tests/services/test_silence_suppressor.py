@@ -0,0 +1,114 @@
+"""
+Tests for uplink silence suppression
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.silence_suppressor import SilenceSuppressor, silence_totals
+
+# 32ms frames at 16 kHz
+QUIET = b"\x00\x00" * 512
+LOUD = b"\xff\x7f\x00\x80" * 256
+
+
+def make_suppressor(**overrides) -> SilenceSuppressor:
+    options = {"rms_threshold": 300.0, "hangover_ms": 64.0}  # Two frames
+    options.update(overrides)
+    return SilenceSuppressor(**options)
+
+
+def test_speech_and_short_pauses_pass_through():
+    """Test that loud frames and silence within the hangover are forwarded"""
+    suppressor = make_suppressor()
+
+    assert suppressor.process(LOUD) == [LOUD]
+    assert suppressor.process(QUIET) == [QUIET]
+    assert suppressor.process(QUIET) == [QUIET]
+    assert suppressor.bytes_saved == 0
+
+
+def test_sustained_silence_is_dropped():
+    """Test that silence beyond the hangover is not forwarded"""
+    suppressor = make_suppressor()
+    for _ in range(2):
+        suppressor.process(QUIET)
+
+    assert [suppressor.process(QUIET) for _ in range(5)] == [[]] * 5
+    assert suppressor.bytes_saved == 5 * len(QUIET)
+
+
+def test_onset_preroll_is_sent_before_speech():
+    """Test that the last hangover of silence precedes the next loud frame"""
+    suppressor = make_suppressor()
+    for _ in range(10):
+        suppressor.process(QUIET)
+
+    assert suppressor.process(LOUD) == [QUIET, QUIET, LOUD]
+    assert suppressor.bytes_saved == 6 * len(QUIET)
+
+
+def test_marker_mode_sends_one_short_marker():
+    """Test that marker mode replaces a silent stretch with a short block"""
+    suppressor = make_suppressor(mode="marker", marker_ms=20.0)
+    for _ in range(2):
+        suppressor.process(QUIET)
+
+    assert suppressor.process(QUIET) == [bytes(640)]
+    assert suppressor.process(QUIET) == []
+    assert suppressor.markers == 1
+    assert suppressor.bytes_saved == 2 * len(QUIET) - 640
+
+
+def test_reset_starts_a_new_stretch():
+    """Test that activity boundaries restart the hangover"""
+    suppressor = make_suppressor()
+    for _ in range(5):
+        suppressor.process(QUIET)
+
+    suppressor.reset()
+
+    assert suppressor.process(QUIET) == [QUIET]
+
+
+def test_ttfr_is_split_by_turn_kind(mocker):
+    """Test that time-to-first-response is recorded for suppressed turns"""
+    clock = mocker.patch("app.services.silence_suppressor.time.monotonic")
+    clock.return_value = 5.0
+    suppressor = make_suppressor()
+    count_before = silence_totals.suppressed_turn_count
+    total_before = silence_totals.suppressed_turn_ttfr_seconds_total
+    for _ in range(4):
+        suppressor.process(QUIET)
+
+    suppressor.record_activity_end()
+    clock.return_value = 5.25
+    suppressor.record_first_response()
+    suppressor.record_first_response()  # Only the first response counts
+
+    assert silence_totals.suppressed_turn_count == count_before + 1
+    assert silence_totals.suppressed_turn_ttfr_seconds_total - total_before == (
+        pytest.approx(0.25)
+    )
+
+
+@pytest.mark.asyncio
+async def test_service_skips_sustained_silence(mock_gemini_api_key, mocker):
+    """Test that GeminiLiveService only forwards audio the suppressor keeps"""
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.silence_suppression_enabled", True)
+    mocker.patch("app.services.gemini_live.settings.silence_hangover_ms", 64.0)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+
+    for frame in [LOUD] + [QUIET] * 8 + [LOUD]:
+        await service.send_audio(frame)
+
+    sent = [
+        call.kwargs["audio"]["data"]
+        for call in service.session.send_realtime_input.await_args_list
+    ]
+    assert sent == [LOUD, QUIET, QUIET, QUIET, QUIET, LOUD]
+    assert service._silence.bytes_saved == 4 * len(QUIET)
@@ -0,0 +1,104 @@
+"""
+Tests for speculative activity starts
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.speculative_activity import SpeculativeActivity, speculation_totals
+
+FRAME = b"\x01" * 1024  # 32 ms at 16 kHz
+
+
+def test_ready_after_hold_bytes():
+    """Test that a pending activity is confirmed once hold_ms of audio arrived"""
+    speculation = SpeculativeActivity(hold_ms=64, sample_rate=16000)
+    speculation.start(1000)
+
+    assert not speculation.ready(1000 + 2047)
+    assert speculation.ready(1000 + 2048)
+    assert speculation.confirm() == 1000
+    assert not speculation.pending
+
+
+def test_cancel_counts_saved_bytes_and_turns():
+    """Test that cancelled activities are counted per session and process-wide"""
+    before = speculation_totals.stats()
+    speculation = SpeculativeActivity(hold_ms=64)
+    speculation.start(0)
+
+    speculation.cancel(512)
+
+    after = speculation_totals.stats()
+    assert speculation.stats() == {"confirmed": 0, "cancelled": 1, "bytes_saved": 512}
+    assert after["turns_saved"] == before["turns_saved"] + 1
+    assert after["bytes_saved"] == before["bytes_saved"] + 512
+
+
+@pytest.fixture
+def speculative_service(mock_gemini_api_key, mocker):
+    """Service holding client activities for 64 ms (two frames)"""
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.speculative_hold_ms", 64.0)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    return service
+
+
+def upstream(service) -> list[str]:
+    return [
+        next(iter(call.kwargs))
+        for call in service.session.send_realtime_input.await_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_activity_is_sent_once_speech_is_confirmed(speculative_service):
+    """Test that activity_start and the held audio go out after hold_ms"""
+    await speculative_service.send_activity_start()
+    await speculative_service.send_audio(FRAME)
+    assert upstream(speculative_service) == []
+
+    await speculative_service.send_audio(FRAME)  # Completes the 64 ms hold
+
+    assert upstream(speculative_service) == ["activity_start", "audio", "audio"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_activity_never_reaches_gemini(speculative_service):
+    """Test that activity_cancel drops the held activity and its audio"""
+    await speculative_service.send_activity_start()
+    await speculative_service.send_audio(FRAME)
+
+    await speculative_service.send_activity_cancel()
+    await speculative_service.send_audio(FRAME)
+    await speculative_service.send_audio(FRAME)
+
+    assert upstream(speculative_service) == []
+    assert speculative_service._speculation.stats()["bytes_saved"] == len(FRAME)
+
+
+@pytest.mark.asyncio
+async def test_short_speech_is_sent_on_activity_end(speculative_service):
+    """Test that activity_end during the hold sends the whole activity"""
+    await speculative_service.send_activity_start()
+    await speculative_service.send_audio(FRAME)
+
+    await speculative_service.send_activity_end()
+
+    assert upstream(speculative_service) == ["activity_start", "audio", "activity_end"]
+
+
+@pytest.mark.asyncio
+async def test_late_cancel_closes_the_activity(speculative_service):
+    """Test that a cancel after confirmation ends the forwarded activity"""
+    await speculative_service.send_activity_start()
+    for _ in range(3):
+        await speculative_service.send_audio(FRAME)
+
+    await speculative_service.send_activity_cancel()
+
+    assert upstream(speculative_service)[-1] == "activity_end"
+    assert not speculative_service._in_activity
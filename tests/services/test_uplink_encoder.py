@@ -0,0 +1,158 @@
+"""
+Tests for the preallocated uplink audio encoder and sender
+"""
+
+import base64
+import json
+import tracemalloc
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from google.genai import live
+
+from app.services.client_pool import client_pool
+from app.services.gemini_live import GeminiLiveService
+from app.services.uplink_encoder import (
+    SDK_VERSION_TESTED,
+    AudioSender,
+    RealtimeAudioEncoder,
+)
+
+FRAME = bytes(range(256)) * 4  # One 512-sample frame of 16 kHz PCM
+# Bytes allocated while one frame is forwarded: base64 text plus websockets'
+# framing. The SDK's per-message models cost roughly twice this.
+FRAME_ALLOC_BUDGET = 4096
+
+# Sessions only use the encoder on google-genai releases it was checked against
+requires_tested_sdk = pytest.mark.skipif(
+    not SDK_VERSION_TESTED, reason="google-genai release not in TESTED_SDK_VERSIONS"
+)
+
+
+class DiscardingSocket:
+    """Socket under a real AsyncSession; keeps the last text frame if asked"""
+
+    def __init__(self, keep: bool = False) -> None:
+        self.keep = keep
+        self.last: bytes | None = None
+        self.frames = 0
+
+    async def send(self, message, text: bool | None = None) -> None:
+        assert text is True or isinstance(message, str)
+        self.frames += 1
+        if self.keep:
+            self.last = message.encode() if isinstance(message, str) else bytes(message)
+
+
+def live_session(socket: DiscardingSocket, vertexai: bool = False) -> live.AsyncSession:
+    client = client_pool.get("test-api-key-for-testing", "test-model")
+    api_client = client.aio._api_client
+    if vertexai:
+        api_client = Mock(wraps=api_client, vertexai=True)
+    return live.AsyncSession(api_client=api_client, websocket=socket)
+
+
+def decoded(message: bytes, b64decode) -> dict:
+    """A realtime_input message with its audio data base64-decoded"""
+    parsed = json.loads(message)
+    audio = parsed["realtime_input"]["audio"]
+    audio["data"] = b64decode(audio["data"])
+    return parsed
+
+
+def test_encoder_writes_realtime_input_message():
+    """Test that the encoded message carries the PCM and the mime type"""
+    encoder = RealtimeAudioEncoder("audio/pcm;rate=16000")
+
+    message = json.loads(bytes(encoder.encode(FRAME)))
+
+    audio = message["realtime_input"]["audio"]
+    assert base64.b64decode(audio["data"]) == FRAME
+    assert audio["mime_type"] == "audio/pcm;rate=16000"
+
+
+def test_encoder_grows_for_larger_frames():
+    """Test that frames bigger than the initial buffer are encoded whole"""
+    encoder = RealtimeAudioEncoder("audio/pcm;rate=16000", initial_pcm_bytes=16)
+    small = encoder.encode(b"\x01" * 8)
+    small_text = bytes(small)
+
+    large = json.loads(bytes(encoder.encode(FRAME * 8)))
+
+    assert base64.b64decode(large["realtime_input"]["audio"]["data"]) == FRAME * 8
+    assert bytes(small) == small_text  # Earlier views keep the old buffer
+
+
+@requires_tested_sdk
+async def test_sender_writes_to_the_socket_of_sdk_sessions():
+    """Test that real SDK sessions get the encoded message on their socket"""
+    socket = DiscardingSocket(keep=True)
+    sender = AudioSender(live_session(socket), 16000)
+
+    await sender.send(memoryview(FRAME))
+
+    audio = json.loads(socket.last)["realtime_input"]["audio"]
+    assert base64.b64decode(audio["data"]) == FRAME
+
+
+@requires_tested_sdk
+async def test_encoder_matches_the_sdk_serializer():
+    """Test that the encoder sends what send_realtime_input would, but for base64"""
+    ours, sdks = DiscardingSocket(keep=True), DiscardingSocket(keep=True)
+    mime_type = "audio/pcm;rate=16000"
+
+    await AudioSender(live_session(ours), 16000).send(FRAME)
+    await live_session(sdks).send_realtime_input(
+        audio={"data": FRAME, "mime_type": mime_type}
+    )
+
+    assert decoded(ours.last, base64.b64decode) == decoded(
+        sdks.last, base64.urlsafe_b64decode
+    )
+
+
+async def test_vertex_and_untested_sdk_sessions_use_the_sdk(mocker):
+    """Test that the encoder is only used where it was checked against the SDK"""
+    vertex = AudioSender(live_session(DiscardingSocket(), vertexai=True), 16000)
+    mocker.patch("app.services.uplink_encoder.SDK_VERSION_TESTED", False)
+    untested = AudioSender(live_session(DiscardingSocket()), 16000)
+
+    assert vertex._encoder is None
+    assert untested._encoder is None
+
+
+async def test_sender_falls_back_to_send_realtime_input():
+    """Test that other sessions receive bytes and the prebuilt mime type"""
+    session = AsyncMock()
+    sender = AudioSender(session, 16000)
+
+    await sender.send(memoryview(FRAME))
+
+    session.send_realtime_input.assert_called_once_with(
+        audio={"data": FRAME, "mime_type": "audio/pcm;rate=16000"}
+    )
+
+
+@requires_tested_sdk
+async def test_forwarded_frame_allocations_stay_within_budget(mock_gemini_api_key):
+    """Test that bytes allocated per forwarded frame stay below the budget"""
+    socket = DiscardingSocket()
+    service = GeminiLiveService()
+    service.session = live_session(socket)
+    for _ in range(20):  # Warm-up: sender, encoder buffer, metrics labels
+        await service.send_audio(FRAME)
+
+    frames = 200
+    allocated = 0
+    tracemalloc.start()
+    try:
+        for _ in range(frames):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await service.send_audio(memoryview(FRAME))
+            allocated += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    assert socket.frames == frames + 20
+    assert allocated / frames < FRAME_ALLOC_BUDGET
@@ -0,0 +1,169 @@
+"""
+Tests for the bounded uplink queue
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.uplink_queue import (
+    OverflowPolicy,
+    UplinkClosedError,
+    UplinkQueue,
+    aggregate_stats,
+)
+
+SILENCE = b"\x00\x00" * 512
+SPEECH = b"\xff\x7f\x00\x80" * 256  # Full-scale square wave
+
+
+async def drain(queue: UplinkQueue) -> list:
+    items = []
+    await queue.close()
+    while True:
+        try:
+            items.append(await queue.get())
+        except UplinkClosedError:
+            return items
+
+
+@pytest.mark.asyncio
+async def test_items_keep_fifo_order():
+    """Test that audio and control messages keep their relative order"""
+    queue = UplinkQueue(maxsize=10)
+
+    await queue.put_control("activity_start")
+    await queue.put_audio(SPEECH)
+    await queue.put_control("activity_end")
+
+    kinds = [item.kind for item in await drain(queue)]
+    assert kinds == ["activity_start", "audio", "activity_end"]
+
+
+@pytest.mark.asyncio
+async def test_get_raises_when_closed_and_empty():
+    """Test that the writer is released once the queue is closed"""
+    queue = UplinkQueue(maxsize=2)
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+
+    await queue.close()
+
+    with pytest.raises(UplinkClosedError):
+        await getter
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_room():
+    """Test that a full queue blocks producers under the block policy"""
+    queue = UplinkQueue(maxsize=1, policy=OverflowPolicy.BLOCK)
+    await queue.put_audio(SPEECH)
+
+    producer = asyncio.create_task(queue.put_audio(SPEECH))
+    await asyncio.sleep(0.01)
+    assert not producer.done()
+
+    await queue.get()
+    await asyncio.wait_for(producer, timeout=1)
+    assert queue.depth == 1
+    assert queue.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_discards_oldest_audio():
+    """Test that drop_oldest evicts the oldest audio frame, not control"""
+    queue = UplinkQueue(maxsize=2, policy=OverflowPolicy.DROP_OLDEST)
+    await queue.put_control("activity_start")
+    await queue.put_audio(b"\x01\x00")
+
+    await queue.put_audio(b"\x02\x00")
+
+    items = await drain(queue)
+    assert [item.kind for item in items] == ["activity_start", "audio"]
+    assert items[1].payload == b"\x02\x00"
+    assert queue.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_blocks_when_only_control_queued():
+    """Test that control messages are never dropped"""
+    queue = UplinkQueue(maxsize=1, policy=OverflowPolicy.DROP_OLDEST)
+    await queue.put_control("activity_start")
+
+    producer = asyncio.create_task(queue.put_audio(SPEECH))
+    await asyncio.sleep(0.01)
+    assert not producer.done()
+
+    await queue.get()
+    await asyncio.wait_for(producer, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_drop_silence_prefers_silent_frames():
+    """Test that silent frames are dropped before speech"""
+    queue = UplinkQueue(
+        maxsize=2, policy=OverflowPolicy.DROP_SILENCE, silence_rms_threshold=300
+    )
+    await queue.put_audio(SPEECH)
+    await queue.put_audio(SILENCE)
+
+    await queue.put_audio(SPEECH)
+
+    items = await drain(queue)
+    assert [item.silent for item in items] == [False, False]
+    assert queue.dropped_silence == 1
+
+
+@pytest.mark.asyncio
+async def test_drop_silence_discards_incoming_silence():
+    """Test that incoming silence is dropped when only speech is queued"""
+    queue = UplinkQueue(
+        maxsize=2, policy=OverflowPolicy.DROP_SILENCE, silence_rms_threshold=300
+    )
+    await queue.put_audio(SPEECH)
+    await queue.put_audio(SPEECH)
+
+    await queue.put_audio(SILENCE)
+
+    assert queue.depth == 2
+    assert queue.dropped_silence == 1
+
+
+@pytest.mark.asyncio
+async def test_drop_silence_falls_back_to_oldest():
+    """Test that speech is dropped oldest-first when no silence is available"""
+    queue = UplinkQueue(
+        maxsize=1, policy=OverflowPolicy.DROP_SILENCE, silence_rms_threshold=300
+    )
+    await queue.put_audio(b"\x01\x00" * 4 + SPEECH)
+
+    await queue.put_audio(SPEECH)
+
+    items = await drain(queue)
+    assert items[0].payload == SPEECH
+    assert queue.dropped == 1
+    assert queue.dropped_silence == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_track_depth_and_latency():
+    """Test per-session counters and process-wide aggregation"""
+    queue = UplinkQueue(maxsize=4)
+    await queue.put_audio(SPEECH)
+    await queue.put_audio(SPEECH)
+
+    item = await queue.get()
+    queue.record_sent(item)
+
+    stats = queue.stats()
+    assert stats["depth"] == 1
+    assert stats["max_depth"] == 2
+    assert stats["sent"] == 1
+    assert stats["send_latency_ms_max"] >= 0.0
+    assert aggregate_stats()["active_queues"] >= 1
+
+
+def test_invalid_policy_raises():
+    """Test that unknown policies are rejected"""
+    with pytest.raises(ValueError):
+        UplinkQueue(maxsize=1, policy="drop_everything")
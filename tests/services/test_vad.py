@@ -0,0 +1,222 @@
+"""
+Tests for the server-side voice activity detection engine
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from app.exceptions import ConfigurationError
+from app.services.vad import (
+    VAD_FRAME_SAMPLES,
+    EnergyVAD,
+    SileroVAD,
+    VADBatcher,
+    VADEvent,
+    VoiceActivityDetector,
+    create_backend,
+    detect_batch,
+)
+
+RNG = np.random.default_rng(7)
+TIME = np.arange(VAD_FRAME_SAMPLES) / 16000
+SPEECH = (np.sin(2 * np.pi * 220 * TIME) * 8000).astype(np.int16)
+SILENCE = np.zeros(VAD_FRAME_SAMPLES, dtype=np.int16)
+HISS = RNG.choice([-700, 700], VAD_FRAME_SAMPLES).astype(np.int16)
+
+
+def make_detector(backend=None, **overrides) -> VoiceActivityDetector:
+    options = {"min_speech_ms": 96.0, "redemption_ms": 96.0}  # 3 frames each
+    options.update(overrides)
+    return VoiceActivityDetector(backend or EnergyVAD(500.0, 0.35), **options)
+
+
+def test_energy_backend_scores_frames():
+    """Test that speech scores high and silence/hiss score low"""
+    backend = EnergyVAD(energy_threshold=500.0, max_zero_crossing_rate=0.35)
+
+    scores = backend.probabilities(np.stack([SPEECH, SILENCE, HISS]), [None] * 3)
+
+    assert scores[0] > 0.9
+    assert scores[1] < 0.01
+    assert scores[2] < 0.5
+
+
+def test_detector_emits_start_and_end():
+    """Test hysteresis: start on speech, end after the redemption period"""
+    detector = make_detector()
+
+    events = detector.advance([0.9] * 5 + [0.1] * 3)
+
+    assert events == [VADEvent.START, VADEvent.END]
+    assert detector.speaking is False
+    assert detector.speech_segments == 1
+
+
+def test_detector_reports_short_speech_as_misfire():
+    """Test that speech shorter than min_speech_ms is a misfire"""
+    detector = make_detector()
+
+    events = detector.advance([0.9, 0.1, 0.1, 0.1])
+
+    assert events == [VADEvent.START, VADEvent.MISFIRE]
+    assert detector.misfires == 1
+
+
+def test_detector_keeps_speaking_between_thresholds():
+    """Test that probabilities above the negative threshold continue speech"""
+    detector = make_detector()
+
+    assert detector.advance([0.9] + [0.4] * 10) == [VADEvent.START]
+    assert detector.speaking is True
+
+
+@pytest.mark.asyncio
+async def test_process_reframes_arbitrary_chunks():
+    """Test that partial frames are carried over to the next call"""
+    detector = make_detector()
+    data = SPEECH.tobytes()
+
+    assert await detector.process(data[:600]) == []
+    assert await detector.process(data[600:]) == [VADEvent.START]
+    assert detector.frames == 1
+
+
+def test_detect_batch_matches_per_session_results():
+    """Test that one vectorized call gives the same events as separate calls"""
+    backend = EnergyVAD(500.0, 0.35)
+    batched = [make_detector(backend) for _ in range(3)]
+    single = [make_detector(backend) for _ in range(3)]
+    frames = np.stack([SPEECH, SILENCE, SPEECH])
+
+    results = detect_batch(batched, frames)
+
+    expected = [
+        detector.advance(backend.probabilities(frame[None, :], [None]))
+        for detector, frame in zip(single, frames, strict=True)
+    ]
+    assert results == expected == [[VADEvent.START], [], [VADEvent.START]]
+
+
+@pytest.mark.asyncio
+async def test_batcher_scores_sessions_together():
+    """Test that frames from concurrent sessions share one backend call"""
+    backend = EnergyVAD(500.0, 0.35)
+    batcher = VADBatcher(window_ms=5.0)
+    detectors = [make_detector(backend) for _ in range(4)]
+
+    results = await asyncio.gather(
+        *(batcher.process(detector, SPEECH.tobytes()) for detector in detectors)
+    )
+
+    assert results == [[VADEvent.START]] * 4
+    assert batcher.batches == 1
+    assert batcher.frames == 4
+
+
+def fake_silero_session(probability: float) -> MagicMock:
+    session = MagicMock()
+
+    def run(_outputs, feeds):
+        batch = feeds["input"].shape[0]
+        assert feeds["state"].shape == (2, batch, 128)
+        return [np.full((batch, 1), probability), feeds["state"] + 1]
+
+    session.run.side_effect = run
+    return session
+
+
+@pytest.mark.asyncio
+async def test_silero_backend_runs_in_executor_and_keeps_state():
+    """Test Silero inference through the thread pool with per-session state"""
+    detector = make_detector(SileroVAD("unused", session=fake_silero_session(0.8)))
+
+    events = await detector.process(np.concatenate([SPEECH, SPEECH]).tobytes())
+
+    assert events == [VADEvent.START]
+    assert detector.state.shape == (2, 1, 128)
+    assert float(detector.state[0, 0, 0]) == 2.0  # Advanced once per frame
+
+
+@pytest.mark.asyncio
+async def test_silero_batches_states_across_sessions():
+    """Test that batched Silero calls stack and split per-session states"""
+    backend = SileroVAD("unused", session=fake_silero_session(0.8))
+    batcher = VADBatcher(window_ms=5.0)
+    detectors = [make_detector(backend) for _ in range(2)]
+
+    await asyncio.gather(
+        *(batcher.process(detector, SPEECH.tobytes()) for detector in detectors)
+    )
+
+    assert all(float(detector.state[1, 0, 5]) == 1.0 for detector in detectors)
+    assert backend._session.run.call_count == 1
+
+
+def test_silero_without_onnxruntime_is_configuration_error(monkeypatch):
+    """Test that the optional dependency is reported clearly"""
+    monkeypatch.setitem(__import__("sys").modules, "onnxruntime", None)
+
+    with pytest.raises(ConfigurationError, match="onnxruntime"):
+        create_backend("silero", 500.0, 0.35, "models/silero_vad.onnx")
+
+
+# GeminiLiveService integration
+
+
+@pytest.fixture
+def vad_service(mock_gemini_api_key, mocker):
+    from app.services.gemini_live import GeminiLiveService
+
+    mocker.patch("app.services.gemini_live.settings.server_vad_enabled", True)
+    mocker.patch("app.services.vad.settings.vad_min_speech_ms", 96.0)
+    mocker.patch("app.services.vad.settings.vad_redemption_ms", 96.0)
+    service = GeminiLiveService()
+    service.session = AsyncMock()
+    return service
+
+
+def signals(service) -> list[str]:
+    return [
+        next(iter(call.kwargs))
+        for call in service.session.send_realtime_input.await_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_service_opens_and_closes_activity_from_audio(vad_service):
+    """Test that raw PCM alone drives activity_start/activity_end"""
+    for frame in [SILENCE, SILENCE] + [SPEECH] * 4 + [SILENCE] * 3:
+        await vad_service.send_audio(frame.tobytes())
+
+    assert signals(vad_service) == [
+        "activity_start",
+        "audio",  # The first two speech frames, held until speech was confirmed
+        "audio",
+        "audio",
+        "audio",
+        "audio",
+        "audio",
+        "activity_end",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_service_drops_false_starts(vad_service):
+    """Test that speech shorter than min_speech_ms never reaches Gemini"""
+    for frame in [SILENCE] + [SPEECH] * 2 + [SILENCE] * 4:
+        await vad_service.send_audio(frame.tobytes())
+
+    assert vad_service._vad.misfires == 1
+    assert signals(vad_service) == []
+
+
+@pytest.mark.asyncio
+async def test_service_forwards_nothing_without_speech(vad_service):
+    """Test that silence outside an activity is not sent upstream"""
+    for _ in range(10):
+        await vad_service.send_audio(SILENCE.tobytes())
+
+    assert signals(vad_service) == []
@@ -145,3 +145,71 @@ def test_reload_string_values(monkeypatch, tmp_path):
     monkeypatch.setenv("RELOAD", "false")
     settings = Settings()
     assert settings.reload is False
+
+
+def test_session_pool_defaults(monkeypatch, tmp_path):
+    """Test that the session pool is opt-in with sane bounds"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+
+    settings = Settings()
+
+    assert settings.session_pool_enabled is False
+    assert settings.session_pool_min_size <= settings.session_pool_max_size
+    assert settings.session_pool_max_idle_seconds < settings.session_max_age_seconds
+
+
+def test_audio_coalesce_defaults(monkeypatch, tmp_path):
+    """Test that coalescing is opt-in and sized from AUDIO_CHUNK_SIZE frames"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("AUDIO_COALESCE_FRAMES", "10")
+
+    settings = Settings()
+
+    assert settings.audio_coalesce_enabled is False
+    assert settings.audio_coalesce_frames == 10
+    assert settings.audio_coalesce_max_hold_ms == 300.0
+
+
+def test_uplink_overflow_policy_validation(monkeypatch, tmp_path):
+    """Test that uplink overflow policies are validated case-insensitively"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+
+    monkeypatch.setenv("UPLINK_OVERFLOW_POLICY", "DROP_SILENCE")
+    assert Settings().uplink_overflow_policy == "drop_silence"
+
+    monkeypatch.setenv("UPLINK_OVERFLOW_POLICY", "drop_everything")
+    with pytest.raises(ValidationError, match="UPLINK_OVERFLOW_POLICY must be one of"):
+        Settings()
+
+
+def test_vad_backend_validation(monkeypatch, tmp_path):
+    """Test server VAD defaults and backend validation"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+
+    settings = Settings()
+    assert settings.server_vad_enabled is False
+    assert settings.vad_backend == "energy"
+
+    monkeypatch.setenv("VAD_BACKEND", "webrtc")
+    with pytest.raises(ValidationError, match="VAD_BACKEND must be one of"):
+        Settings()
+
+
+def test_silence_suppression_mode_validation(monkeypatch, tmp_path):
+    """Test silence suppression defaults and mode validation"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+
+    settings = Settings()
+    assert settings.silence_suppression_enabled is False
+    assert settings.silence_suppression_mode == "drop"
+
+    monkeypatch.setenv("SILENCE_SUPPRESSION_MODE", "comfort_noise")
+    with pytest.raises(
+        ValidationError, match="SILENCE_SUPPRESSION_MODE must be one of"
+    ):
+        Settings()
@@ -0,0 +1,165 @@
+"""
+Tests for runtime statistics endpoint
+"""
+
+
+def test_stats_returns_200(test_client):
+    """Test that stats endpoint returns 200 OK"""
+    response = test_client.get("/stats")
+    assert response.status_code == 200
+
+
+def test_stats_includes_client_pool(test_client, mock_gemini_api_key):
+    """Test that client pool reuse statistics are exposed"""
+    from app.services.gemini_live import GeminiLiveService
+
+    GeminiLiveService()
+    GeminiLiveService()
+
+    data = test_client.get("/stats").json()
+
+    assert data["client_pool"]["created"] == 1
+    assert data["client_pool"]["reused"] == 1
+
+
+def test_lifespan_closes_client_pool(mocker):
+    """Test that application shutdown closes shared clients"""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    aclose = mocker.patch("main.client_pool.aclose")
+
+    with TestClient(app):
+        pass
+
+    aclose.assert_awaited_once()
+
+
+def test_stats_includes_session_pool(test_client):
+    """Test that session pool hit rate and checkout latency are exposed"""
+    data = test_client.get("/stats").json()
+
+    assert "hit_rate" in data["session_pool"]
+    assert "checkout_latency_ms_avg" in data["session_pool"]
+
+
+def test_lifespan_starts_session_pool_when_enabled(mocker):
+    """Test that the lifespan warms the default bucket when pooling is on"""
+    from fastapi.testclient import TestClient
+
+    from app.services.gemini_live import live_connect_config
+    from main import app, settings
+
+    mocker.patch("main.settings.session_pool_enabled", True)
+    register = mocker.patch("main.session_pool.register")
+    start = mocker.patch("main.session_pool.start")
+    stop = mocker.patch("main.session_pool.stop")
+
+    with TestClient(app):
+        pass
+
+    register.assert_called_once()
+    _client, model, config = register.call_args.args
+    assert (model, config) == (settings.gemini_model, live_connect_config())
+    start.assert_called_once()
+    stop.assert_awaited_once()
+
+
+def test_stats_includes_uplink(test_client):
+    """Test that uplink queue depth, drops and latency are exposed"""
+    uplink = test_client.get("/stats").json()["uplink"]
+
+    assert {"depth", "dropped", "send_latency_ms_avg"} <= set(uplink)
+
+
+def test_stats_includes_downlink(test_client):
+    """Test that outbound lag and slow-consumer counters are exposed"""
+    downlink = test_client.get("/stats").json()["downlink"]
+
+    assert {"lag_ms_max", "slow_sessions", "dropped_audio"} <= set(downlink)
+
+
+def test_stats_includes_server_flush(test_client):
+    """Test that server flush counts and latency effect are exposed"""
+    server_flush = test_client.get("/stats").json()["server_flush"]
+
+    assert {"flushes", "flush_to_transcription_ms_avg"} <= set(server_flush)
+
+
+def test_stats_includes_silence_suppression(test_client):
+    """Test that bytes saved and time-to-first-response by turn kind are exposed"""
+    silence = test_client.get("/stats").json()["silence_suppression"]
+
+    assert {
+        "bytes_saved",
+        "ttfr_ms_avg_suppressed_turns",
+        "ttfr_ms_avg_plain_turns",
+    } <= set(silence)
+
+
+def test_latency_endpoint_filters_by_metric(test_client):
+    """Test that per-turn latency quantiles are queryable over HTTP"""
+    from app.services.latency import TurnMetric, latency_metrics
+
+    latency_metrics.clear()
+    latency_metrics.observe(TurnMetric.END_TO_AUDIO, "m/v/l", 0.5)
+    latency_metrics.observe(TurnMetric.END_TO_TRANSCRIPTION, "m/v/l", 0.2)
+
+    data = test_client.get(
+        "/latency", params={"metric": "activity_end_to_first_audio"}
+    ).json()
+
+    assert list(data["process"]) == ["activity_end_to_first_audio"]
+    assert data["by_config"]["m/v/l"]["activity_end_to_first_audio"]["p50_ms"] > 0
+
+
+def test_metrics_endpoint_exposes_prometheus_text(test_client):
+    """Test the /metrics exposition format and content type"""
+    response = test_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE gemini_live_websocket_sessions_active gauge" in response.text
+    assert "gemini_live_uplink_queue_depth" in response.text
+    assert "process_resident_memory_bytes" in response.text
+
+
+def test_stats_includes_audio_history(test_client):
+    """Test that memory reserved for audio history is exposed"""
+    data = test_client.get("/stats").json()
+
+    assert "capacity_bytes" in data["audio_history"]
+    assert "buffered_bytes" in data["audio_history"]
+
+
+def test_stats_includes_speculative_activity(test_client):
+    """Test that turns and bytes saved by activity_cancel are exposed"""
+    data = test_client.get("/stats").json()
+
+    assert "turns_saved" in data["speculative_activity"]
+    assert "bytes_saved" in data["speculative_activity"]
+
+
+def test_stats_includes_reattach(test_client):
+    """Test that reattachable calls and reattach counters are exposed"""
+    data = test_client.get("/stats").json()
+
+    assert "detached_calls" in data["reattach"]
+    assert "reattached" in data["reattach"]
+
+
+def test_stats_includes_hibernation(test_client):
+    """Test that hibernated and live session counts are exposed"""
+    data = test_client.get("/stats").json()
+
+    assert "hibernated" in data["hibernation"]
+    assert "live" in data["hibernation"]
+
+
+def test_stats_includes_lazy_connect(test_client):
+    """Test that calls that never needed an upstream session are exposed"""
+    data = test_client.get("/stats").json()
+
+    assert "avoided" in data["lazy_connect"]
+    assert "deferred" in data["lazy_connect"]